@@ -51,13 +51,9 @@ class LFIContextRule:
         self.code = "LFI_CONTEXT_COUNT"
 
     def validate(self, db: Session, session_id: int) -> List[ValidationIssue]:
-        from app.models.klsi.learning import LFIContextScore
+        from app.db.repositories import LFIContextRepository
 
-        count = (
-            db.query(LFIContextScore)
-            .filter(LFIContextScore.session_id == session_id)
-            .count()
-        )
+        count = len(LFIContextRepository(db).list_for_session(session_id))
         if count != len(CONTEXT_NAMES):
             return [
                 ValidationIssue(
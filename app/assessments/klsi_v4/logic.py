@@ -34,7 +34,7 @@ from app.db.repositories import (
     UserResponseRepository,
 )
 from app.models.klsi.assessment import AssessmentSession, AssessmentSessionDelta
-from app.models.klsi.enums import ItemType, LearningMode
+from app.models.klsi.enums import LearningMode
 from app.models.klsi.learning import (
     CombinationScore,
     LearningFlexibilityIndex,
@@ -245,13 +245,11 @@ def compute_kendalls_w(context_scores: List[Dict[str, int]]) -> float:
     return W
 
 
-def _age_to_band(user: User, reference_date: Optional[date]) -> Optional[str]:
-    if not user or not getattr(user, "date_of_birth", None):
-        return None
-    dob = getattr(user, "date_of_birth")
+def age_band_for(dob: date | datetime, snapshot: date) -> str:
+    """Return the Appendix age band label (``AGE:<band>`` suffix) at ``snapshot``."""
+
     if isinstance(dob, datetime):
         dob = dob.date()
-    snapshot = reference_date or date.today()
     years = snapshot.year - dob.year - int((snapshot.month, snapshot.day) < (dob.month, dob.day))
     if years < 19:
         return "<19"
@@ -268,6 +266,12 @@ def _age_to_band(user: User, reference_date: Optional[date]) -> Optional[str]:
     return ">64"
 
 
+def _age_to_band(user: User, reference_date: Optional[date]) -> Optional[str]:
+    if not user or not getattr(user, "date_of_birth", None):
+        return None
+    return age_band_for(getattr(user, "date_of_birth"), reference_date or date.today())
+
+
 def resolve_norm_groups(db: Session, session_id: int) -> List[str]:
     session_repo = SessionRepository(db)
     sess = session_repo.get_with_user(session_id)
@@ -309,15 +313,7 @@ def compute_raw_scale_scores(db: Session, session_id: int) -> ScaleScore:
     with the normative tables in Appendix 1 (range 12–48).
     """
     response_repo = UserResponseRepository(db)
-    responses = response_repo.list_with_choices(session_id)
-    rank_stream = (
-        (choice.learning_mode.value, response.rank_value)
-        for response in responses
-        if (choice := getattr(response, "choice", None))
-        and (item := getattr(choice, "item", None))
-        and item.item_type == ItemType.learning_style
-    )
-    vector = aggregate_mode_scores(rank_stream)
+    vector = aggregate_mode_scores(response_repo.mode_ranks(session_id))
     scale = ScaleScore(
         session_id=session_id,
         CE_raw=vector.CE,
@@ -0,0 +1,90 @@
+"""Packed encoding of KLSI 4.0 forced-choice rankings.
+
+Each item or LFI context ranks the four learning modes 1–4, which is one of
+the 24 permutations of ``(1, 2, 3, 4)``. A session's 12 item rankings and 8
+context rankings therefore fit in 12 and 8 bytes: one permutation index per
+slot, ``UNANSWERED`` for slots not yet submitted.
+
+Item slots follow ``item_number`` (slot ``n - 1``); context slots follow the
+configured context order. All functions are pure.
+"""
+
+from __future__ import annotations
+
+from itertools import permutations
+from typing import Dict, Final, List, Mapping, Optional, Sequence, Tuple, cast
+
+from app.assessments.constants import CONTEXT_COUNT_LFI, ITEM_COUNT_KLSI4, LEARNING_MODES
+from app.assessments.klsi_v4 import load_config
+
+RankTuple = Tuple[int, int, int, int]
+
+RANK_PERMUTATIONS: Final[Tuple[RankTuple, ...]] = tuple(
+    cast(RankTuple, ranks) for ranks in permutations((1, 2, 3, 4))
+)
+"""Permutation index → ranks for ``LEARNING_MODES`` (CE, RO, AC, AE)."""
+
+PERMUTATION_INDEX: Final[Dict[RankTuple, int]] = {ranks: index for index, ranks in enumerate(RANK_PERMUTATIONS)}
+
+UNANSWERED: Final[int] = 0xFF
+
+CONTEXT_ORDER: Final[Tuple[str, ...]] = load_config().context_names
+"""LFI context name per context slot."""
+
+EMPTY_ITEM_RANKS: Final[bytes] = bytes([UNANSWERED]) * ITEM_COUNT_KLSI4
+EMPTY_CONTEXT_RANKS: Final[bytes] = bytes([UNANSWERED]) * CONTEXT_COUNT_LFI
+
+
+def encode_ranks(ranks: Mapping[str, int]) -> int:
+    """Return the permutation index of a ``{mode: rank}`` mapping.
+
+    Raises:
+        ValueError: If the ranks are not a permutation of 1–4 over all modes.
+    """
+
+    try:
+        key = tuple(int(ranks[mode]) for mode in LEARNING_MODES)
+        return PERMUTATION_INDEX[key]  # type: ignore[index]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Ranks must assign 1-4 once to each of {LEARNING_MODES}: {dict(ranks)}") from None
+
+
+def decode_ranks(index: int) -> Dict[str, int]:
+    """Return ``{mode: rank}`` for a permutation index (0–23)."""
+
+    return dict(zip(LEARNING_MODES, RANK_PERMUTATIONS[index]))
+
+
+def pack_slots(indices: Sequence[Optional[int]]) -> bytes:
+    """Pack permutation indices (``None`` = unanswered) into one byte per slot."""
+
+    return bytes(UNANSWERED if index is None else index for index in indices)
+
+
+def unpack_slots(blob: bytes) -> List[Optional[int]]:
+    """Inverse of ``pack_slots``; invalid bytes decode as unanswered."""
+
+    return [value if value < len(RANK_PERMUTATIONS) else None for value in blob]
+
+
+def with_slot(blob: bytes, slot: int, index: int) -> bytes:
+    """Return ``blob`` with ``slot`` set to ``index``."""
+
+    data = bytearray(blob)
+    data[slot] = index
+    return bytes(data)
+
+
+__all__ = [
+    "CONTEXT_ORDER",
+    "EMPTY_CONTEXT_RANKS",
+    "EMPTY_ITEM_RANKS",
+    "PERMUTATION_INDEX",
+    "RANK_PERMUTATIONS",
+    "UNANSWERED",
+    "decode_ranks",
+    "encode_ranks",
+    "pack_slots",
+    "unpack_slots",
+    "with_slot",
+]
@@ -34,6 +34,17 @@ class Settings(BaseSettings):
     jwt_issuer: str = Field(default="klsi-api")
     jwt_audience: str = Field(default="klsi-users")
     access_token_expire_minutes: int = Field(default=60, ge=1)
+    auth_principal_cache_size: int = Field(default=4096, ge=0, description="Verified tokens cached with their principal; 0 disables")
+    auth_principal_cache_ttl_sec: int = Field(default=60, ge=1)
+    password_hash_workers: int = Field(default=2, ge=0, description="bcrypt worker processes; 0 hashes inline")
+    password_hash_queue_size: int = Field(default=16, ge=0, description="Hash calls allowed to wait beyond the busy workers before shedding")
+    password_hash_retry_after_sec: int = Field(default=2, ge=1)
+    user_provision_chunk_size: int = Field(default=500, ge=1, description="Rows per transaction in bulk user provisioning")
+    user_provision_hash_workers: int = Field(default=4, ge=0, description="Processes hashing passwords for one bulk provisioning job")
+    metrics_scrape_token: Optional[str] = Field(default=None, description="Bearer token required by /metrics when set")
+    metrics_quantile_window_minutes: int = Field(default=5, ge=1, le=60, description="Minutes covered by windowed timing quantiles")
+    metrics_multiprocess_dir: Optional[str] = Field(default=None, description="Shared directory for per-worker metric shards; enables fleet-wide metrics")
+    metrics_multiprocess_flush_sec: float = Field(default=5.0, gt=0, description="Seconds between metric shard writes in multiprocess mode")
 
     allowed_student_domain: str = Field(default="mahasiswa.unikom.ac.id")
     audit_salt: str = Field(default="klsi-default-salt")
@@ -87,6 +98,107 @@ class Settings(BaseSettings):
     db_pool_timeout: int = Field(default=30, ge=1, le=300, description="Seconds to wait for connection from pool")
     db_pool_recycle: int = Field(default=3600, ge=300, description="Seconds before recycling a connection")
     db_pool_pre_ping: bool = Field(default=True, description="Enable connection health checks before use")
+    database_replica_url: Optional[str] = Field(
+        default=None,
+        description="Read replica URL; read-only dependencies route here when set",
+    )
+    read_your_writes_window_sec: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds after a user's finalize during which their reads stay on the primary",
+    )
+    # Workload pools: ``oltp`` uses the db_pool_* settings above; analytics and
+    # admin get their own smaller pools so heavy reads cannot starve submits.
+    db_oltp_statement_timeout_ms: int = Field(
+        default=0, ge=0, description="Per-statement timeout for the oltp pool in ms (0 disables)"
+    )
+    db_analytics_pool_size: int = Field(default=2, ge=1, le=50, description="Connections kept in the analytics pool")
+    db_analytics_max_overflow: int = Field(default=2, ge=0, le=100, description="Analytics pool overflow")
+    db_analytics_statement_timeout_ms: int = Field(
+        default=30000, ge=0, description="Per-statement timeout for the analytics pool in ms (0 disables)"
+    )
+    db_admin_pool_size: int = Field(default=1, ge=1, le=20, description="Connections kept in the admin pool")
+    db_admin_max_overflow: int = Field(default=1, ge=0, le=20, description="Admin pool overflow")
+    db_admin_statement_timeout_ms: int = Field(
+        default=300000, ge=0, description="Per-statement timeout for the admin pool in ms (0 disables)"
+    )
+    # SQLite production profile: WAL + tuned pragmas and a single-writer queue
+    # so concurrent finalizes wait in order instead of failing with "locked".
+    sqlite_production_mode: bool = Field(
+        default=False,
+        description="Apply WAL/tuning pragmas and serialize write transactions on file-backed SQLite",
+    )
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0, description="SQLite busy_timeout pragma in ms")
+    sqlite_cache_size_kib: int = Field(default=65536, ge=0, description="SQLite page cache size in KiB")
+    sqlite_mmap_size_mb: int = Field(default=256, ge=0, description="SQLite mmap_size in MiB (0 disables)")
+    sqlite_write_queue_timeout_sec: float = Field(
+        default=30.0, gt=0, description="Seconds a write transaction waits in the single-writer queue"
+    )
+    sqlite_write_retry_attempts: int = Field(
+        default=5, ge=1, le=20, description="Attempts to take the SQLite write lock before failing"
+    )
+    sqlite_write_retry_base_ms: int = Field(
+        default=25, ge=1, description="Initial backoff between write lock attempts in ms (doubles each retry)"
+    )
+    db_pool_telemetry_enabled: bool = Field(
+        default=True,
+        description="Record pool checkout wait/hold histograms, connects and invalidations per pool",
+    )
+    db_pool_saturation_ratio: float = Field(
+        default=0.9,
+        gt=0,
+        le=1,
+        description="Warn when checked-out connections reach this share of pool_size + max_overflow",
+    )
+    db_pool_saturation_log_interval_sec: float = Field(
+        default=60.0,
+        ge=0,
+        description="Minimum seconds between db_pool_saturated warnings for one pool",
+    )
+    query_accounting_enabled: bool = Field(
+        default=True,
+        description="Count SQL statements, DB time and repeated statements per request and pipeline stage",
+    )
+    query_n_plus_one_threshold: int = Field(
+        default=10,
+        ge=2,
+        description="Warn when one statement fingerprint repeats this often within a request or stage",
+    )
+    item_catalog_recheck_sec: float = Field(
+        default=30.0,
+        ge=0,
+        description="Reload the item bank this often to pick up changes committed by other processes (0 disables)",
+    )
+
+    packed_responses_enabled: bool = Field(
+        default=True,
+        description="Store batch submissions as one session_response_packs row instead of 56 rank rows",
+    )
+    packed_responses_write_rows: bool = Field(
+        default=False,
+        description="Also write user_responses / lfi_context_scores rows for packed sessions (compatibility)",
+    )
+    response_archive_after_days: int = Field(
+        default=90,
+        ge=1,
+        description="Completed sessions older than this have their response rows folded into packs",
+    )
+    response_archive_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Sessions archived per transaction by the response archival job",
+    )
+
+    class_stats_incremental_enabled: bool = Field(
+        default=True,
+        description="Maintain class_style_stats incrementally when sessions finalize",
+    )
+    class_stats_mv_refresh_interval_sec: int = Field(
+        default=0,
+        ge=0,
+        description="Refresh interval for mv_class_style_stats on PostgreSQL (0 disables the scheduler)",
+    )
+    class_stats_mv_refresh_concurrently: bool = Field(default=True)
 
     disable_legacy_submission: bool = Field(default=False)
     disable_legacy_router: bool = Field(default=False)
@@ -23,6 +23,7 @@ __all__ = [
     "PipelineNotFoundError",
     "PipelineConflictError",
     "ConfigurationError",
+    "ServiceUnavailableError",
 ]
 
 
@@ -139,3 +140,15 @@ class ConfigurationError(DomainError):
     error_code = "configuration_error"
     status_code = 500
     default_message = DomainErrorMessages.CONFIGURATION_ERROR
+
+
+class ServiceUnavailableError(DomainError):
+    """Raised when a bounded resource is saturated and the request is shed."""
+
+    error_code = "service_unavailable"
+    status_code = 503
+    default_message = DomainErrorMessages.SERVICE_UNAVAILABLE
+
+    def __init__(self, message: str | None = None, *, retry_after: int | None = None, **kwargs: Any) -> None:
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
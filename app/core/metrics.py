@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import threading
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import wraps
 from math import sqrt
 from time import perf_counter
-from typing import Any, Callable, Dict, Mapping, Sequence, TypeVar, cast
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, TypeVar, cast
+
+from app.core.logging import get_logger
+from app.core.quantiles import WindowedSketch
+
 _F = TypeVar("_F", bound=Callable[..., Any])
 
 try:  # pragma: no cover - import guard for early initialization
@@ -16,9 +21,29 @@ except Exception:  # pragma: no cover - fallback during bootstrap
     _settings = None
 
 
+def _quantile_window_minutes() -> int:
+    return getattr(_settings, "metrics_quantile_window_minutes", 5) if _settings is not None else 5
+
+
+logger = get_logger("kolb.core.metrics", component="core")
+
+# Labels already reported as observed with non-nesting bucket boundaries.
+_MISMATCHED_HISTOGRAMS: set[str] = set()
+
+
+def _warn_histogram_mismatch(label: str, exc: ValueError) -> None:
+    if label in _MISMATCHED_HISTOGRAMS:
+        return
+    _MISMATCHED_HISTOGRAMS.add(label)
+    logger.warning(
+        "metrics_histogram_boundaries_mismatch",
+        extra={"structured_data": {"label": label, "error": str(exc)}},
+    )
+
+
 @dataclass(slots=True)
 class TimingStats:
-    """Numerical aggregates for a timing label."""
+    """Numerical aggregates for a timing label, plus a quantile sketch."""
 
     count: float = 0.0
     total_ms: float = 0.0
@@ -28,6 +53,9 @@ class TimingStats:
     stddev_ms: float = 0.0
     _mean_ms: float = 0.0
     _m2: float = 0.0
+    quantiles: WindowedSketch = field(
+        default_factory=lambda: WindowedSketch(_quantile_window_minutes()), repr=False, compare=False
+    )
 
     def update(self, elapsed_ms: float) -> None:
         value = float(elapsed_ms)
@@ -40,7 +68,48 @@ class TimingStats:
         self._mean_ms += delta / self.count
         delta2 = value - self._mean_ms
         self._m2 += delta * delta2
+        self._refresh()
+        self.quantiles.add(value)
+
+    def merge(self, other: "TimingStats") -> None:
+        """Fold ``other`` in (Chan et al. parallel variance)."""
+
+        if other.count == 0.0:
+            return
+        count = self.count + other.count
+        delta = other._mean_ms - self._mean_ms
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self._mean_ms += delta * other.count / count
+        self.count = count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self._refresh()
+        self.quantiles.merge(other.quantiles)
+
+    def as_state(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "mean_ms": self._mean_ms,
+            "m2": self._m2,
+            "quantiles": self.quantiles.as_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "TimingStats":
+        stats = cls(
+            count=state["count"],
+            total_ms=state["total_ms"],
+            max_ms=state["max_ms"],
+            _mean_ms=state["mean_ms"],
+            _m2=state["m2"],
+            quantiles=WindowedSketch.from_state(state["quantiles"], _quantile_window_minutes()),
+        )
+        stats._refresh()
+        return stats
 
+    def _refresh(self) -> None:
         variance = self._m2 / (self.count - 1.0) if self.count > 1.0 else 0.0
         self.variance_ms = variance
         self.stddev_ms = sqrt(variance) if variance > 0.0 else 0.0
@@ -54,6 +123,7 @@ class TimingStats:
             "avg_ms": self.avg_ms,
             "variance_ms": self.variance_ms,
             "stddev_ms": self.stddev_ms,
+            **self.quantiles.lifetime.summary(),
         }
 
 
@@ -63,21 +133,77 @@ class HistogramBuckets:
 
     boundaries: tuple[float, ...]
     counts: Dict[str, float] = field(init=False)
+    total: float = field(default=0.0, init=False)
+    observations: float = field(default=0.0, init=False)
 
     def __post_init__(self) -> None:
         self.counts = {str(boundary): 0.0 for boundary in self.boundaries}
         self.counts.setdefault("+Inf", 0.0)
 
     def observe(self, value: float) -> None:
+        self.total += value
+        self.observations += 1.0
         for boundary in self.boundaries:
             if value <= boundary:
                 self.counts[str(boundary)] += 1.0
                 return
         self.counts["+Inf"] += 1.0
 
+    def merge(self, other: "HistogramBuckets") -> None:
+        """Add ``other``'s observations.
+
+        Histograms with different boundaries merge only when one set contains
+        the other: every bucket of the finer histogram then lies inside one
+        bucket of the coarser, so both are counted on the coarser boundaries.
+
+        Raises:
+            ValueError: If neither set of boundaries contains the other.
+        """
+
+        if other.boundaries != self.boundaries:
+            if set(self.boundaries) <= set(other.boundaries):
+                other = other.rebinned(self.boundaries)
+            elif set(other.boundaries) <= set(self.boundaries):
+                coarse = self.rebinned(other.boundaries)
+                self.boundaries, self.counts = coarse.boundaries, coarse.counts
+            else:
+                raise ValueError(f"histogram boundaries {other.boundaries} do not nest with {self.boundaries}")
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0.0) + count
+        self.total += other.total
+        self.observations += other.observations
+
+    def rebinned(self, boundaries: tuple[float, ...]) -> "HistogramBuckets":
+        """Copy counted on ``boundaries``, a subset of this histogram's."""
+
+        histogram = HistogramBuckets(boundaries)
+        for boundary in self.boundaries:
+            target = next((str(edge) for edge in boundaries if boundary <= edge), "+Inf")
+            histogram.counts[target] += self.counts.get(str(boundary), 0.0)
+        histogram.counts["+Inf"] += self.counts.get("+Inf", 0.0)
+        histogram.total = self.total
+        histogram.observations = self.observations
+        return histogram
+
     def snapshot(self) -> Dict[str, float]:
         return dict(self.counts)
 
+    def as_state(self) -> Dict[str, Any]:
+        return {
+            "boundaries": list(self.boundaries),
+            "counts": dict(self.counts),
+            "total": self.total,
+            "observations": self.observations,
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "HistogramBuckets":
+        histogram = cls(tuple(state["boundaries"]))
+        histogram.counts.update(state["counts"])
+        histogram.total = state["total"]
+        histogram.observations = state["observations"]
+        return histogram
+
 
 @dataclass(slots=True)
 class LastRunMetadata:
@@ -107,29 +233,106 @@ class LastRunMetadata:
             data.update(self.metadata)
         return data
 
+    def as_state(self) -> Dict[str, Any]:
+        return {"timestamp": self.timestamp, "duration_ms": self.duration_ms, "metadata": self.metadata}
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "LastRunMetadata":
+        return cls(timestamp=state["timestamp"], duration_ms=state["duration_ms"], metadata=dict(state["metadata"]))
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramExport:
+    """Histogram copy for exporters; ``counts`` are per bucket (not cumulative), ``+Inf`` last."""
+
+    boundaries: tuple[float, ...]
+    counts: tuple[float, ...]
+    total: float
+    count: float
+
+
+@dataclass(frozen=True, slots=True)
+class RegistryExport:
+    """Point-in-time copy of a registry; timings are ``(count, total_ms)``.
+
+    ``timing_quantiles`` holds each timing's windowed ``p50_ms``..``p999_ms``.
+    """
+
+    timings: Dict[str, tuple[float, float]]
+    counters: Dict[str, float]
+    histograms: Dict[str, HistogramExport]
+    last_run_ms: Dict[str, float]
+    timing_quantiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+_TIMINGS, _COUNTERS, _HISTOGRAMS, _LAST_RUNS = range(4)
+_STATE_KEYS = ("timings", "counters", "histograms", "last_runs")
+_STATE_TYPES: Dict[int, Any] = {_TIMINGS: TimingStats, _HISTOGRAMS: HistogramBuckets, _LAST_RUNS: LastRunMetadata}
 
-class _MetricsRegistry:
-    """Thread-safe in-process metrics registry.
 
-    Stores simple timing counters per label:
-      - count: number of recorded events
-      - total_ms: total elapsed milliseconds
-      - max_ms: maximum single observation in milliseconds
+class _MetricShard:
+    """Series recorded by one thread; only the owning thread mutates it."""
+
+    __slots__ = ("maps", "generations", "ops")
+
+    def __init__(self, generations: Sequence[int]) -> None:
+        self.maps: list[Dict[str, Any]] = [{}, {}, {}, {}]
+        self.generations = list(generations)
+        self.ops = 0
+
+
+class _MetricsRegistry:
+    """In-process metrics registry with lock-free, per-thread recording.
+
+    Each thread records into its own shard (found through a thread-local)
+    without taking a lock. Snapshots and exports take ``_lock`` and merge the
+    shards. A reset bumps that kind's generation instead of touching other
+    threads' shards: merges skip shards still on an old generation, and each
+    owner swaps in empty maps on its next write. Shards of finished threads
+    are folded into ``_retired`` on the next merge.
     """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._timings: Dict[str, TimingStats] = {}
-        self._counters: Dict[str, float] = {}
-        self._histograms: Dict[str, HistogramBuckets] = {}
-        self._last_runs: Dict[str, LastRunMetadata] = {}
+        self._local = threading.local()
+        self._generations = [0, 0, 0, 0]
+        self._shards: list[tuple[weakref.ref[threading.Thread], _MetricShard]] = []
+        self._retired = _MetricShard(self._generations)
+        self._structural = 0
+
+    @property
+    def version(self) -> int:
+        """Changes whenever any series or reset does; lets exporters cache renders."""
+
+        return self._structural + self._retired.ops + sum(shard.ops for _, shard in list(self._shards))
+
+    def _shard(self) -> _MetricShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _MetricShard(self._generations)
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+            self._local.shard = shard
+        return shard
+
+    def _series(self, shard: _MetricShard, kind: int) -> Dict[str, Any]:
+        generation = self._generations[kind]
+        if shard.generations[kind] != generation:
+            # Replace rather than clear: a merge may be copying the old map.
+            shard.maps[kind] = {}
+            shard.generations[kind] = generation
+        return shard.maps[kind]
 
     def record(self, label: str, elapsed_ms: float) -> None:
         if not label:
             return
-        with self._lock:
-            entry = self._timings.setdefault(label, TimingStats())
-            entry.update(elapsed_ms)
+        shard = self._shard()
+        timings = self._series(shard, _TIMINGS)
+        entry = timings.get(label)
+        if entry is None:
+            entry = timings[label] = TimingStats()
+        entry.update(elapsed_ms)
+        shard.ops += 1
 
     def observe_histogram(
         self,
@@ -140,70 +343,188 @@ class _MetricsRegistry:
     ) -> None:
         if not label:
             return
-        bucket_sequence: Sequence[float] = buckets or (1.0, 5.0, 10.0, 20.0, 50.0)
-        with self._lock:
-            histogram = self._histograms.get(label)
-            if histogram is None:
-                histogram = HistogramBuckets(tuple(bucket_sequence))
-                self._histograms[label] = histogram
-            histogram.observe(value)
+        shard = self._shard()
+        histograms = self._series(shard, _HISTOGRAMS)
+        histogram = histograms.get(label)
+        if histogram is None:
+            histogram = histograms[label] = HistogramBuckets(tuple(buckets or (1.0, 5.0, 10.0, 20.0, 50.0)))
+        histogram.observe(value)
+        shard.ops += 1
+
+    # --- Counters ---
+    def inc(self, label: str, amount: float = 1.0) -> None:
+        if not label:
+            return
+        shard = self._shard()
+        counters = self._series(shard, _COUNTERS)
+        counters[label] = counters.get(label, 0.0) + float(amount)
+        shard.ops += 1
+
+    def set_last_run(
+        self,
+        label: str,
+        duration_ms: float,
+        *,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        if not label:
+            return
+        shard = self._shard()
+        self._series(shard, _LAST_RUNS)[label] = LastRunMetadata.from_duration(duration_ms, metadata=metadata)
+        shard.ops += 1
+
+    # --- Reads (under ``_lock``) ---
+    def _retire_finished(self) -> None:
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+                continue
+            for kind in range(4):
+                if shard.generations[kind] == self._generations[kind]:
+                    self._fold(self._series(self._retired, kind), kind, shard.maps[kind])
+            self._retired.ops += shard.ops
+        self._shards = live
+
+    @staticmethod
+    def _fold(target: Dict[str, Any], kind: int, source: Mapping[str, Any]) -> None:
+        for label, value in list(source.items()):
+            if kind == _COUNTERS:
+                target[label] = target.get(label, 0.0) + value
+            elif kind == _LAST_RUNS:
+                current = target.get(label)
+                if current is None or value.timestamp >= current.timestamp:
+                    target[label] = value
+            else:
+                merged = target.get(label)
+                if merged is None:
+                    merged = target[label] = TimingStats() if kind == _TIMINGS else HistogramBuckets(value.boundaries)
+                try:
+                    merged.merge(value)
+                except ValueError as exc:
+                    _warn_histogram_mismatch(label, exc)
+
+    def _merged(self, kind: int) -> Dict[str, Any]:
+        self._retire_finished()
+        merged: Dict[str, Any] = {}
+        for shard in [self._retired, *(shard for _, shard in self._shards)]:
+            if shard.generations[kind] == self._generations[kind]:
+                self._fold(merged, kind, shard.maps[kind])
+        return merged
+
+    def _reset_kinds(self, *kinds: int) -> None:
+        for kind in kinds:
+            self._generations[kind] += 1
+            self._series(self._retired, kind)
+        self._structural += 1
 
     def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
         with self._lock:
-            data = {label: stats.snapshot() for label, stats in self._timings.items()}
+            data = {label: stats.snapshot() for label, stats in self._merged(_TIMINGS).items()}
             if reset:
-                self._timings.clear()
+                self._reset_kinds(_TIMINGS)
             return data
 
-    def reset(self) -> None:
+    def quantiles_snapshot(self, window_minutes: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Per-timing ``count`` and ``p50_ms``..``p999_ms`` over the last ``window_minutes``.
+
+        ``window_minutes`` is capped at ``metrics_quantile_window_minutes``;
+        ``0`` reports lifetime quantiles instead.
+        """
+
         with self._lock:
-            self._timings.clear()
-            self._counters.clear()
-            self._histograms.clear()
-            self._last_runs.clear()
+            timings = self._merged(_TIMINGS)
+        data: Dict[str, Dict[str, float]] = {}
+        for label, stats in timings.items():
+            sketch = stats.quantiles.lifetime if window_minutes == 0 else stats.quantiles.window(window_minutes)
+            if sketch.count:
+                data[label] = {"count": sketch.count, **sketch.summary()}
+        return data
 
-    # --- Counters ---
-    def inc(self, label: str, amount: float = 1.0) -> None:
-        if not label:
-            return
+    def dump_state(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serialisable copy of every series, for ``load_state`` in another process."""
+
+        with self._lock:
+            merged = [self._merged(kind) for kind in range(4)]
+        return {
+            key: {
+                label: value if kind == _COUNTERS else value.as_state()
+                for label, value in merged[kind].items()
+            }
+            for kind, key in enumerate(_STATE_KEYS)
+        }
+
+    def load_state(self, state: Mapping[str, Mapping[str, Any]]) -> None:
+        """Fold a ``dump_state`` payload into this registry."""
+
+        with self._lock:
+            for kind, key in enumerate(_STATE_KEYS):
+                series = state.get(key) or {}
+                if kind != _COUNTERS:
+                    series = {label: _STATE_TYPES[kind].from_state(value) for label, value in series.items()}
+                self._fold(self._series(self._retired, kind), kind, series)
+            self._structural += 1
+
+    def merge(self, other: "_MetricsRegistry") -> None:
+        """Fold ``other``'s current series into this registry (no JSON round trip)."""
+
+        with other._lock:
+            merged = [other._merged(kind) for kind in range(4)]
         with self._lock:
-            self._counters[label] = self._counters.get(label, 0.0) + float(amount)
+            for kind in range(4):
+                self._fold(self._series(self._retired, kind), kind, merged[kind])
+            self._structural += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_kinds(_TIMINGS, _COUNTERS, _HISTOGRAMS, _LAST_RUNS)
 
     def counters_snapshot(self, reset: bool = False) -> Dict[str, float]:
         with self._lock:
-            data = dict(self._counters)
+            data = self._merged(_COUNTERS)
             if reset:
-                self._counters.clear()
+                self._reset_kinds(_COUNTERS)
             return data
 
     def histograms_snapshot(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
         with self._lock:
-            data = {label: buckets.snapshot() for label, buckets in self._histograms.items()}
+            data = {label: buckets.snapshot() for label, buckets in self._merged(_HISTOGRAMS).items()}
             if reset:
-                self._histograms.clear()
+                self._reset_kinds(_HISTOGRAMS)
             return data
 
-    def set_last_run(
-        self,
-        label: str,
-        duration_ms: float,
-        *,
-        metadata: Mapping[str, Any] | None = None,
-    ) -> None:
-        if not label:
-            return
-        with self._lock:
-            self._last_runs[label] = LastRunMetadata.from_duration(
-                duration_ms, metadata=metadata
-            )
-
     def last_runs_snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
         with self._lock:
-            data = {label: payload.snapshot() for label, payload in self._last_runs.items()}
+            data = {label: payload.snapshot() for label, payload in self._merged(_LAST_RUNS).items()}
             if reset:
-                self._last_runs.clear()
+                self._reset_kinds(_LAST_RUNS)
             return data
 
+    def export(self) -> tuple[int, "RegistryExport"]:
+        """Merged copy of every series with the version it reflects (at least)."""
+
+        with self._lock:
+            version = self.version
+            histograms = self._merged(_HISTOGRAMS)
+            timings = self._merged(_TIMINGS)
+            return version, RegistryExport(
+                timings={label: (stats.count, stats.total_ms) for label, stats in timings.items()},
+                counters=self._merged(_COUNTERS),
+                histograms={
+                    label: HistogramExport(
+                        boundaries=histogram.boundaries,
+                        counts=tuple(histogram.counts.get(str(boundary), 0.0) for boundary in histogram.boundaries)
+                        + (histogram.counts["+Inf"],),
+                        total=histogram.total,
+                        count=histogram.observations,
+                    )
+                    for label, histogram in histograms.items()
+                },
+                last_run_ms={label: payload.duration_ms for label, payload in self._merged(_LAST_RUNS).items()},
+                timing_quantiles={label: stats.quantiles.window().summary() for label, stats in timings.items()},
+            )
+
 
 metrics_registry = _MetricsRegistry()
 
@@ -303,10 +624,42 @@ def count_calls(label: str) -> Callable[[_F], _F]:
     return _wrap
 
 
+_fleet_reader: Optional[Callable[[], _MetricsRegistry]] = None
+
+
+def set_fleet_reader(reader: Optional[Callable[[], _MetricsRegistry]]) -> None:
+    """Route metric reads through ``reader`` (multiprocess mode), or back to this process with ``None``."""
+
+    global _fleet_reader
+    _fleet_reader = reader
+
+
+def read_registry() -> _MetricsRegistry:
+    """Registry that exporters read: the fleet-wide merge in multiprocess mode, else ``metrics_registry``."""
+
+    reader = _fleet_reader
+    return reader() if reader is not None else metrics_registry
+
+
+def _read(snapshot: str, reset: bool) -> Any:
+    registry = read_registry()
+    data = getattr(registry, snapshot)(reset=reset and registry is metrics_registry)
+    if reset and registry is not metrics_registry:
+        # Only this process's series can be cleared; other workers keep theirs.
+        getattr(metrics_registry, snapshot)(reset=True)
+    return data
+
+
 def get_metrics(reset: bool = False) -> Dict[str, Dict[str, float]]:
     """Return recorded timing metrics, optionally resetting the registry."""
 
-    return metrics_registry.snapshot(reset=reset)
+    return _read("snapshot", reset)
+
+
+def get_quantiles(window_minutes: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """Return p50/p90/p99/p99.9 per timing over the last ``window_minutes`` (0 = lifetime)."""
+
+    return read_registry().quantiles_snapshot(window_minutes)
 
 
 def inc_counter(label: str, amount: float = 1.0) -> None:
@@ -318,13 +671,13 @@ def inc_counter(label: str, amount: float = 1.0) -> None:
 def get_counters(reset: bool = False) -> Dict[str, float]:
     """Return counter metrics, optionally clearing stored values."""
 
-    return metrics_registry.counters_snapshot(reset=reset)
+    return _read("counters_snapshot", reset)
 
 
 def get_histograms(reset: bool = False) -> Dict[str, Dict[str, float]]:
     """Return histogram buckets recorded so far."""
 
-    return metrics_registry.histograms_snapshot(reset=reset)
+    return _read("histograms_snapshot", reset)
 
 
 def observe_histogram(label: str, value: float, *, buckets: Sequence[float] | None = None) -> None:
@@ -344,7 +697,7 @@ def record_last_run(label: str, duration_ms: float, *, metadata: Mapping[str, An
 def get_last_runs(reset: bool = False) -> Dict[str, Dict[str, Any]]:
     """Retrieve last-run snapshots captured so far."""
 
-    return metrics_registry.last_runs_snapshot(reset=reset)
+    return _read("last_runs_snapshot", reset)
 
 
 __all__ = [
@@ -354,12 +707,15 @@ __all__ = [
     "count_calls",
     "inc_counter",
     "get_metrics",
+    "get_quantiles",
     "get_counters",
     "get_histograms",
     "observe_histogram",
     "record_last_run",
     "get_last_runs",
     "metrics_registry",
+    "read_registry",
+    "set_fleet_reader",
     "set_instrumentation_enabled",
     "instrumentation_enabled",
 ]
@@ -0,0 +1,357 @@
+"""Fleet-wide metrics for multi-worker deployments (``uvicorn --workers N``).
+
+Each worker runs a ``MetricsShardWriter`` that writes
+``metrics_registry.dump_state()`` every ``metrics_multiprocess_flush_sec`` to
+``<metrics_multiprocess_dir>/metrics-<pid>.shard``. The file is
+memory-mapped and guarded by a sequence lock: a 16-byte header holds the
+sequence (odd while a write is in progress) and the payload length, followed
+by the JSON payload. Readers copy the payload and retry if the sequence
+moved, so no cross-process lock is needed.
+
+``FleetReader`` is installed as the registry read view (``set_fleet_reader``).
+It merges this process's live registry with the latest shard of every other
+live worker, so ``get_metrics``/``get_counters``, ``/health``,
+``/admin/perf-metrics`` and ``/metrics`` report the whole fleet. Other
+workers are at most one flush interval stale.
+
+Fleet counters never go backwards when a worker goes away: its last state is
+folded into ``metrics-retired.json`` before its shard is deleted, by the
+worker itself on shutdown or by the first reader that finds it dead. Folding
+and scanning hold an exclusive ``flock`` on ``metrics.lock``, so a shard is
+retired exactly once and never counted both as a shard and in the aggregate.
+
+POSIX only: ``flock`` and ``os.kill(pid, 0)`` liveness probes have no safe
+Windows equivalent here (``os.kill`` terminates the process on Windows), so
+writers and readers refuse to start elsewhere.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+from app.core.logging import get_logger
+from app.core.metrics import _MetricsRegistry, metrics_registry, set_fleet_reader
+
+logger = get_logger("kolb.core.metrics_multiprocess", component="core")
+
+_HEADER = struct.Struct("<QQ")
+_INITIAL_SIZE = 64 * 1024
+_READ_ATTEMPTS = 5
+_READ_BACKOFF_SEC = 0.001
+_SHARD_GLOB = "metrics-*.shard"
+_RETIRED_NAME = "metrics-retired.json"
+_LOCK_NAME = "metrics.lock"
+
+
+def _require_posix() -> None:
+    if fcntl is None or os.name != "posix":
+        raise RuntimeError(
+            "Multiprocess metrics need a POSIX platform (flock, os.kill liveness probes); "
+            "unset METRICS_MULTIPROCESS_DIR on this system"
+        )
+
+
+def shard_path(directory: Path, pid: int) -> Path:
+    return directory / f"metrics-{pid}.shard"
+
+
+@contextmanager
+def _directory_lock(directory: Path) -> Iterator[None]:
+    with open(directory / _LOCK_NAME, "a+b") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ShardFile:
+    """Single-writer memory-mapped shard file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._map: Optional[mmap.mmap] = None
+        self._sequence = 0
+
+    def write(self, payload: bytes) -> None:
+        size = _HEADER.size + len(payload)
+        view = self._map
+        if view is None or len(view) < size:
+            view = self._grow(size)
+        self._sequence += 1
+        _HEADER.pack_into(view, 0, self._sequence, 0)
+        view[_HEADER.size:size] = payload
+        self._sequence += 1
+        _HEADER.pack_into(view, 0, self._sequence, len(payload))
+
+    def _grow(self, size: int) -> mmap.mmap:
+        length = max(_INITIAL_SIZE, 1 << (size - 1).bit_length())
+        os.ftruncate(self._fd, length)
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fd, length)
+        return self._map
+
+    def close(self, *, unlink: bool = True) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        os.close(self._fd)
+        if unlink:
+            self.path.unlink(missing_ok=True)
+
+
+def read_shard(path: Path) -> Optional[Tuple[int, bytes]]:
+    """``(sequence, payload)`` of a consistent write, or ``None`` if there is none.
+
+    A read that overlaps a write is retried with a growing pause; ``None`` after
+    ``_READ_ATTEMPTS`` torn reads.
+    """
+
+    for attempt in range(_READ_ATTEMPTS):
+        if attempt:
+            sleep(_READ_BACKOFF_SEC * attempt)
+        try:
+            with open(path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size < _HEADER.size:
+                    return None
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    sequence, length = _HEADER.unpack_from(view, 0)
+                    if sequence == 0:
+                        return None
+                    if sequence % 2 or _HEADER.size + length > len(view):
+                        continue
+                    payload = view[_HEADER.size:_HEADER.size + length]
+                    if _HEADER.unpack_from(view, 0)[0] == sequence:
+                        return sequence, payload
+        except FileNotFoundError:
+            return None
+    return None
+
+
+def _read_retired(directory: Path) -> Optional[bytes]:
+    try:
+        return (directory / _RETIRED_NAME).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _load_into(registry: _MetricsRegistry, name: str, payload: bytes) -> bool:
+    try:
+        registry.load_state(json.loads(payload))
+    except (ValueError, KeyError, TypeError) as exc:
+        logger.warning("metrics_shard_unreadable", extra={"structured_data": {"shard": name, "error": str(exc)}})
+        return False
+    return True
+
+
+def _retire_locked(path: Path, payload: Optional[bytes]) -> None:
+    # Caller holds the directory lock.
+    if not path.exists():
+        return
+    retired = _MetricsRegistry()
+    if payload is None or not _load_into(retired, path.name, payload):
+        logger.warning("metrics_shard_lost", extra={"structured_data": {"shard": path.name}})
+    else:
+        previous = _read_retired(path.parent)
+        if previous is not None:
+            _load_into(retired, _RETIRED_NAME, previous)
+        target = path.parent / _RETIRED_NAME
+        staging = target.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_text(json.dumps(retired.dump_state(), separators=(",", ":")), encoding="utf-8")
+        os.replace(staging, target)
+    path.unlink(missing_ok=True)
+
+
+def retire_shard(path: Path, payload: Optional[bytes]) -> None:
+    """Fold a finished worker's last ``payload`` into the retired aggregate and delete its shard."""
+
+    with _directory_lock(path.parent):
+        _retire_locked(path, payload)
+
+
+class MetricsShardWriter:
+    """Daemon thread writing a registry's state to this worker's shard file."""
+
+    def __init__(self, directory: Path, interval_sec: float, registry: _MetricsRegistry = metrics_registry) -> None:
+        self.directory = Path(directory)
+        self._interval = float(interval_sec)
+        self._registry = registry
+        self._file: Optional[ShardFile] = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        _require_posix()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = ShardFile(shard_path(self.directory, os.getpid()))
+        self.flush()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-shard-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop flushing and hand this worker's final state to the retired aggregate."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._file is not None:
+            shard, self._file = self._file, None
+            payload = self._payload()
+            shard.close(unlink=False)
+            retire_shard(shard.path, payload)
+
+    def _payload(self) -> bytes:
+        return json.dumps(self._registry.dump_state(), separators=(",", ":")).encode("utf-8")
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        self._file.write(self._payload())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            except (OSError, ValueError) as exc:
+                logger.warning("metrics_shard_flush_failed", extra={"structured_data": {"error": str(exc)}})
+
+
+class FleetReader:
+    """Merges the local registry with the retired aggregate and live peer shards.
+
+    The directory is rescanned at most every ``rescan_sec``. Peer payloads are
+    parsed only when a shard sequence or the retired aggregate changed; the
+    local registry is merged live, and the merged registry is reused until
+    either side changes, so the Prometheus render cache stays valid between
+    writes. A torn peer read reuses that peer's last good payload.
+    """
+
+    def __init__(self, directory: Path, registry: _MetricsRegistry = metrics_registry, rescan_sec: float = 0.0) -> None:
+        _require_posix()
+        self.directory = Path(directory)
+        self._registry = registry
+        self._rescan_sec = float(rescan_sec)
+        self._lock = threading.Lock()
+        self._last_good: Dict[str, Tuple[int, bytes]] = {}
+        self._scanned_at: Optional[float] = None
+        self._peers_key: Tuple[object, ...] = ()
+        self._peers = _MetricsRegistry()
+        self._cached: Optional[Tuple[Tuple[int, Tuple[object, ...]], _MetricsRegistry]] = None
+
+    def _scan(self) -> Tuple[Tuple[object, ...], List[Tuple[str, bytes]]]:
+        """Peer cache key and, if it changed, the payloads to merge (retired aggregate first)."""
+
+        shards: List[Tuple[str, int, bytes]] = []
+        own = os.getpid()
+        with _directory_lock(self.directory):
+            for path in sorted(self.directory.glob(_SHARD_GLOB)):
+                try:
+                    pid = int(path.stem.removeprefix("metrics-"))
+                except ValueError:
+                    continue
+                if pid == own:
+                    continue
+                shard = read_shard(path) or self._last_good.get(path.name)
+                if not _pid_alive(pid):
+                    _retire_locked(path, shard[1] if shard is not None else None)
+                    self._last_good.pop(path.name, None)
+                    continue
+                if shard is not None:
+                    self._last_good[path.name] = shard
+                    shards.append((path.name, *shard))
+            try:
+                stat = (self.directory / _RETIRED_NAME).stat()
+                retired: object = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                retired = None
+            key = (retired, *((name, sequence) for name, sequence, _ in shards))
+            if key == self._peers_key:
+                return key, []
+            payloads = [(name, payload) for name, _, payload in shards]
+            previous = _read_retired(self.directory) if retired is not None else None
+        if previous is not None:
+            payloads.insert(0, (_RETIRED_NAME, previous))
+        return key, payloads
+
+    def _refresh_peers(self) -> None:
+        key, payloads = self._scan()
+        if key == self._peers_key:
+            return
+        peers = _MetricsRegistry()
+        for name, payload in payloads:
+            _load_into(peers, name, payload)
+        self._peers_key, self._peers = key, peers
+
+    def __call__(self) -> _MetricsRegistry:
+        with self._lock:
+            now = monotonic()
+            if self._scanned_at is None or now - self._scanned_at >= self._rescan_sec:
+                self._refresh_peers()
+                self._scanned_at = now
+            key = (self._registry.version, self._peers_key)
+            if self._cached is not None and self._cached[0] == key:
+                return self._cached[1]
+            fleet = _MetricsRegistry()
+            fleet.merge(self._peers)
+            fleet.merge(self._registry)
+            self._cached = (key, fleet)
+            return fleet
+
+
+def start_multiprocess_metrics(directory: str | Path, interval_sec: float) -> MetricsShardWriter:
+    """Start writing this worker's shard and route metric reads through the fleet merge."""
+
+    writer = MetricsShardWriter(Path(directory), interval_sec)
+    writer.start()
+    set_fleet_reader(FleetReader(Path(directory), rescan_sec=interval_sec))
+    logger.info(
+        "metrics_multiprocess_enabled",
+        extra={"structured_data": {"directory": str(directory), "pid": os.getpid(), "interval_sec": interval_sec}},
+    )
+    return writer
+
+
+def stop_multiprocess_metrics(writer: MetricsShardWriter) -> None:
+    set_fleet_reader(None)
+    writer.stop()
+
+
+__all__ = [
+    "FleetReader",
+    "MetricsShardWriter",
+    "ShardFile",
+    "read_shard",
+    "retire_shard",
+    "shard_path",
+    "start_multiprocess_metrics",
+    "stop_multiprocess_metrics",
+]
@@ -0,0 +1,174 @@
+"""Prometheus text exposition (format 0.0.4) of the metrics registry.
+
+Registry labels are dotted strings. ``_LABEL_RULES`` lifts the route, stage,
+instrument, pool and scale parts of known label families into Prometheus
+labels. Any other label becomes a metric name with no labels:
+
+- timings → ``kolb_<name>_duration_ms`` summary (``quantile`` samples over
+  the ``metrics_quantile_window_minutes`` window, ``_sum``/``_count``)
+- counters → ``kolb_<name>_total`` counter
+- histograms → ``kolb_<name>`` histogram (cumulative ``_bucket``, ``_sum``, ``_count``)
+- last runs → ``kolb_<name>_last_run_ms`` gauge
+
+Renders are cached per registry version and wall-clock minute (the quantile
+window slides even when nothing is recorded), so repeated scrapes of an idle
+process do not re-render.
+"""
+
+from __future__ import annotations
+
+import re
+from threading import Lock
+from time import time
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from app.core.metrics import RegistryExport, _MetricsRegistry, read_registry
+from app.core.quantiles import REPORTED_QUANTILES
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "kolb_"
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+# (pattern, family template): named groups other than ``metric`` become labels.
+_LABEL_RULES: Tuple[Tuple[Pattern[str], str], ...] = (
+    (re.compile(r"^db\.queries\.request\.(?P<route>.+)\.(?P<metric>statements|db_ms)$"), "db.queries.{metric}"),
+    (re.compile(r"^db\.queries\.stage\.(?P<stage>.+)\.(?P<metric>statements|db_ms)$"), "db.queries.{metric}"),
+    (
+        re.compile(r"^db\.pool\.(?P<pool>[^.]+)\.(?P<metric>checkout_wait_ms|hold_ms)\.(?P<route>.+)$"),
+        "db.pool.{metric}.by_route",
+    ),
+    (re.compile(r"^db\.pool\.(?P<pool>[^.]+)\.(?P<metric>.+)$"), "db.pool.{metric}"),
+    (re.compile(r"^pipeline\.(?P<instrument>[^.]+)\.(?P<metric>.+)$"), "pipeline.{metric}"),
+    (
+        re.compile(r"^norms\.(?P<provider>appendix|db|external)\.percentile\.(?P<scale>(?!calls$).+)$"),
+        "norms.percentile.by_scale",
+    ),
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _split_label(label: str) -> Tuple[str, Labels]:
+    for pattern, template in _LABEL_RULES:
+        match = pattern.match(label)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        family = template.format(metric=groups.pop("metric", ""))
+        return family, tuple(sorted(groups.items()))
+    return label, ()
+
+
+def _metric_name(family: str, suffix: str = "") -> str:
+    return _PREFIX + _INVALID_NAME_CHARS.sub("_", family).strip("_") + suffix
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Family:
+    __slots__ = ("kind", "samples")
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.samples: List[str] = []
+
+
+def render_export(data: RegistryExport) -> str:
+    """Render a registry export as Prometheus text."""
+
+    families: Dict[str, _Family] = {}
+
+    def family(name: str, kind: str) -> _Family:
+        entry = families.get(name)
+        if entry is None:
+            entry = families[name] = _Family(kind)
+        return entry
+
+    for label, (count, total_ms) in sorted(data.timings.items()):
+        base, labels = _split_label(label)
+        name = _metric_name(base, "_duration_ms")
+        samples = family(name, "summary").samples
+        quantiles = data.timing_quantiles.get(label, {})
+        for key, q in REPORTED_QUANTILES:
+            if key in quantiles:
+                samples.append(f"{name}{_format_labels(labels, ('quantile', str(q)))} {_format_value(quantiles[key])}")
+        samples.append(f"{name}_sum{_format_labels(labels)} {_format_value(total_ms)}")
+        samples.append(f"{name}_count{_format_labels(labels)} {_format_value(count)}")
+
+    for label, value in sorted(data.counters.items()):
+        base, labels = _split_label(label)
+        name = _metric_name(base, "_total")
+        family(name, "counter").samples.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for label, histogram in sorted(data.histograms.items()):
+        base, labels = _split_label(label)
+        name = _metric_name(base)
+        samples = family(name, "histogram").samples
+        cumulative = 0.0
+        for boundary, count in zip(histogram.boundaries + (float("inf"),), histogram.counts):
+            cumulative += count
+            samples.append(
+                f"{name}_bucket{_format_labels(labels, ('le', _format_value(boundary)))} {_format_value(cumulative)}"
+            )
+        samples.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+        samples.append(f"{name}_count{_format_labels(labels)} {_format_value(histogram.count)}")
+
+    for label, duration_ms in sorted(data.last_run_ms.items()):
+        base, labels = _split_label(label)
+        name = _metric_name(base, "_last_run_ms")
+        family(name, "gauge").samples.append(f"{name}{_format_labels(labels)} {_format_value(duration_ms)}")
+
+    lines: List[str] = []
+    for name in sorted(families):
+        entry = families[name]
+        lines.append(f"# TYPE {name} {entry.kind}")
+        lines.extend(entry.samples)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class PrometheusRenderer:
+    """Caches the rendered text of a registry until its version changes.
+
+    Without an explicit registry it renders ``read_registry()``, i.e. the
+    fleet-wide merge when multiprocess metrics are enabled.
+    """
+
+    def __init__(self, registry: Optional[_MetricsRegistry] = None) -> None:
+        self._registry = registry
+        self._lock = Lock()
+        self._cached: Tuple[_MetricsRegistry, int, int, str] | None = None
+
+    def render(self) -> str:
+        registry = self._registry if self._registry is not None else read_registry()
+        minute = int(time() // 60)
+        cached = self._cached
+        if cached is not None and cached[0] is registry and cached[1:3] == (registry.version, minute):
+            return cached[3]
+        with self._lock:
+            version, data = registry.export()
+            cached = self._cached
+            if cached is None or cached[0] is not registry or cached[1:3] != (version, minute):
+                cached = self._cached = (registry, version, minute, render_export(data))
+            return cached[3]
+
+
+prometheus_renderer = PrometheusRenderer()
+
+
+__all__ = ["CONTENT_TYPE", "PrometheusRenderer", "prometheus_renderer", "render_export"]
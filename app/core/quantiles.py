@@ -0,0 +1,200 @@
+"""Mergeable, bounded-memory quantile sketches for timing metrics.
+
+``QuantileSketch`` is a DDSketch: values fall into logarithmic bins whose
+width keeps every reported quantile within ``RELATIVE_ACCURACY`` of the true
+value, whatever the range. Bins are plain counts, so two sketches merge by
+adding them, and at most ``MAX_BINS`` are kept. When that limit is hit, the
+lowest bins are collapsed into one, which leaves the tail (what p99 and
+p99.9 read) exact to the accuracy bound.
+
+``WindowedSketch`` pairs a lifetime sketch with a ring of per-minute sketches,
+so "the last N minutes" is answered by merging the ring slots still inside
+the window.
+"""
+
+from __future__ import annotations
+
+from math import ceil, log
+from time import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+RELATIVE_ACCURACY = 0.01
+MAX_BINS = 1024
+# Timings at or below 1 µs are counted in the zero bin.
+MIN_VALUE_MS = 1e-3
+
+REPORTED_QUANTILES: Tuple[Tuple[str, float], ...] = (
+    ("p50_ms", 0.5),
+    ("p90_ms", 0.9),
+    ("p99_ms", 0.99),
+    ("p999_ms", 0.999),
+)
+
+_GAMMA = (1.0 + RELATIVE_ACCURACY) / (1.0 - RELATIVE_ACCURACY)
+_INV_LOG_GAMMA = 1.0 / log(_GAMMA)
+
+
+class QuantileSketch:
+    """DDSketch over positive values with ``RELATIVE_ACCURACY`` relative error."""
+
+    __slots__ = ("bins", "zero_count", "count", "min", "max")
+
+    def __init__(self) -> None:
+        self.bins: Dict[int, float] = {}
+        self.zero_count = 0.0
+        self.count = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1.0
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= MIN_VALUE_MS:
+            self.zero_count += 1.0
+            return
+        key = ceil(log(value) * _INV_LOG_GAMMA)
+        bins = self.bins
+        bins[key] = bins.get(key, 0.0) + 1.0
+        if len(bins) > MAX_BINS:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if not other.count:
+            return
+        for key, count in list(other.bins.items()):
+            self.bins[key] = self.bins.get(key, 0.0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+
+    def copy(self) -> "QuantileSketch":
+        clone = QuantileSketch()
+        clone.merge(self)
+        return clone
+
+    def as_state(self) -> Dict[str, Any]:
+        return {
+            "bins": {str(key): count for key, count in list(self.bins.items())},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "QuantileSketch":
+        sketch = cls()
+        sketch.bins = {int(key): float(count) for key, count in state["bins"].items()}
+        sketch.zero_count = float(state["zero_count"])
+        sketch.count = float(state["count"])
+        sketch.min = float(state["min"])
+        sketch.max = float(state["max"])
+        return sketch
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - MAX_BINS
+        moved = sum(self.bins.pop(key) for key in keys[:excess])
+        self.bins[keys[excess]] += moved
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile ``q`` (0..1); 0.0 for an empty sketch."""
+
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Values at ascending quantiles ``qs`` in one pass over the bins."""
+
+        if not self.count:
+            return [0.0 for _ in qs]
+        values: List[float] = []
+        keys = iter(sorted(self.bins))
+        seen = self.zero_count
+        estimate = max(self.min, 0.0)
+        for q in qs:
+            rank = q * (self.count - 1.0)
+            while seen <= rank:
+                key = next(keys, None)
+                if key is None:
+                    estimate = self.max
+                    break
+                seen += self.bins[key]
+                estimate = min(max(2.0 * _GAMMA**key / (_GAMMA + 1.0), self.min), self.max)
+            values.append(estimate)
+        return values
+
+    def summary(self) -> Dict[str, float]:
+        """``REPORTED_QUANTILES`` by name, e.g. ``{"p50_ms": ..., "p999_ms": ...}``."""
+
+        values = self.quantiles([q for _, q in REPORTED_QUANTILES])
+        return {name: value for (name, _), value in zip(REPORTED_QUANTILES, values)}
+
+
+class WindowedSketch:
+    """Lifetime sketch plus one sketch per wall-clock minute for the last ``minutes``."""
+
+    __slots__ = ("lifetime", "minutes", "_slots")
+
+    def __init__(self, minutes: int) -> None:
+        self.lifetime = QuantileSketch()
+        self.minutes = max(int(minutes), 1)
+        self._slots: List[Optional[Tuple[int, QuantileSketch]]] = [None] * self.minutes
+
+    def add(self, value: float) -> None:
+        self.lifetime.add(value)
+        minute = int(time() // 60)
+        index = minute % self.minutes
+        slot = self._slots[index]
+        if slot is None or slot[0] != minute:
+            slot = self._slots[index] = (minute, QuantileSketch())
+        slot[1].add(value)
+
+    def merge(self, other: "WindowedSketch") -> None:
+        self.lifetime.merge(other.lifetime)
+        for minute, sketch in other._live_slots(other.minutes):
+            index = minute % self.minutes
+            slot = self._slots[index]
+            if slot is None or slot[0] < minute:
+                self._slots[index] = (minute, sketch.copy())
+            elif slot[0] == minute:
+                slot[1].merge(sketch)
+
+    def as_state(self) -> Dict[str, Any]:
+        return {
+            "lifetime": self.lifetime.as_state(),
+            "slots": [[minute, sketch.as_state()] for minute, sketch in self._live_slots(self.minutes)],
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any], minutes: int) -> "WindowedSketch":
+        window = cls(minutes)
+        window.lifetime = QuantileSketch.from_state(state["lifetime"])
+        for minute, sketch in state["slots"]:
+            index = int(minute) % window.minutes
+            slot = window._slots[index]
+            if slot is None or slot[0] < int(minute):
+                window._slots[index] = (int(minute), QuantileSketch.from_state(sketch))
+        return window
+
+    def _live_slots(self, minutes: int) -> Iterable[Tuple[int, QuantileSketch]]:
+        oldest = int(time() // 60) - min(max(minutes, 1), self.minutes)
+        for slot in list(self._slots):
+            if slot is not None and slot[0] > oldest:
+                yield slot
+
+    def window(self, minutes: Optional[int] = None) -> QuantileSketch:
+        """Merged sketch of the last ``minutes`` (capped at ``self.minutes``; ``None`` = all of them)."""
+
+        merged = QuantileSketch()
+        for _, sketch in self._live_slots(minutes or self.minutes):
+            merged.merge(sketch)
+        return merged
+
+
+__all__ = ["QuantileSketch", "REPORTED_QUANTILES", "WindowedSketch"]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import AsyncIterator
+
+from fastapi import Header
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.config import settings
+from app.core.metrics import inc_counter, metrics_registry, observe_histogram, record_last_run
+from app.db.database import (
+    SESSION_DURATION_BUCKETS,
+    _principal_from_authorization,
+    engine as sync_engine,
+    read_your_writes,
+)
+from app.db.pool_telemetry import install_pool_telemetry
+
+# Async drivers per backend; the sync engine keeps psycopg2/pysqlite.
+_ASYNC_DRIVERS: dict[str, str] = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def async_database_url(database_url: str | URL) -> URL:
+    """Rewrite a sync database URL to its async driver (``asyncpg``/``aiosqlite``)."""
+
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for backend {backend!r}")
+    return url.set(drivername=f"{backend}+{driver}")
+
+
+def _build_async_engine(database_url: str | URL) -> AsyncEngine:
+    url = async_database_url(database_url)
+    kwargs: dict[str, object] = {"echo": False}
+    if url.get_backend_name() == "sqlite":
+        # aiosqlite runs each connection on its own thread; opening a file is
+        # cheap, so skip pooling rather than carry connections across loops.
+        # An in-memory database is private to its connection and therefore
+        # not shared with the sync engine.
+        database = url.database or ""
+        kwargs["poolclass"] = StaticPool if database in ("", ":memory:", "file::memory:") else NullPool
+    else:
+        kwargs.update(
+            {
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+                "pool_timeout": settings.db_pool_timeout,
+                "pool_recycle": settings.db_pool_recycle,
+                "pool_pre_ping": settings.db_pool_pre_ping,
+            }
+        )
+        if settings.db_oltp_statement_timeout_ms > 0:
+            kwargs["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.db_oltp_statement_timeout_ms)}
+            }
+    return create_async_engine(url, **kwargs)
+
+
+def _async_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+
+
+@dataclass(frozen=True, slots=True)
+class AsyncDatabaseGateway:
+    """``AsyncSession`` counterpart of ``DatabaseGateway`` for read paths.
+
+    Routing mirrors the sync gateway: ``read_only=True`` goes to the replica
+    unless the principal wrote within the read-your-writes window.
+    """
+
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    replica_engine: AsyncEngine | None = None
+    replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica_session_factory is not None
+
+    def _factory_for(self, read_only: bool, principal: object) -> async_sessionmaker[AsyncSession]:
+        if not read_only or self.replica_session_factory is None:
+            return self.session_factory
+        if read_your_writes.is_recent(principal):
+            inc_counter("db.session.read_your_writes")
+            return self.session_factory
+        inc_counter("db.session.replica")
+        return self.replica_session_factory
+
+    @asynccontextmanager
+    async def session(self, *, read_only: bool = False, principal: object = None) -> AsyncIterator[AsyncSession]:
+        started = perf_counter()
+        inc_counter("db.async_session.opens")
+        session = self._factory_for(read_only, principal)()
+        try:
+            yield session
+        finally:
+            elapsed_ms = (perf_counter() - started) * 1000.0
+            metrics_registry.record("db.async_session.duration", elapsed_ms)
+            observe_histogram("db.async_session.duration", elapsed_ms, buckets=SESSION_DURATION_BUCKETS)
+            record_last_run("db.async_session.duration", elapsed_ms)
+            inc_counter("db.async_session.closes")
+            await session.close()
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
+
+
+_async_gateway: AsyncDatabaseGateway | None = None
+_async_gateway_lock = Lock()
+
+
+def get_async_gateway() -> AsyncDatabaseGateway:
+    """Return the process-wide async gateway, creating engines on first use.
+
+    Built lazily so deployments that never hit an async route do not need the
+    async drivers installed.
+    """
+
+    global _async_gateway
+    if _async_gateway is None:
+        with _async_gateway_lock:
+            if _async_gateway is None:
+                primary = _build_async_engine(sync_engine.url.render_as_string(hide_password=False))
+                replica = (
+                    _build_async_engine(settings.database_replica_url) if settings.database_replica_url else None
+                )
+                # Pool events fire on the wrapped sync engine; query accounting
+                # already listens on every ``Engine``, async ones included.
+                install_pool_telemetry(primary.sync_engine, "oltp.async")
+                if replica is not None:
+                    install_pool_telemetry(replica.sync_engine, "oltp.async.replica")
+                _async_gateway = AsyncDatabaseGateway(
+                    engine=primary,
+                    session_factory=_async_sessionmaker(primary),
+                    replica_engine=replica,
+                    replica_session_factory=_async_sessionmaker(replica) if replica is not None else None,
+                )
+    return _async_gateway
+
+
+async def dispose_async_gateway() -> None:
+    """Dispose async engines on shutdown; no-op if none were created."""
+
+    global _async_gateway
+    gateway, _async_gateway = _async_gateway, None
+    if gateway is not None:
+        await gateway.dispose()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async dependency on the primary; for reads that must see the latest state."""
+
+    async with get_async_gateway().session() as session:
+        yield session
+
+
+async def get_async_read_db(authorization: str | None = Header(default=None)) -> AsyncIterator[AsyncSession]:
+    """Async read-only dependency with the same replica routing as ``get_read_db``."""
+
+    gateway = get_async_gateway()
+    principal = _principal_from_authorization(authorization, gateway)
+    async with gateway.session(read_only=True, principal=principal) as session:
+        yield session
+
+
+__all__ = [
+    "AsyncDatabaseGateway",
+    "async_database_url",
+    "get_async_gateway",
+    "dispose_async_gateway",
+    "get_async_db",
+    "get_async_read_db",
+]
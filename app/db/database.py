@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import hmac
 from contextlib import contextmanager
-from time import perf_counter
+from contextvars import ContextVar
+from hashlib import sha256
+from threading import Lock
+from time import monotonic, perf_counter, time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Callable, Iterator
 
-from sqlalchemy import Engine, create_engine
+from fastapi import Header
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.engine import make_url, URL
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 import logging
-from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
+from app.db.pool_telemetry import TimedQueuePool, install_pool_telemetry
+from app.db.sqlite_profile import SQLiteWriteQueue, install_sqlite_pragmas, install_write_serialization
 
 logger = logging.getLogger(__name__)
 from app.core.metrics import (
@@ -23,6 +30,7 @@ from app.core.metrics import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover - type checking helpers only
+    from app.db.async_database import AsyncDatabaseGateway
     from app.db.repositories import (
         AssessmentItemRepository,
         InstrumentRepository,
@@ -50,18 +58,117 @@ TRANSACTION_DURATION_BUCKETS: tuple[float, ...] = (
 )
 
 
+READ_YOUR_WRITES_COOKIE = "kolb_ryw"
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+# Marker sent by the client with this request, and markers issued while handling it.
+_CLIENT_WRITE_MARKER: ContextVar[str | None] = ContextVar("read_your_writes_client_marker", default=None)
+_ISSUED_WRITE_MARKERS: ContextVar[list[str] | None] = ContextVar("read_your_writes_issued", default=None)
+
+
+class ReadYourWritesTracker:
+    """Remembers principals that wrote recently so their reads skip the replica.
+
+    Replicas lag the primary; a student who just finalized must see their own
+    report. Entries expire after ``window_sec`` and are pruned lazily.
+
+    The in-process map only covers the worker that handled the write. For
+    ``uvicorn --workers N`` each write also issues a signed marker
+    (``<principal>.<until epoch>.<hmac>``), which ``ReadYourWritesMiddleware``
+    returns to the client as a cookie and header. Any worker honours the
+    marker until it expires.
+    """
+
+    _PRUNE_THRESHOLD = 1024
+
+    def __init__(self, window_sec: float) -> None:
+        self.window_sec = float(window_sec)
+        self._until: dict[str, float] = {}
+        self._lock = Lock()
+
+    def mark(self, principal: object) -> None:
+        if principal is None or self.window_sec <= 0:
+            return
+        now = monotonic()
+        with self._lock:
+            self._until[str(principal)] = now + self.window_sec
+            if len(self._until) > self._PRUNE_THRESHOLD:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+        issued = _ISSUED_WRITE_MARKERS.get()
+        if issued is not None:
+            issued.append(self.issue(principal))
+
+    def is_recent(self, principal: object) -> bool:
+        if principal is None:
+            return False
+        with self._lock:
+            until = self._until.get(str(principal))
+        if until is not None and until > monotonic():
+            return True
+        marker = _CLIENT_WRITE_MARKER.get()
+        return marker is not None and self.accepts(marker, principal)
+
+    @staticmethod
+    def _sign(payload: str) -> str:
+        return hmac.new(settings.jwt_secret_key.encode("utf-8"), payload.encode("utf-8"), sha256).hexdigest()[:32]
+
+    def issue(self, principal: object) -> str:
+        """Signed marker pinning ``principal`` to the primary until the window ends."""
+
+        payload = f"{principal}.{int(time() + self.window_sec) + 1}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def accepts(self, marker: str, principal: object) -> bool:
+        parts = marker.rsplit(".", 2)
+        if len(parts) != 3 or parts[0] != str(principal):
+            return False
+        payload = f"{parts[0]}.{parts[1]}"
+        if not hmac.compare_digest(parts[2], self._sign(payload)):
+            return False
+        try:
+            return int(parts[1]) > time()
+        except ValueError:
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+read_your_writes = ReadYourWritesTracker(settings.read_your_writes_window_sec)
+
+
 @dataclass(frozen=True, slots=True)
 class DatabaseGateway:
-    """Encapsulates engine and session factory lifecycle."""
+    """Encapsulates engine and session factory lifecycle.
+
+    When a replica is configured, ``session(read_only=True)`` routes to it
+    unless the principal wrote within the read-your-writes window.
+    """
 
     engine: Engine
     session_factory: sessionmaker[Session]
+    replica_engine: Engine | None = None
+    replica_session_factory: sessionmaker[Session] | None = None
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica_session_factory is not None
+
+    def _factory_for(self, read_only: bool, principal: object) -> sessionmaker[Session]:
+        if not read_only or self.replica_session_factory is None:
+            return self.session_factory
+        if read_your_writes.is_recent(principal):
+            inc_counter("db.session.read_your_writes")
+            return self.session_factory
+        inc_counter("db.session.replica")
+        return self.replica_session_factory
 
     @contextmanager
-    def session(self) -> Iterator[Session]:
+    def session(self, *, read_only: bool = False, principal: object = None) -> Iterator[Session]:
         started = perf_counter()
         inc_counter("db.session.opens")
-        session: Session = self.session_factory()
+        session: Session = self._factory_for(read_only, principal)()
         try:
             yield session
         finally:
@@ -119,12 +226,87 @@ class DatabaseGateway:
 ENGINE_CONFIG_SNAPSHOT: dict[str, object] = {}
 
 
-def _build_engine() -> Engine:
-    url: URL = make_url(settings.database_url)
+# SQLite has no server-side statement timeout; a progress handler invoked every
+# N virtual-machine steps aborts the statement once its deadline passes.
+SQLITE_PROGRESS_STEPS = 1000
+
+
+def _install_statement_timeout(engine_instance: Engine, timeout_ms: int, *, workload: str) -> None:
+    """Bound every statement on ``engine_instance`` to ``timeout_ms``.
+
+    PostgreSQL enforces ``statement_timeout`` server-side for the session; on
+    SQLite the deadline is armed around each cursor execute.
+    """
+
+    if timeout_ms <= 0:
+        return
+    dialect = engine_instance.dialect.name
+
+    if dialect == "postgresql":
+
+        @event.listens_for(engine_instance, "connect")
+        def _set_statement_timeout(dbapi_connection, connection_record):  # pragma: no cover - needs PostgreSQL
+            autocommit = dbapi_connection.autocommit
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+    elif dialect == "sqlite":
+        limit_sec = timeout_ms / 1000.0
+
+        @event.listens_for(engine_instance, "connect")
+        def _install_progress_handler(dbapi_connection, connection_record):
+            deadline: list[float | None] = [None]
+            connection_record.info["statement_deadline"] = deadline
+
+            def _abort_when_expired() -> int:
+                expires = deadline[0]
+                return 1 if expires is not None and monotonic() > expires else 0
+
+            dbapi_connection.set_progress_handler(_abort_when_expired, SQLITE_PROGRESS_STEPS)
+
+        @event.listens_for(engine_instance, "before_cursor_execute")
+        def _arm_deadline(conn, cursor, statement, parameters, context, executemany):
+            deadline = conn.info.get("statement_deadline")
+            if deadline is not None:
+                deadline[0] = monotonic() + limit_sec
+
+        @event.listens_for(engine_instance, "after_cursor_execute")
+        def _disarm_deadline(conn, cursor, statement, parameters, context, executemany):
+            deadline = conn.info.get("statement_deadline")
+            if deadline is not None:
+                deadline[0] = None
+
+    else:  # pragma: no cover - other dialects keep server defaults
+        return
+
+    @event.listens_for(engine_instance, "handle_error")
+    def _count_statement_timeouts(context):
+        message = str(context.original_exception).lower()
+        if "interrupted" in message or "statement timeout" in message:
+            inc_counter(f"db.statement_timeout.{workload}")
+
+
+def _build_engine(
+    database_url: str | None = None,
+    *,
+    snapshot: bool = True,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    statement_timeout_ms: int = 0,
+    workload: str = "oltp",
+) -> Engine:
+    database_url = database_url or settings.database_url
+    url: URL = make_url(database_url)
+    pool_size = settings.db_pool_size if pool_size is None else pool_size
+    max_overflow = settings.db_max_overflow if max_overflow is None else max_overflow
     kwargs: dict[str, object] = {
         "echo": False,
         "future": True,
     }
+    sqlite_file = False
 
     if url.get_backend_name() == "sqlite":
         connect_args: dict[str, object] = {"check_same_thread": False}
@@ -136,11 +318,12 @@ def _build_engine() -> Engine:
         if database in ("", None, ":memory:", "file::memory:"):
             kwargs["poolclass"] = StaticPool
         else:
+            sqlite_file = True
             kwargs.update(
                 {
-                    "poolclass": QueuePool,
-                    "pool_size": settings.db_pool_size,
-                    "max_overflow": settings.db_max_overflow,
+                    "poolclass": TimedQueuePool,
+                    "pool_size": pool_size,
+                    "max_overflow": max_overflow,
                     "pool_timeout": settings.db_pool_timeout,
                     "pool_recycle": settings.db_pool_recycle,
                     "pool_pre_ping": settings.db_pool_pre_ping,
@@ -149,16 +332,21 @@ def _build_engine() -> Engine:
     else:
         kwargs.update(
             {
-                "pool_size": settings.db_pool_size,
-                "max_overflow": settings.db_max_overflow,
+                "poolclass": TimedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
                 "pool_timeout": settings.db_pool_timeout,
                 "pool_recycle": settings.db_pool_recycle,
                 "pool_pre_ping": settings.db_pool_pre_ping,
             }
         )
 
-    engine_instance = create_engine(settings.database_url, **kwargs)
-    _set_engine_snapshot(engine_instance, kwargs)
+    engine_instance = create_engine(database_url, **kwargs)
+    if settings.sqlite_production_mode and sqlite_file:
+        install_sqlite_pragmas(engine_instance)
+    _install_statement_timeout(engine_instance, statement_timeout_ms, workload=workload)
+    if snapshot:
+        _set_engine_snapshot(engine_instance, kwargs)
     return engine_instance
 
 
@@ -177,9 +365,178 @@ def _set_engine_snapshot(engine_instance: Engine, kwargs: dict[str, object]) ->
     ENGINE_CONFIG_SNAPSHOT = snapshot
 
 
-engine: Engine = _build_engine()
-SessionLocal: sessionmaker[Session] = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-database_gateway = DatabaseGateway(engine=engine, session_factory=SessionLocal)
+def _is_memory_database(engine_instance: Engine) -> bool:
+    return engine_instance.dialect.name == "sqlite" and (engine_instance.url.database or "") in (
+        "",
+        ":memory:",
+        "file::memory:",
+    )
+
+
+def _sessionmaker(bind: Engine) -> sessionmaker[Session]:
+    factory = sessionmaker(bind=bind, autoflush=False, autocommit=False, future=True)
+    # Every pool on the SQLite file shares one writer queue, including the
+    # analytics/admin workload engines.
+    if sqlite_write_queue is not None and bind.url.database == engine.url.database:
+        install_write_serialization(factory, sqlite_write_queue)
+    return factory
+
+
+engine: Engine = _build_engine(statement_timeout_ms=settings.db_oltp_statement_timeout_ms)
+install_pool_telemetry(engine, "oltp")
+sqlite_write_queue: SQLiteWriteQueue | None = (
+    SQLiteWriteQueue(timeout_sec=settings.sqlite_write_queue_timeout_sec)
+    if settings.sqlite_production_mode and engine.dialect.name == "sqlite" and not _is_memory_database(engine)
+    else None
+)
+SessionLocal: sessionmaker[Session] = _sessionmaker(engine)
+replica_engine: Engine | None = (
+    _build_engine(
+        settings.database_replica_url,
+        snapshot=False,
+        statement_timeout_ms=settings.db_oltp_statement_timeout_ms,
+    )
+    if settings.database_replica_url
+    else None
+)
+if replica_engine is not None:
+    install_pool_telemetry(replica_engine, "oltp.replica")
+ReplicaSessionLocal: sessionmaker[Session] | None = (
+    _sessionmaker(replica_engine) if replica_engine is not None else None
+)
+database_gateway = DatabaseGateway(
+    engine=engine,
+    session_factory=SessionLocal,
+    replica_engine=replica_engine,
+    replica_session_factory=ReplicaSessionLocal,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkloadPoolConfig:
+    """Sizing and statement timeout for one workload pool."""
+
+    name: str
+    pool_size: int
+    max_overflow: int
+    statement_timeout_ms: int
+
+
+WORKLOAD_OLTP = "oltp"
+WORKLOAD_ANALYTICS = "analytics"
+WORKLOAD_ADMIN = "admin"
+
+WORKLOAD_POOL_CONFIGS: dict[str, WorkloadPoolConfig] = {
+    WORKLOAD_OLTP: WorkloadPoolConfig(
+        WORKLOAD_OLTP,
+        settings.db_pool_size,
+        settings.db_max_overflow,
+        settings.db_oltp_statement_timeout_ms,
+    ),
+    WORKLOAD_ANALYTICS: WorkloadPoolConfig(
+        WORKLOAD_ANALYTICS,
+        settings.db_analytics_pool_size,
+        settings.db_analytics_max_overflow,
+        settings.db_analytics_statement_timeout_ms,
+    ),
+    WORKLOAD_ADMIN: WorkloadPoolConfig(
+        WORKLOAD_ADMIN,
+        settings.db_admin_pool_size,
+        settings.db_admin_max_overflow,
+        settings.db_admin_statement_timeout_ms,
+    ),
+}
+
+
+def _build_workload_gateway(config: WorkloadPoolConfig) -> DatabaseGateway:
+    # An in-memory SQLite database lives inside its single StaticPool
+    # connection, so a second engine would see an empty schema.
+    if _is_memory_database(engine):
+        return database_gateway
+    primary = _build_engine(
+        engine.url.render_as_string(hide_password=False),
+        snapshot=False,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        statement_timeout_ms=config.statement_timeout_ms,
+        workload=config.name,
+    )
+    replica = (
+        _build_engine(
+            settings.database_replica_url,
+            snapshot=False,
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            statement_timeout_ms=config.statement_timeout_ms,
+            workload=config.name,
+        )
+        if settings.database_replica_url
+        else None
+    )
+    install_pool_telemetry(primary, config.name)
+    if replica is not None:
+        install_pool_telemetry(replica, f"{config.name}.replica")
+    return DatabaseGateway(
+        engine=primary,
+        session_factory=_sessionmaker(primary),
+        replica_engine=replica,
+        replica_session_factory=_sessionmaker(replica) if replica is not None else None,
+    )
+
+
+_workload_gateways: dict[str, DatabaseGateway] = {}
+_workload_lock = Lock()
+
+
+def get_workload_gateway(workload: str = WORKLOAD_OLTP) -> DatabaseGateway:
+    """Return the gateway for ``workload``, building its pool on first use.
+
+    ``oltp`` is the primary ``database_gateway`` so submit/finalize keep their
+    pool; ``analytics`` and ``admin`` get separate engines whose size bounds how
+    many connections heavy reads and maintenance jobs can hold.
+    """
+
+    if workload == WORKLOAD_OLTP:
+        return database_gateway
+    config = WORKLOAD_POOL_CONFIGS.get(workload)
+    if config is None:
+        raise ValueError(f"Unknown database workload: {workload!r}")
+    gateway = _workload_gateways.get(workload)
+    if gateway is None:
+        with _workload_lock:
+            gateway = _workload_gateways.get(workload)
+            if gateway is None:
+                gateway = _build_workload_gateway(config)
+                _workload_gateways[workload] = gateway
+    return gateway
+
+
+def dispose_workload_pools() -> None:
+    """Close pooled connections of the non-oltp workload engines."""
+
+    with _workload_lock:
+        for gateway in _workload_gateways.values():
+            if gateway is database_gateway:
+                continue
+            gateway.engine.dispose()
+            if gateway.replica_engine is not None:
+                gateway.replica_engine.dispose()
+
+
+def get_workload_pool_snapshot() -> dict[str, dict[str, object]]:
+    """Configured sizing per workload plus live pool status for built pools."""
+
+    snapshot: dict[str, dict[str, object]] = {}
+    for name, config in WORKLOAD_POOL_CONFIGS.items():
+        gateway = database_gateway if name == WORKLOAD_OLTP else _workload_gateways.get(name)
+        snapshot[name] = {
+            "pool_size": config.pool_size,
+            "max_overflow": config.max_overflow,
+            "statement_timeout_ms": config.statement_timeout_ms,
+            "shared_with_oltp": gateway is database_gateway and name != WORKLOAD_OLTP,
+            "status": gateway.engine.pool.status() if gateway is not None else None,
+        }
+    return snapshot
 
 
 def get_db():
@@ -187,6 +544,83 @@ def get_db():
         yield session
 
 
+def _principal_from_authorization(
+    authorization: str | None, gateway: DatabaseGateway | AsyncDatabaseGateway | None = None
+) -> str | None:
+    gateway = gateway or database_gateway
+    if not authorization or not gateway.has_replica:
+        return None
+    parts = authorization.split(" ")
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    from app.services.security import decode_access_token
+
+    try:
+        return str(decode_access_token(parts[1])["sub"])
+    except (ValueError, KeyError):
+        return None
+
+
+def get_read_db(authorization: str | None = Header(default=None)):
+    """Read-only dependency: replica when configured, primary right after a write.
+
+    Only use for endpoints that never write; sessions from the replica are not
+    guaranteed to accept INSERT/UPDATE.
+    """
+
+    principal = _principal_from_authorization(authorization)
+    with database_gateway.session(read_only=True, principal=principal) as session:
+        yield session
+
+
+def workload_db(workload: str, *, read_only: bool = False) -> Callable[..., Iterator[Session]]:
+    """Build a FastAPI dependency yielding a session from ``workload``'s pool.
+
+    ``read_only=True`` follows the same replica routing as ``get_read_db``.
+    """
+
+    if workload not in WORKLOAD_POOL_CONFIGS:
+        raise ValueError(f"Unknown database workload: {workload!r}")
+
+    def _dependency(authorization: str | None = Header(default=None)):
+        gateway = get_workload_gateway(workload)
+        principal = _principal_from_authorization(authorization, gateway) if read_only else None
+        with gateway.session(read_only=read_only, principal=principal) as session:
+            yield session
+
+    _dependency.__name__ = f"get_{workload}_{'read_' if read_only else ''}db"
+    return _dependency
+
+
+get_analytics_db = workload_db(WORKLOAD_ANALYTICS)
+get_analytics_read_db = workload_db(WORKLOAD_ANALYTICS, read_only=True)
+get_admin_db = workload_db(WORKLOAD_ADMIN)
+
+
+def mark_recent_write(principal: object) -> None:
+    """Pin ``principal``'s reads to the primary for the read-your-writes window."""
+
+    read_your_writes.mark(principal)
+
+
+@contextmanager
+def write_marker_scope(client_marker: str | None) -> Iterator[list[str]]:
+    """Request scope for read-your-writes markers.
+
+    Reads in the scope honour ``client_marker``. The yielded list collects the
+    markers issued by writes in the scope, for the caller to send back.
+    """
+
+    issued: list[str] = []
+    client_token = _CLIENT_WRITE_MARKER.set(client_marker)
+    issued_token = _ISSUED_WRITE_MARKERS.set(issued)
+    try:
+        yield issued
+    finally:
+        _ISSUED_WRITE_MARKERS.reset(issued_token)
+        _CLIENT_WRITE_MARKER.reset(client_token)
+
+
 @contextmanager
 def get_session() -> Iterator[Session]:
     """Yield a short-lived session for scripts/jobs, closing it automatically."""
@@ -196,18 +630,26 @@ def get_session() -> Iterator[Session]:
 
 
 @contextmanager
-def transactional_session() -> Iterator[Session]:
+def get_read_session(workload: str = WORKLOAD_OLTP) -> Iterator[Session]:
+    """Short-lived read-only session (replica when configured) for bulk reads."""
+
+    with get_workload_gateway(workload).session(read_only=True) as session:
+        yield session
+
+
+@contextmanager
+def transactional_session(workload: str = WORKLOAD_OLTP) -> Iterator[Session]:
     """Context manager that manages commit/rollback for explicit transactions."""
 
-    with database_gateway.transactional() as session:
+    with get_workload_gateway(workload).transactional() as session:
         yield session
 
 
 @contextmanager
-def hyperatomic_session() -> Iterator[Session]:
+def hyperatomic_session(workload: str = WORKLOAD_OLTP) -> Iterator[Session]:
     """Stricter transactional scope that prevents nested commits by callers."""
 
-    with database_gateway.transactional(flush_before_commit=True) as session:
+    with get_workload_gateway(workload).transactional(flush_before_commit=True) as session:
         yield session
 
 
@@ -246,9 +688,14 @@ class AssessmentRepositoryGroup:
 
 @dataclass(slots=True)
 class RepositoryProvider:
-    """Factory for repository instances bound to a specific session."""
+    """Factory for repository instances bound to a specific session.
+
+    ``workload`` records which pool the session came from so callers can pass
+    the provider along without losing the isolation choice.
+    """
 
     db: Session
+    workload: str = WORKLOAD_OLTP
 
     @property
     def sessions(self) -> "SessionRepository":
@@ -291,18 +738,22 @@ class RepositoryProvider:
         )
 
 
-def get_repository_provider(db: Session) -> RepositoryProvider:
+def get_repository_provider(db: Session, workload: str = WORKLOAD_OLTP) -> RepositoryProvider:
     """Helper to bind repository provider to an existing session."""
 
-    return RepositoryProvider(db)
+    return RepositoryProvider(db, workload)
 
 
 @contextmanager
-def repository_scope() -> Iterator[RepositoryProvider]:
-    """Yield a repository provider within an automatic transactional boundary."""
+def repository_scope(workload: str = WORKLOAD_OLTP) -> Iterator[RepositoryProvider]:
+    """Yield a repository provider within an automatic transactional boundary.
+
+    ``workload`` selects the connection pool (``oltp``, ``analytics`` or
+    ``admin``); heavy jobs should not borrow submit/finalize connections.
+    """
 
-    with hyperatomic_session() as db:
-        yield RepositoryProvider(db)
+    with hyperatomic_session(workload) as db:
+        yield RepositoryProvider(db, workload)
 
 
 __all__ = [
@@ -311,7 +762,28 @@ __all__ = [
     "engine",
     "SessionLocal",
     "get_db",
+    "get_read_db",
+    "get_analytics_db",
+    "get_analytics_read_db",
+    "get_admin_db",
+    "workload_db",
+    "get_workload_gateway",
+    "get_workload_pool_snapshot",
+    "dispose_workload_pools",
+    "sqlite_write_queue",
+    "WorkloadPoolConfig",
+    "WORKLOAD_POOL_CONFIGS",
+    "WORKLOAD_OLTP",
+    "WORKLOAD_ANALYTICS",
+    "WORKLOAD_ADMIN",
     "get_session",
+    "get_read_session",
+    "mark_recent_write",
+    "write_marker_scope",
+    "READ_YOUR_WRITES_COOKIE",
+    "READ_YOUR_WRITES_HEADER",
+    "read_your_writes",
+    "ReadYourWritesTracker",
     "transactional_session",
     "hyperatomic_session",
     "norm_session_scope",
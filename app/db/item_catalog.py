@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, event, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.assessments.klsi_v4.packing import decode_ranks
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter
+from app.models.klsi.enums import ItemType
+from app.models.klsi.items import AssessmentItem, ItemChoice
+
+logger = get_logger("kolb.db.item_catalog", component="db")
+
+_DIRTY_KEY = "item_bank_dirty"
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogChoice:
+    id: int
+    item_id: int
+    learning_mode: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogItem:
+    id: int
+    number: int
+    type: str
+    stem: str
+    choices: Tuple[CatalogChoice, ...]
+
+
+@dataclass(frozen=True)
+class ItemChoiceLayout:
+    """Maps learning-style items to pack slots and choices to learning modes."""
+
+    slot_by_item_id: Mapping[int, int]
+    item_id_by_slot: Mapping[int, int]
+    choice_modes: Mapping[int, Tuple[int, str]]
+    choice_ids: Mapping[Tuple[int, str], int]
+
+    def mode_ranks(self, ranks_by_choice: Mapping[int, int]) -> Dict[str, int]:
+        """``{choice_id: rank}`` → ``{mode: rank}``; unknown choices raise ``KeyError``."""
+
+        return {self.choice_modes[int(choice_id)][1]: int(rank) for choice_id, rank in ranks_by_choice.items()}
+
+    def choice_ranks(self, slot: int, index: int) -> Tuple[int, Dict[int, int]]:
+        """``(item_id, {choice_id: rank})`` for permutation ``index`` at item ``slot``."""
+
+        item_id = self.item_id_by_slot[slot]
+        return item_id, {self.choice_ids[(item_id, mode)]: rank for mode, rank in decode_ranks(index).items()}
+
+
+@dataclass(frozen=True)
+class ItemCatalog:
+    """Immutable snapshot of the item bank: items in ``item_number`` order plus lookups.
+
+    ``content_hash`` changes whenever any item or choice text, mode or id does,
+    so processes can compare the bank they serve.
+    """
+
+    epoch: int
+    content_hash: str
+    items: Tuple[CatalogItem, ...]
+    learning_item_ids: FrozenSet[int]
+    choice_ids_by_item: Mapping[int, FrozenSet[int]]
+    layout: ItemChoiceLayout
+
+    @classmethod
+    def build(cls, items: Tuple[CatalogItem, ...], *, epoch: int) -> "ItemCatalog":
+        digest = sha256()
+        slot_by_item_id: Dict[int, int] = {}
+        choice_modes: Dict[int, Tuple[int, str]] = {}
+        for item in items:
+            digest.update(repr((item.id, item.number, item.type, item.stem)).encode("utf-8"))
+            for choice in item.choices:
+                digest.update(repr((choice.id, choice.learning_mode, choice.text)).encode("utf-8"))
+            if item.type != ItemType.learning_style.value:
+                continue
+            slot_by_item_id[item.id] = item.number - 1
+            for choice in item.choices:
+                choice_modes[choice.id] = (item.id, choice.learning_mode)
+        layout = ItemChoiceLayout(
+            slot_by_item_id=MappingProxyType(slot_by_item_id),
+            item_id_by_slot=MappingProxyType({slot: item_id for item_id, slot in slot_by_item_id.items()}),
+            choice_modes=MappingProxyType(choice_modes),
+            choice_ids=MappingProxyType({choice: choice_id for choice_id, choice in choice_modes.items()}),
+        )
+        return cls(
+            epoch=epoch,
+            content_hash=digest.hexdigest(),
+            items=items,
+            learning_item_ids=frozenset(slot_by_item_id),
+            choice_ids_by_item=MappingProxyType(
+                {item.id: frozenset(choice.id for choice in item.choices) for item in items}
+            ),
+            layout=layout,
+        )
+
+
+_catalogs: "WeakKeyDictionary[Engine, ItemCatalog]" = WeakKeyDictionary()
+# When each cached catalog was last compared with the database.
+_checked_at: "WeakKeyDictionary[Engine, float]" = WeakKeyDictionary()
+_catalogs_lock = Lock()
+_epoch = 0
+
+
+def _load_items(db: Session) -> Tuple[CatalogItem, ...]:
+    rows = db.scalars(
+        select(AssessmentItem)
+        .options(selectinload(AssessmentItem.choices))
+        .order_by(AssessmentItem.item_number.asc(), AssessmentItem.id.asc())
+    ).all()
+    return tuple(
+        CatalogItem(
+            id=item.id,
+            number=item.item_number,
+            type=item.item_type.value,
+            stem=item.item_stem,
+            choices=tuple(
+                CatalogChoice(
+                    id=choice.id,
+                    item_id=item.id,
+                    learning_mode=choice.learning_mode.value,
+                    text=choice.choice_text,
+                )
+                for choice in sorted(item.choices, key=lambda choice: choice.id)
+            ),
+        )
+        for item in rows
+    )
+
+
+def _engine_of(db: Session) -> Engine:
+    bind = db.get_bind()
+    return bind if isinstance(bind, Engine) else bind.engine
+
+
+def get_item_catalog(db: Session) -> ItemCatalog:
+    """The catalog for ``db``'s database, built on first use and after each epoch bump.
+
+    Catalogs are kept per engine, so sessions on other databases (tests,
+    replicas of a different bank) never see each other's items. The epoch
+    only sees commits made in this process; every ``item_catalog_recheck_sec``
+    the bank is reloaded and the catalog replaced if its ``content_hash``
+    changed, which bounds how long other workers serve a stale bank.
+    """
+
+    engine_instance = _engine_of(db)
+    now = monotonic()
+    with _catalogs_lock:
+        catalog = _catalogs.get(engine_instance)
+        epoch = _epoch
+        checked_at = _checked_at.get(engine_instance, now)
+    if catalog is not None and catalog.epoch != epoch:
+        catalog = None
+    recheck_sec = settings.item_catalog_recheck_sec
+    if catalog is not None and (recheck_sec <= 0 or now - checked_at < recheck_sec):
+        inc_counter("item_catalog.hit")
+        return catalog
+    rebuilt = ItemCatalog.build(_load_items(db), epoch=epoch)
+    if catalog is not None and rebuilt.content_hash == catalog.content_hash:
+        with _catalogs_lock:
+            _checked_at[engine_instance] = now
+        inc_counter("item_catalog.recheck")
+        return catalog
+    with _catalogs_lock:
+        # Keep the newer snapshot if another thread built one meanwhile.
+        if _epoch == epoch:
+            _catalogs[engine_instance] = rebuilt
+            _checked_at[engine_instance] = now
+    inc_counter("item_catalog.build")
+    logger.info(
+        "item_catalog_built",
+        extra={
+            "structured_data": {
+                "epoch": epoch,
+                "items": len(rebuilt.items),
+                "content_hash": rebuilt.content_hash,
+                "changed_elsewhere": catalog is not None,
+            }
+        },
+    )
+    return rebuilt
+
+
+def bump_item_bank_epoch() -> int:
+    """Invalidate every catalog; the next lookup rebuilds from the database."""
+
+    global _epoch
+    with _catalogs_lock:
+        _epoch += 1
+        _catalogs.clear()
+        _checked_at.clear()
+        return _epoch
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_item_bank_writes(session: Session, flush_context: Any) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, (AssessmentItem, ItemChoice)):
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_item_bank_commit(session: Session) -> None:
+    # Bump only once the change is visible to other connections, so a rebuild
+    # racing the commit cannot cache the old bank under the new epoch.
+    if session.info.pop(_DIRTY_KEY, False):
+        bump_item_bank_epoch()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_item_bank_writes(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+__all__ = [
+    "CatalogChoice",
+    "CatalogItem",
+    "ItemCatalog",
+    "ItemChoiceLayout",
+    "bump_item_bank_epoch",
+    "get_item_catalog",
+]
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, Dict
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.logging import get_correlation_id, get_logger
+from app.core.metrics import get_counters, inc_counter, observe_histogram
+from app.db.query_accounting import current_route_label
+
+logger = get_logger("kolb.db.pool_telemetry", component="db")
+
+POOL_WAIT_BUCKETS: tuple[float, ...] = (1.0, 5.0, 25.0, 100.0, 500.0, 1000.0, 5000.0, 30000.0)
+POOL_HOLD_BUCKETS: tuple[float, ...] = (5.0, 25.0, 100.0, 500.0, 1000.0, 5000.0, 30000.0)
+
+# Connections checked out outside an HTTP request (schedulers, scripts).
+BACKGROUND_ROUTE = "background"
+
+_WAIT_KEY = "pool_telemetry_wait_ms"
+_CHECKOUT_KEY = "pool_telemetry_checkout"
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that records how long each checkout waited for a slot.
+
+    The pool has no "before checkout" event, so the wait is measured around
+    ``_do_get`` and handed to the ``checkout`` listener via the record's info.
+    ``recreate()`` builds ``self.__class__`` so timing survives ``dispose()``.
+    """
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            _record_timeout(self, (perf_counter() - started) * 1000.0)
+            raise
+        record.info[_WAIT_KEY] = (perf_counter() - started) * 1000.0
+        return record
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    name: str
+    engine: Engine
+    peak_checked_out: int = 0
+    last_saturation_warning: float | None = None
+
+
+_pools: Dict[str, _PoolEntry] = {}
+_pools_lock = Lock()
+
+
+def _capacity(pool: Any) -> int | None:
+    """Connections ``pool`` may hand out at once; ``None`` when unbounded."""
+
+    size = getattr(pool, "size", None)
+    if not callable(size):
+        return None
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return None
+    return size() + max_overflow
+
+
+def pool_state(pool: Any) -> Dict[str, Any]:
+    """Live occupancy of ``pool``; counters missing on Static/NullPool are ``None``."""
+
+    def _call(name: str) -> int | None:
+        method = getattr(pool, name, None)
+        return int(method()) if callable(method) else None
+
+    checked_out = _call("checkedout")
+    capacity = _capacity(pool)
+    return {
+        "poolclass": pool.__class__.__name__,
+        "size": _call("size"),
+        "checked_in": _call("checkedin"),
+        "checked_out": checked_out,
+        "overflow": _call("overflow"),
+        "capacity": capacity,
+        "utilization": round(checked_out / capacity, 3) if checked_out is not None and capacity else None,
+    }
+
+
+def _route() -> str:
+    return current_route_label() or BACKGROUND_ROUTE
+
+
+def _record_timeout(pool: Any, waited_ms: float) -> None:
+    with _pools_lock:
+        name = next((entry.name for entry in _pools.values() if entry.engine.pool is pool), None)
+    if name is None:
+        return
+    route = _route()
+    inc_counter(f"db.pool.{name}.timeouts")
+    observe_histogram(f"db.pool.{name}.checkout_wait_ms", waited_ms, buckets=POOL_WAIT_BUCKETS)
+    observe_histogram(f"db.pool.{name}.checkout_wait_ms.{route}", waited_ms, buckets=POOL_WAIT_BUCKETS)
+    logger.error(
+        "db_pool_timeout",
+        extra={
+            "structured_data": {
+                "pool": name,
+                "route": route,
+                "waited_ms": round(waited_ms, 3),
+                "correlation_id": get_correlation_id(),
+                **pool_state(pool),
+            }
+        },
+    )
+
+
+def _check_saturation(entry: _PoolEntry, pool: Any) -> None:
+    state = pool_state(pool)
+    checked_out = state["checked_out"]
+    if checked_out is None:
+        return
+    if checked_out > entry.peak_checked_out:
+        entry.peak_checked_out = checked_out
+    utilization = state["utilization"]
+    if utilization is None or utilization < settings.db_pool_saturation_ratio:
+        return
+    inc_counter(f"db.pool.{entry.name}.saturated")
+    now = monotonic()
+    last = entry.last_saturation_warning
+    if last is not None and now - last < settings.db_pool_saturation_log_interval_sec:
+        return
+    entry.last_saturation_warning = now
+    logger.warning(
+        "db_pool_saturated",
+        extra={"structured_data": {"pool": entry.name, "route": _route(), **state}},
+    )
+
+
+def install_pool_telemetry(engine_instance: Engine, name: str) -> None:
+    """Feed ``engine_instance``'s pool events into ``metrics_registry`` as ``db.pool.<name>.*``.
+
+    Checkout wait and hold times are recorded as histograms, overall and per
+    route template; connects, invalidations and overflow checkouts are
+    counted. A warning is logged (at most once per
+    ``db_pool_saturation_log_interval_sec``) when checked-out connections
+    reach ``db_pool_saturation_ratio`` of the pool's capacity.
+    """
+
+    if not settings.db_pool_telemetry_enabled:
+        return
+    entry = _PoolEntry(name=name, engine=engine_instance)
+    with _pools_lock:
+        _pools[name] = entry
+
+    @event.listens_for(engine_instance, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        inc_counter(f"db.pool.{name}.connects")
+
+    @event.listens_for(engine_instance, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        route = _route()
+        inc_counter(f"db.pool.{name}.checkouts")
+        waited_ms = connection_record.info.pop(_WAIT_KEY, None)
+        if waited_ms is not None:
+            observe_histogram(f"db.pool.{name}.checkout_wait_ms", waited_ms, buckets=POOL_WAIT_BUCKETS)
+            observe_histogram(f"db.pool.{name}.checkout_wait_ms.{route}", waited_ms, buckets=POOL_WAIT_BUCKETS)
+        connection_record.info[_CHECKOUT_KEY] = (perf_counter(), route)
+        pool = engine_instance.pool
+        overflow = getattr(pool, "overflow", None)
+        if callable(overflow) and overflow() > 0:
+            inc_counter(f"db.pool.{name}.overflow_checkouts")
+        _check_saturation(entry, pool)
+
+    @event.listens_for(engine_instance, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checkout = connection_record.info.pop(_CHECKOUT_KEY, None)
+        if checkout is None:
+            return
+        started, route = checkout
+        held_ms = (perf_counter() - started) * 1000.0
+        observe_histogram(f"db.pool.{name}.hold_ms", held_ms, buckets=POOL_HOLD_BUCKETS)
+        observe_histogram(f"db.pool.{name}.hold_ms.{route}", held_ms, buckets=POOL_HOLD_BUCKETS)
+
+    @event.listens_for(engine_instance, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        inc_counter(f"db.pool.{name}.invalidations")
+        logger.warning(
+            "db_pool_connection_invalidated",
+            extra={"structured_data": {"pool": name, "error": str(exception) if exception else None}},
+        )
+
+    @event.listens_for(engine_instance, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        inc_counter(f"db.pool.{name}.soft_invalidations")
+
+
+def get_pool_telemetry_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Live state, peak checkouts and event counters for every instrumented pool."""
+
+    counters = get_counters()
+    with _pools_lock:
+        entries = list(_pools.values())
+    snapshot: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        prefix = f"db.pool.{entry.name}."
+        snapshot[entry.name] = {
+            **pool_state(entry.engine.pool),
+            "peak_checked_out": entry.peak_checked_out,
+            "counters": {
+                label[len(prefix):]: value for label, value in counters.items() if label.startswith(prefix)
+            },
+        }
+    return snapshot
+
+
+__all__ = [
+    "BACKGROUND_ROUTE",
+    "POOL_HOLD_BUCKETS",
+    "POOL_WAIT_BUCKETS",
+    "TimedQueuePool",
+    "get_pool_telemetry_snapshot",
+    "install_pool_telemetry",
+    "pool_state",
+]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import Engine, event
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.core.logging import correlation_context, get_correlation_id, get_logger
+from app.core.metrics import inc_counter, metrics_registry, observe_histogram
+
+logger = get_logger("kolb.db.query_accounting", component="db")
+
+QUERY_COUNT_BUCKETS: tuple[float, ...] = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanding IN lists render one placeholder per value; collapse them so the
+# same query with 3 or 30 ids shares a fingerprint.
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|:\w+|\$\d+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise SQL text so repeated executions of one query compare equal."""
+
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _NUMBER.sub("?", normalized)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statement accounting for one request or pipeline stage."""
+
+    label: str
+    kind: str
+    statements: int = 0
+    db_ms: float = 0.0
+    rows: int = 0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float, rowcount: int) -> None:
+        self.statements += 1
+        self.db_ms += elapsed_ms
+        if rowcount > 0:
+            self.rows += rowcount
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(fp, count) for fp, count in self.fingerprints.most_common() if count >= threshold]
+
+    def as_dict(self, threshold: int) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "kind": self.kind,
+            "statements": self.statements,
+            "db_ms": round(self.db_ms, 3),
+            "rows": self.rows,
+            "distinct_statements": len(self.fingerprints),
+            "repeated": [{"fingerprint": fp[:200], "count": count} for fp, count in self.repeated(threshold)],
+        }
+
+
+# Route template of the request being served ("GET /reports/{session_id}");
+# also read by pool telemetry to label checkout wait and hold times.
+_REQUEST_ROUTE: ContextVar[str | None] = ContextVar("request_route", default=None)
+
+
+def current_route_label() -> str | None:
+    return _REQUEST_ROUTE.get()
+
+
+def _route_label(scope) -> str:
+    app = scope.get("app")
+    method = scope.get("method", "GET")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{method} {getattr(route, 'path', '')}"
+    return f"{method} unmatched"
+
+
+# Active scopes, outermost first; a statement is charged to every open scope
+# so a stage's queries also count towards the enclosing request.
+_ACTIVE_SCOPES: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_accounting_scopes", default=())
+
+
+def current_query_stats() -> QueryStats | None:
+    scopes = _ACTIVE_SCOPES.get()
+    return scopes[-1] if scopes else None
+
+
+def _emit(stats: QueryStats) -> None:
+    threshold = settings.query_n_plus_one_threshold
+    prefix = f"db.queries.{stats.kind}.{stats.label}"
+    inc_counter(f"{prefix}.statements", stats.statements)
+    metrics_registry.record(f"{prefix}.db_ms", stats.db_ms)
+    observe_histogram(f"{prefix}.statements", float(stats.statements), buckets=QUERY_COUNT_BUCKETS)
+    summary = stats.as_dict(threshold)
+    summary["correlation_id"] = get_correlation_id()
+    if summary["repeated"]:
+        inc_counter("db.queries.n_plus_one")
+        logger.warning("query_n_plus_one_suspected", extra={"structured_data": summary})
+    elif stats.kind == "request":
+        logger.info("query_accounting", extra={"structured_data": summary})
+    else:
+        logger.debug("query_accounting", extra={"structured_data": summary})
+
+
+@contextmanager
+def query_scope(label: str, *, kind: str = "stage") -> Iterator[QueryStats]:
+    """Account every SQL statement executed in this context under ``label``.
+
+    Scopes nest: statements are charged to the innermost and all enclosing
+    scopes. On exit the totals go to ``metrics_registry`` and structured logs,
+    with a warning when a fingerprint repeats ``query_n_plus_one_threshold``
+    times.
+    """
+
+    stats = QueryStats(label=label, kind=kind)
+    if not settings.query_accounting_enabled:
+        yield stats
+        return
+    token = _ACTIVE_SCOPES.set(_ACTIVE_SCOPES.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _ACTIVE_SCOPES.reset(token)
+        _emit(stats)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if _ACTIVE_SCOPES.get():
+        conn.info.setdefault("query_accounting_started", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _charge_query(conn, cursor, statement, parameters, context, executemany):
+    scopes = _ACTIVE_SCOPES.get()
+    if not scopes:
+        return
+    started_stack = conn.info.get("query_accounting_started")
+    if not started_stack:
+        return
+    elapsed_ms = (perf_counter() - started_stack.pop()) * 1000.0
+    # Drivers report rowcount for DML; psycopg2 also reports it for SELECT,
+    # sqlite3 does not (-1), so SQLite row totals cover writes only.
+    rowcount = getattr(cursor, "rowcount", -1) or 0
+    for stats in scopes:
+        stats.record(statement, elapsed_ms, rowcount)
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_failed_query_timer(exception_context):
+    # after_cursor_execute never fires for a failed statement; without this its
+    # start time would stay on the pooled connection for good.
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None:
+        return
+    started_stack = conn.info.get("query_accounting_started")
+    if started_stack:
+        started_stack.pop()
+
+
+# Scrape and probe endpoints; accounting them would bump the metrics registry
+# on every scrape and defeat the Prometheus render cache.
+UNACCOUNTED_PATHS: frozenset[str] = frozenset({"/metrics", "/health"})
+
+
+class QueryAccountingMiddleware:
+    """ASGI middleware opening a request-level ``query_scope``.
+
+    The label is the matched route template (``GET /reports/{session_id}``) so
+    metrics stay low-cardinality; a correlation id is bound for the request
+    unless the caller already set one. ``UNACCOUNTED_PATHS`` pass through.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope.get("path") in UNACCOUNTED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        label = _route_label(scope)
+        token = _REQUEST_ROUTE.set(label)
+        try:
+            with correlation_context(get_correlation_id()), query_scope(label, kind="request"):
+                await self.app(scope, receive, send)
+        finally:
+            _REQUEST_ROUTE.reset(token)
+
+
+__all__ = [
+    "QueryStats",
+    "QueryAccountingMiddleware",
+    "UNACCOUNTED_PATHS",
+    "current_query_stats",
+    "current_route_label",
+    "fingerprint",
+    "query_scope",
+]
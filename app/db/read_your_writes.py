@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from http.cookies import CookieError, SimpleCookie
+
+from app.db.database import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_HEADER,
+    read_your_writes,
+    write_marker_scope,
+)
+
+
+def _client_marker(scope) -> str | None:
+    cookie_header = None
+    for name, value in scope.get("headers", ()):
+        if name == READ_YOUR_WRITES_HEADER.encode("latin-1"):
+            return value.decode("latin-1")
+        if name == b"cookie":
+            cookie_header = value.decode("latin-1")
+    if cookie_header is None:
+        return None
+    try:
+        morsel = SimpleCookie(cookie_header).get(READ_YOUR_WRITES_COOKIE)
+    except CookieError:
+        return None
+    return morsel.value if morsel is not None else None
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware carrying read-your-writes markers through the client.
+
+    The marker from the ``kolb_ryw`` cookie (or ``X-Read-Your-Writes``
+    header) applies to the request's reads. Markers issued by the request's
+    writes go back in both, so the next read stays on the primary even when
+    another worker serves it.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with write_marker_scope(_client_marker(scope)) as issued:
+
+            async def _send(message) -> None:
+                if message["type"] == "http.response.start" and issued:
+                    marker = issued[-1]
+                    max_age = int(read_your_writes.window_sec) + 1
+                    cookie = f"{READ_YOUR_WRITES_COOKIE}={marker}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", ()),
+                            (b"set-cookie", cookie.encode("latin-1")),
+                            (READ_YOUR_WRITES_HEADER.encode("latin-1"), marker.encode("latin-1")),
+                        ],
+                    }
+                await send(message)
+
+            await self.app(scope, receive, _send)
+
+
+__all__ = ["ReadYourWritesMiddleware"]
@@ -1,4 +1,8 @@
-from app.db.repositories.normative import NormativeConversionRepository, NormativeConversionRow
+from app.db.repositories.normative import (
+    NormativeConversionRepository,
+    NormativeConversionRow,
+    NormativeSampleRepository,
+)
 from app.db.repositories.protocols import NormConversionReader
 from app.db.repositories.sessions import SessionRepository
 from app.db.repositories.team import (
@@ -12,6 +16,7 @@ from app.db.repositories.research import (
     ResearchStudyRepository,
     ReliabilityRepository,
     ValidityRepository,
+    ResearchExportRepository,
 )
 from app.db.repositories.user import UserRepository
 from app.db.repositories.assessment import (
@@ -19,16 +24,26 @@ from app.db.repositories.assessment import (
     UserResponseRepository,
     LFIContextRepository,
     ItemRankAggregate,
+    ItemChoiceLayout,
+    ResponsePackRepository,
 )
 from app.db.repositories.pipeline import (
     InstrumentRepository,
     PipelineRepository,
 )
 from app.db.repositories.styles import StyleRepository
+from app.db.repositories.analytics import ClassStyleStatsRepository, ClassStyleStatRow
+from app.db.repositories.statements import get_statement_cache_stats, prepared
+from app.db.repositories.async_reads import (
+    AsyncSessionReadRepository,
+    AsyncTeamRollupReadRepository,
+    AsyncUserReadRepository,
+)
 
 __all__ = [
     "NormativeConversionRepository",
     "NormativeConversionRow",
+    "NormativeSampleRepository",
     "NormConversionReader",
     "SessionRepository",
     "TeamRepository",
@@ -39,12 +54,22 @@ __all__ = [
     "ResearchStudyRepository",
     "ReliabilityRepository",
     "ValidityRepository",
+    "ResearchExportRepository",
     "UserRepository",
     "AssessmentItemRepository",
     "UserResponseRepository",
     "LFIContextRepository",
     "ItemRankAggregate",
+    "ItemChoiceLayout",
+    "ResponsePackRepository",
     "InstrumentRepository",
     "PipelineRepository",
     "StyleRepository",
+    "ClassStyleStatsRepository",
+    "ClassStyleStatRow",
+    "AsyncSessionReadRepository",
+    "AsyncTeamRollupReadRepository",
+    "AsyncUserReadRepository",
+    "get_statement_cache_stats",
+    "prepared",
 ]
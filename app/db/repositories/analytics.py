@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, literal, literal_column, select, text, update
+from sqlalchemy.orm import Session
+
+from app.db.repositories.base import Repository
+from app.models.klsi.analytics import ClassStyleStat
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.learning import CombinationScore, LearningStyleType, UserLearningStyle
+from app.models.klsi.user import User
+
+MV_CLASS_STYLE_STATS = "mv_class_style_stats"
+
+
+def _band_expression(column, cuts: tuple[int, int]):
+    low, mid = (int(cut) for cut in cuts)
+    return case(
+        (column <= literal_column(str(low)), literal_column("'Low'")),
+        (column <= literal_column(str(mid)), literal_column("'Mid'")),
+        else_=literal_column("'High'"),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ClassStyleStatRow:
+    kelas: Optional[str]
+    stat_date: date
+    acce_band: str
+    aero_band: str
+    style_name: Optional[str]
+    session_count: int
+
+
+@dataclass(slots=True, repr=True)
+class ClassStyleStatsRepository(Repository[Session]):
+    """Repository maintaining the portable ``class_style_stats`` aggregate."""
+
+    def increment(
+        self,
+        *,
+        kelas: Optional[str],
+        stat_date: date,
+        acce_band: str,
+        aero_band: str,
+        style_name: Optional[str],
+        amount: int = 1,
+    ) -> None:
+        """Add ``amount`` sessions to a single grain cell, creating it when absent."""
+
+        grain = and_(
+            ClassStyleStat.kelas == kelas,
+            ClassStyleStat.stat_date == stat_date,
+            ClassStyleStat.acce_band == acce_band,
+            ClassStyleStat.aero_band == aero_band,
+            ClassStyleStat.style_name == style_name,
+        )
+        # Relative UPDATE keeps concurrent finalizes from losing increments.
+        result = self.db.execute(
+            update(ClassStyleStat)
+            .where(grain)
+            .values(
+                session_count=ClassStyleStat.session_count + int(amount),
+                updated_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return
+        self.db.add(
+            ClassStyleStat(
+                kelas=kelas,
+                stat_date=stat_date,
+                acce_band=acce_band,
+                aero_band=aero_band,
+                style_name=style_name,
+                session_count=int(amount),
+            )
+        )
+        self.db.flush()
+
+    def rebuild(
+        self,
+        *,
+        acce_cuts: tuple[int, int],
+        aero_cuts: tuple[int, int],
+        kelas: Optional[str] = None,
+    ) -> int:
+        """Recompute the aggregate from completed sessions with one INSERT .. SELECT.
+
+        ``acce_cuts``/``aero_cuts`` are the inclusive upper bounds of the Low
+        and Mid bands. When ``kelas`` is given only that class is rebuilt.
+        Returns the number of aggregate rows written.
+        """
+
+        delete_stmt = delete(ClassStyleStat)
+        if kelas is not None:
+            delete_stmt = delete_stmt.where(ClassStyleStat.kelas == kelas)
+        self.db.execute(delete_stmt.execution_options(synchronize_session=False))
+
+        # Literal columns (not bind params) so PostgreSQL matches the CASE
+        # expressions in the SELECT list against the GROUP BY clause.
+        acce_band = _band_expression(CombinationScore.ACCE_raw, acce_cuts)
+        aero_band = _band_expression(CombinationScore.AERO_raw, aero_cuts)
+        stat_date = func.date(AssessmentSession.end_time)
+        source = (
+            select(
+                User.kelas,
+                stat_date,
+                acce_band,
+                aero_band,
+                LearningStyleType.style_name,
+                func.count(),
+                literal(datetime.now(timezone.utc), type_=ClassStyleStat.updated_at.type),
+            )
+            .select_from(AssessmentSession)
+            .join(User, User.id == AssessmentSession.user_id)
+            .join(CombinationScore, CombinationScore.session_id == AssessmentSession.id)
+            .outerjoin(UserLearningStyle, UserLearningStyle.session_id == AssessmentSession.id)
+            .outerjoin(
+                LearningStyleType,
+                LearningStyleType.id == UserLearningStyle.primary_style_type_id,
+            )
+            .where(AssessmentSession.status == SessionStatus.completed)
+            .where(AssessmentSession.end_time.is_not(None))
+            .group_by(User.kelas, stat_date, acce_band, aero_band, LearningStyleType.style_name)
+        )
+        if kelas is not None:
+            source = source.where(User.kelas == kelas)
+        result = self.db.execute(
+            insert(ClassStyleStat).from_select(
+                [
+                    ClassStyleStat.kelas,
+                    ClassStyleStat.stat_date,
+                    ClassStyleStat.acce_band,
+                    ClassStyleStat.aero_band,
+                    ClassStyleStat.style_name,
+                    ClassStyleStat.session_count,
+                    ClassStyleStat.updated_at,
+                ],
+                source,
+            )
+        )
+        return int(result.rowcount or 0)
+
+    def list_for_kelas(
+        self,
+        kelas: str,
+        *,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[ClassStyleStatRow]:
+        stmt = (
+            select(
+                ClassStyleStat.kelas,
+                ClassStyleStat.stat_date,
+                ClassStyleStat.acce_band,
+                ClassStyleStat.aero_band,
+                ClassStyleStat.style_name,
+                ClassStyleStat.session_count,
+            )
+            .where(ClassStyleStat.kelas == kelas)
+            .order_by(ClassStyleStat.stat_date.asc(), ClassStyleStat.style_name.asc())
+        )
+        if date_from is not None:
+            stmt = stmt.where(ClassStyleStat.stat_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(ClassStyleStat.stat_date <= date_to)
+        return [
+            ClassStyleStatRow(
+                kelas=row.kelas,
+                stat_date=row.stat_date,
+                acce_band=row.acce_band,
+                aero_band=row.aero_band,
+                style_name=row.style_name,
+                session_count=int(row.session_count or 0),
+            )
+            for row in self.db.execute(stmt)
+        ]
+
+    def refresh_materialized_view(self, *, concurrently: bool = True) -> bool:
+        """Refresh the PostgreSQL materialized view; no-op on other dialects."""
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        keyword = "CONCURRENTLY " if concurrently else ""
+        self.db.execute(text(f"REFRESH MATERIALIZED VIEW {keyword}{MV_CLASS_STYLE_STATS}"))
+        return True
@@ -1,17 +1,61 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import BindParameter, bindparam, delete, event, exists, func, or_, select
 from sqlalchemy.orm import Session, joinedload
 
+from app.assessments.klsi_v4.packing import (
+    CONTEXT_ORDER,
+    EMPTY_CONTEXT_RANKS,
+    EMPTY_ITEM_RANKS,
+    decode_ranks,
+    encode_ranks,
+    unpack_slots,
+    with_slot,
+)
+from app.db.item_catalog import ItemChoiceLayout, get_item_catalog
 from app.db.repositories.base import Repository
-from app.models.klsi.enums import ItemType
-from app.models.klsi.items import AssessmentItem, ItemChoice, UserResponse
+from app.db.repositories.statements import prepared
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import ItemChoice, SessionResponsePack, UserResponse
 from app.models.klsi.learning import LFIContextScore
 
 
+_session_id: BindParameter[int] = bindparam("session_id")
+
+# Session ids known to have no pack in the session's current transaction.
+_MISSING_PACKS_KEY = "response_packs_missing"
+
+_AGGREGATE_RANKS_BY_ITEM = prepared(
+    "responses.aggregate_ranks_by_item",
+    select(UserResponse.item_id, UserResponse.rank_value, func.count().label("cnt"))
+    .where(UserResponse.session_id == _session_id)
+    .group_by(UserResponse.item_id, UserResponse.rank_value),
+)
+_FIND_DUPLICATE_CHOICES = prepared(
+    "responses.find_duplicate_choices",
+    select(UserResponse.choice_id, func.count().label("c"))
+    .where(UserResponse.session_id == _session_id)
+    .group_by(UserResponse.choice_id)
+    .having(func.count() > 1),
+)
+_LIST_WITH_CHOICES = prepared(
+    "responses.list_with_choices",
+    select(UserResponse)
+    .options(joinedload(UserResponse.choice).joinedload(ItemChoice.item))
+    .where(UserResponse.session_id == _session_id),
+)
+_LFI_CONTEXTS_FOR_SESSION = prepared(
+    "lfi_contexts.list_for_session",
+    select(LFIContextScore).where(LFIContextScore.session_id == _session_id),
+)
+
+
 @dataclass
 class ItemRankAggregate:
     item_id: int
@@ -19,17 +63,228 @@ class ItemRankAggregate:
     count: int
 
 
+def pack_item_mode_ranks(pack: SessionResponsePack) -> List[Tuple[int, str, int]]:
+    """``(item_number, mode, rank)`` for every answered item slot of ``pack``."""
+
+    return [
+        (slot + 1, mode, rank)
+        for slot, index in enumerate(unpack_slots(pack.item_ranks))
+        if index is not None
+        for mode, rank in decode_ranks(index).items()
+    ]
+
+
+def pack_context_scores(pack: SessionResponsePack) -> List[LFIContextScore]:
+    """Transient ``LFIContextScore`` objects for the answered context slots of ``pack``."""
+
+    scores: List[LFIContextScore] = []
+    for slot, index in enumerate(unpack_slots(pack.context_ranks)):
+        if index is None:
+            continue
+        ranks = decode_ranks(index)
+        scores.append(
+            LFIContextScore(
+                session_id=pack.session_id,
+                context_name=CONTEXT_ORDER[slot],
+                CE_rank=ranks["CE"],
+                RO_rank=ranks["RO"],
+                AC_rank=ranks["AC"],
+                AE_rank=ranks["AE"],
+            )
+        )
+    return scores
+
+
+@dataclass
+class ResponsePackRepository(Repository[Session]):
+    """Reads and writes the packed one-row-per-session response store."""
+
+    def get(self, session_id: int) -> Optional[SessionResponsePack]:
+        # Session.get consults the identity map first, so repeated hits within
+        # one finalize cost a single query; misses (legacy row-level sessions)
+        # are remembered in ``session.info`` until the transaction ends.
+        missing = self.db.info.get(_MISSING_PACKS_KEY)
+        if missing is not None and session_id in missing:
+            return None
+        pack = self.db.get(SessionResponsePack, session_id)
+        if pack is None:
+            self.db.info.setdefault(_MISSING_PACKS_KEY, set()).add(session_id)
+        return pack
+
+    def _add(self, pack: SessionResponsePack) -> None:
+        self.db.add(pack)
+        self.db.info.get(_MISSING_PACKS_KEY, set()).discard(pack.session_id)
+
+    def item_layout(self) -> ItemChoiceLayout:
+        return get_item_catalog(self.db).layout
+
+    def _get_or_create(self, session_id: int) -> SessionResponsePack:
+        pack = self.get(session_id)
+        if pack is None:
+            pack = SessionResponsePack(
+                session_id=session_id,
+                item_ranks=EMPTY_ITEM_RANKS,
+                context_ranks=EMPTY_CONTEXT_RANKS,
+            )
+            self._add(pack)
+        return pack
+
+    def save_submission(
+        self,
+        session_id: int,
+        items: Iterable[Tuple[int, Mapping[int, int]]],
+        contexts: Iterable[Tuple[str, Mapping[str, int]]],
+    ) -> SessionResponsePack:
+        """Write ``(item_id, {choice_id: rank})`` and ``(context_name, {mode: rank})`` into the pack.
+
+        Slots not mentioned keep their previous value.
+
+        Raises:
+            ValueError: For unknown items, choices or contexts, or ranks that
+                are not a permutation of 1–4.
+        """
+
+        layout = self.item_layout()
+        pack = self._get_or_create(session_id)
+        pack.item_ranks, pack.context_ranks = self._fold(
+            layout, pack.item_ranks, pack.context_ranks, items, contexts
+        )
+        return pack
+
+    @classmethod
+    def _fold(
+        cls,
+        layout: ItemChoiceLayout,
+        item_ranks: bytes,
+        context_ranks: bytes,
+        items: Iterable[Tuple[int, Mapping[int, int]]],
+        contexts: Iterable[Tuple[str, Mapping[str, int]]],
+    ) -> Tuple[bytes, bytes]:
+        for item_id, ranks_by_choice in items:
+            item_ranks = with_slot(item_ranks, *cls._item_slot(layout, item_id, ranks_by_choice))
+        for context_name, ranks in contexts:
+            context_ranks = with_slot(context_ranks, *cls._context_slot(context_name, ranks))
+        return item_ranks, context_ranks
+
+    def archivable_session_ids(self, ended_before: datetime, *, after_id: int, limit: int) -> List[int]:
+        """Completed sessions ended before ``ended_before`` that still have response rows.
+
+        Keyset-paginated on session id so skipped sessions are not revisited.
+        """
+
+        has_rows = or_(
+            exists().where(UserResponse.session_id == AssessmentSession.id),
+            exists().where(LFIContextScore.session_id == AssessmentSession.id),
+        )
+        stmt = (
+            select(AssessmentSession.id)
+            .where(
+                AssessmentSession.id > after_id,
+                AssessmentSession.status == SessionStatus.completed,
+                AssessmentSession.end_time < ended_before,
+                has_rows,
+            )
+            .order_by(AssessmentSession.id)
+            .limit(limit)
+        )
+        return list(self.db.scalars(stmt))
+
+    def archive_rows(self, session_ids: Sequence[int]) -> Tuple[List[int], List[int], int]:
+        """Fold the response rows of ``session_ids`` into packs and delete the rows.
+
+        Sessions that already have a pack only lose their compatibility rows.
+        Sessions whose rows do not form valid rankings keep them untouched.
+        Returns ``(archived_ids, skipped_ids, deleted_row_count)``.
+        """
+
+        layout = self.item_layout()
+        items: Dict[int, Dict[int, Dict[int, int]]] = defaultdict(lambda: defaultdict(dict))
+        rows = self.db.execute(
+            select(UserResponse.session_id, UserResponse.item_id, UserResponse.choice_id, UserResponse.rank_value)
+            .where(UserResponse.session_id.in_(session_ids))
+        )
+        for session_id, item_id, choice_id, rank_value in rows:
+            items[session_id][item_id][choice_id] = rank_value
+        contexts: Dict[int, List[Tuple[str, Dict[str, int]]]] = defaultdict(list)
+        for score in self.db.scalars(select(LFIContextScore).where(LFIContextScore.session_id.in_(session_ids))):
+            contexts[score.session_id].append(
+                (
+                    score.context_name,
+                    {"CE": score.CE_rank, "RO": score.RO_rank, "AC": score.AC_rank, "AE": score.AE_rank},
+                )
+            )
+
+        archived_at = datetime.now(timezone.utc)
+        archived: List[int] = []
+        skipped: List[int] = []
+        for session_id in session_ids:
+            pack = self.get(session_id)
+            if pack is None:
+                try:
+                    item_ranks, context_ranks = self._fold(
+                        layout,
+                        EMPTY_ITEM_RANKS,
+                        EMPTY_CONTEXT_RANKS,
+                        items[session_id].items(),
+                        contexts[session_id],
+                    )
+                except ValueError:
+                    skipped.append(session_id)
+                    continue
+                pack = SessionResponsePack(session_id=session_id, item_ranks=item_ranks, context_ranks=context_ranks)
+                self._add(pack)
+            pack.archived_at = archived_at
+            archived.append(session_id)
+
+        deleted = 0
+        if archived:
+            self.db.flush()
+            for model in (UserResponse, LFIContextScore):
+                result = self.db.execute(delete(model).where(model.session_id.in_(archived)))
+                deleted += result.rowcount or 0
+        return archived, skipped, deleted
+
+    def save_packed(self, session_id: int, item_ranks: bytes, context_ranks: bytes) -> SessionResponsePack:
+        """Replace both slot blobs of the pack, e.g. from a compact submission."""
+
+        pack = self._get_or_create(session_id)
+        pack.item_ranks = item_ranks
+        pack.context_ranks = context_ranks
+        return pack
+
+    @staticmethod
+    def _item_slot(layout: ItemChoiceLayout, item_id: int, ranks_by_choice: Mapping[int, int]) -> Tuple[int, int]:
+        slot = layout.slot_by_item_id.get(int(item_id))
+        if slot is None:
+            raise ValueError(f"Unknown learning-style item: {item_id}")
+        try:
+            if any(layout.choice_modes[int(choice_id)][0] != int(item_id) for choice_id in ranks_by_choice):
+                raise KeyError(item_id)
+            mode_ranks = layout.mode_ranks(ranks_by_choice)
+        except KeyError:
+            raise ValueError(f"Choices do not belong to item {item_id}") from None
+        return slot, encode_ranks(mode_ranks)
+
+    @staticmethod
+    def _context_slot(context_name: str, ranks: Mapping[str, int]) -> Tuple[int, int]:
+        try:
+            slot = CONTEXT_ORDER.index(context_name)
+        except ValueError:
+            raise ValueError(f"Unknown LFI context: {context_name}") from None
+        return slot, encode_ranks(ranks)
+
+    def has_context(self, pack: SessionResponsePack, context_name: str) -> bool:
+        slot = CONTEXT_ORDER.index(context_name)
+        return unpack_slots(pack.context_ranks)[slot] is not None
+
+
 @dataclass
 class AssessmentItemRepository(Repository[Session]):
     """Repository providing access to assessment item metadata."""
 
     def get_learning_item_ids(self) -> List[int]:
-        rows = (
-            self.db.query(AssessmentItem.id)
-            .filter(AssessmentItem.item_type == ItemType.learning_style)
-            .all()
-        )
-        return [row[0] for row in rows]
+        catalog = get_item_catalog(self.db)
+        return [item.id for item in catalog.items if item.id in catalog.learning_item_ids]
 
 
 @dataclass
@@ -37,16 +292,17 @@ class UserResponseRepository(Repository[Session]):
     """Repository exposing aggregate computations on user responses."""
 
     def aggregate_ranks_by_item(self, session_id: int) -> List[ItemRankAggregate]:
-        rows = (
-            self.db.query(
-                UserResponse.item_id,
-                UserResponse.rank_value,
-                func.count().label("cnt"),
-            )
-            .filter(UserResponse.session_id == session_id)
-            .group_by(UserResponse.item_id, UserResponse.rank_value)
-            .all()
-        )
+        packs = ResponsePackRepository(self.db)
+        pack = packs.get(session_id)
+        if pack is not None:
+            # Packed slots are permutations by construction: four distinct ranks.
+            item_id_by_slot = packs.item_layout().item_id_by_slot
+            return [
+                ItemRankAggregate(item_id=item_id_by_slot[item_number - 1], rank_value=rank, count=1)
+                for item_number, _mode, rank in pack_item_mode_ranks(pack)
+                if item_number - 1 in item_id_by_slot
+            ]
+        rows = self.db.execute(_AGGREGATE_RANKS_BY_ITEM, {"session_id": session_id}).all()
         return [
             ItemRankAggregate(
                 item_id=row.item_id,
@@ -57,25 +313,28 @@ class UserResponseRepository(Repository[Session]):
         ]
 
     def find_duplicate_choices(self, session_id: int) -> List[int]:
-        rows = (
-            self.db.query(UserResponse.choice_id, func.count().label("c"))
-            .filter(UserResponse.session_id == session_id)
-            .group_by(UserResponse.choice_id)
-            .having(func.count() > 1)
-            .all()
-        )
+        if ResponsePackRepository(self.db).get(session_id) is not None:
+            return []
+        rows = self.db.execute(_FIND_DUPLICATE_CHOICES, {"session_id": session_id}).all()
         return [row.choice_id for row in rows]
 
     def list_with_choices(self, session_id: int) -> List[UserResponse]:
         """Return responses with choice and item relationships eager-loaded."""
-        return (
-            self.db.query(UserResponse)
-            .options(
-                joinedload(UserResponse.choice).joinedload(ItemChoice.item),
-            )
-            .filter(UserResponse.session_id == session_id)
-            .all()
-        )
+        return list(self.db.execute(_LIST_WITH_CHOICES, {"session_id": session_id}).unique().scalars())
+
+    def mode_ranks(self, session_id: int) -> List[Tuple[str, int]]:
+        """``(mode, rank)`` for every learning-style response, packed or row-level."""
+
+        pack = ResponsePackRepository(self.db).get(session_id)
+        if pack is not None:
+            return [(mode, rank) for _item_number, mode, rank in pack_item_mode_ranks(pack)]
+        return [
+            (choice.learning_mode.value, response.rank_value)
+            for response in self.list_with_choices(session_id)
+            if (choice := getattr(response, "choice", None))
+            and (item := getattr(choice, "item", None))
+            and item.item_type == ItemType.learning_style
+        ]
 
 
 @dataclass
@@ -83,8 +342,14 @@ class LFIContextRepository(Repository[Session]):
     """Repository for accessing LFI context scores."""
 
     def list_for_session(self, session_id: int) -> List[LFIContextScore]:
-        return (
-            self.db.query(LFIContextScore)
-            .filter(LFIContextScore.session_id == session_id)
-            .all()
-        )
+        pack = ResponsePackRepository(self.db).get(session_id)
+        if pack is not None:
+            return pack_context_scores(pack)
+        return list(self.db.execute(_LFI_CONTEXTS_FOR_SESSION, {"session_id": session_id}).scalars())
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_missing_response_packs(session: Session, *args: Any) -> None:
+    # Another transaction may have written the pack since the miss.
+    session.info.pop(_MISSING_PACKS_KEY, None)
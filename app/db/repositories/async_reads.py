@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.team import TeamAssessmentRollup
+from app.models.klsi.user import User
+
+
+@dataclass(slots=True, repr=True)
+class AsyncSessionReadRepository:
+    """Awaitable session lookups for async read endpoints."""
+
+    db: AsyncSession
+
+    async def get_by_id(self, session_id: int) -> Optional[AssessmentSession]:
+        return await self.db.get(AssessmentSession, session_id)
+
+    async def get_with_instrument(self, session_id: int) -> Optional[AssessmentSession]:
+        result = await self.db.execute(
+            select(AssessmentSession)
+            .options(joinedload(AssessmentSession.instrument))
+            .where(AssessmentSession.id == session_id)
+        )
+        return result.scalars().first()
+
+
+@dataclass(slots=True, repr=True)
+class AsyncUserReadRepository:
+    """Awaitable user lookup used by async authentication."""
+
+    db: AsyncSession
+
+    async def get(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+
+@dataclass(slots=True, repr=True)
+class AsyncTeamRollupReadRepository:
+    """Awaitable counterpart of ``TeamRollupRepository.list_by_team``."""
+
+    db: AsyncSession
+
+    async def list_by_team(self, team_id: int) -> List[TeamAssessmentRollup]:
+        result = await self.db.execute(
+            select(TeamAssessmentRollup)
+            .where(TeamAssessmentRollup.team_id == team_id)
+            .order_by(TeamAssessmentRollup.date.desc())
+        )
+        return list(result.scalars().all())
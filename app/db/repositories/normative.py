@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+from datetime import date, datetime, time
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import select, text
+from sqlalchemy import bindparam, insert, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.db.repositories.base import Repository
+from app.db.repositories.statements import prepared
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.learning import CombinationScore, LearningFlexibilityIndex, ScaleScore
 from app.models.klsi.norms import NormativeConversionTable
+from app.models.klsi.user import User
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,19 +25,53 @@ class NormativeConversionRow:
     percentile: float
 
 
+_NORM_COLUMNS = (
+    NormativeConversionTable.norm_group,
+    NormativeConversionTable.norm_version,
+    NormativeConversionTable.scale_name,
+    NormativeConversionTable.raw_score,
+    NormativeConversionTable.percentile,
+)
+
+# Expanding binds keep one cached statement for any number of versions and
+# (scale, raw) pairs; the row-value IN renders as ``IN (VALUES ...)`` on SQLite.
+_FETCH_BATCH = prepared(
+    "norms.fetch_batch",
+    select(*_NORM_COLUMNS).where(
+        NormativeConversionTable.norm_group == bindparam("norm_group"),
+        NormativeConversionTable.norm_version.in_(bindparam("versions", expanding=True)),
+        tuple_(NormativeConversionTable.scale_name, NormativeConversionTable.raw_score).in_(
+            bindparam("pairs", expanding=True)
+        ),
+    ),
+)
+_FETCH_ONE = prepared(
+    "norms.fetch_one",
+    select(*_NORM_COLUMNS)
+    .where(
+        NormativeConversionTable.norm_group == bindparam("norm_group"),
+        NormativeConversionTable.norm_version == bindparam("norm_version"),
+        NormativeConversionTable.scale_name == bindparam("scale_name"),
+        NormativeConversionTable.raw_score == bindparam("raw_score"),
+    )
+    .limit(1),
+)
+
+
+def _to_norm_row(row) -> NormativeConversionRow:
+    return NormativeConversionRow(
+        norm_group=str(row[0]),
+        norm_version=str(row[1]) if row[1] is not None else None,
+        scale_name=str(row[2]),
+        raw_score=int(row[3]),
+        percentile=float(row[4]),
+    )
+
+
 @dataclass(slots=True, repr=True)
 class NormativeConversionRepository(Repository[Session]):
     """Repository for normative conversion lookups."""
 
-    def __post_init__(self) -> None:
-        bind = None
-        try:
-            bind = self.db.get_bind()
-        except Exception:
-            bind = None
-        dialect_name = getattr(getattr(bind, "dialect", None), "name", "") if bind else ""
-        self._is_sqlite = dialect_name == "sqlite"
-
     def fetch_batch(
         self,
         norm_group: str,
@@ -43,54 +83,19 @@ class NormativeConversionRepository(Repository[Session]):
         if not normalized_versions:
             return []
 
-        normalized_pairs: Dict[str, List[int]] = {}
-        for scale, raws in scale_to_raws.items():
-            unique_values = sorted({int(value) for value in raws})
-            if unique_values:
-                normalized_pairs[scale] = unique_values
-        if not normalized_pairs:
-            return []
-
-        params: Dict[str, object] = {"g": norm_group}
-        version_clauses: List[str] = []
-        for idx, version in enumerate(normalized_versions):
-            params[f"v{idx}"] = version
-            version_clauses.append(f"norm_version=:v{idx}")
-
-        where_clauses: List[str] = []
-        for idx, (scale, raw_values) in enumerate(normalized_pairs.items()):
-            params[f"s{idx}"] = scale
-            if self._is_sqlite:
-                joined = ",".join(str(value) for value in raw_values)
-                where_clauses.append(
-                    f"(scale_name=:s{idx} AND raw_score IN ({joined}))"
-                )
-            else:
-                params[f"rs{idx}"] = tuple(raw_values)
-                where_clauses.append(
-                    f"(scale_name=:s{idx} AND raw_score = ANY(:rs{idx}))"
-                )
-
-        if not where_clauses:
+        pairs: List[Tuple[str, int]] = [
+            (scale, value)
+            for scale, raws in scale_to_raws.items()
+            for value in sorted({int(raw) for raw in raws})
+        ]
+        if not pairs:
             return []
 
-        sql = f"""
-            SELECT norm_group, norm_version, scale_name, raw_score, percentile
-            FROM normative_conversion_table
-            WHERE norm_group=:g AND ({' OR '.join(version_clauses)})
-              AND ({' OR '.join(where_clauses)})
-        """
-        rows = self.db.execute(text(sql), params).fetchall()
-        return [
-            NormativeConversionRow(
-                norm_group=str(row[0]),
-                norm_version=str(row[1]) if row[1] is not None else None,
-                scale_name=str(row[2]),
-                raw_score=int(row[3]),
-                percentile=float(row[4]),
-            )
-            for row in rows
-        ]
+        rows = self.db.execute(
+            _FETCH_BATCH,
+            {"norm_group": norm_group, "versions": normalized_versions, "pairs": pairs},
+        ).all()
+        return [_to_norm_row(row) for row in rows]
 
     def fetch_one(
         self,
@@ -100,24 +105,10 @@ class NormativeConversionRepository(Repository[Session]):
         raw: int,
     ) -> NormativeConversionRow | None:
         row = self.db.execute(
-            text(
-                "SELECT percentile, norm_version, scale_name, raw_score, norm_group "
-                "FROM normative_conversion_table "
-                "WHERE norm_group=:g AND norm_version=:v AND scale_name=:s AND raw_score=:r "
-                "LIMIT 1"
-            ),
-            {"g": norm_group, "v": version, "s": scale, "r": int(raw)},
-        ).fetchone()
-        if not row:
-            return None
-        percentile, stored_version, scale_name, raw_score, group_name = row
-        return NormativeConversionRow(
-            norm_group=str(group_name),
-            norm_version=str(stored_version) if stored_version is not None else None,
-            scale_name=str(scale_name),
-            raw_score=int(raw_score),
-            percentile=float(percentile),
-        )
+            _FETCH_ONE,
+            {"norm_group": norm_group, "norm_version": version, "scale_name": scale, "raw_score": int(raw)},
+        ).first()
+        return _to_norm_row(row) if row else None
 
     def fetch_first_for_versions(
         self,
@@ -171,6 +162,37 @@ class NormativeConversionRepository(Repository[Session]):
         self.db.add(entity)
         return entity, True
 
+    def version_exists(self, norm_group: str, norm_version: str) -> bool:
+        stmt = (
+            select(NormativeConversionTable.id)
+            .where(NormativeConversionTable.norm_group == norm_group)
+            .where(NormativeConversionTable.norm_version == norm_version)
+            .limit(1)
+        )
+        return self.db.execute(stmt).first() is not None
+
+    def bulk_insert(self, rows: Sequence[NormativeConversionRow], *, chunk_size: int = 1000) -> int:
+        """Insert rows with executemany batches; caller guarantees no conflicts."""
+
+        written = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            self.db.execute(
+                insert(NormativeConversionTable),
+                [
+                    {
+                        "norm_group": row.norm_group,
+                        "norm_version": row.norm_version,
+                        "scale_name": row.scale_name,
+                        "raw_score": row.raw_score,
+                        "percentile": row.percentile,
+                    }
+                    for row in chunk
+                ],
+            )
+            written += len(chunk)
+        return written
+
     def fetch_all_entries(self) -> List[NormativeConversionRow]:
         """Return all normative conversion entries as lightweight rows."""
         stmt = select(
@@ -229,3 +251,51 @@ class NormativeConversionRepository(Repository[Session]):
             )
             for row in rows
         ]
+
+
+@dataclass(slots=True, repr=True)
+class NormativeSampleRepository(Repository[Session]):
+    """Reads raw scale scores of completed sessions for empirical norm building."""
+
+    def fetch_scale_rows(
+        self,
+        *,
+        kelas: Optional[str] = None,
+        country: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Tuple]:
+        """``(CE, RO, AC, AE, ACCE, AERO, LFI_score, date_of_birth, end_time)`` per session.
+
+        ``LFI_score`` is ``None`` for sessions without a stored LFI.
+        """
+
+        stmt = (
+            select(
+                ScaleScore.CE_raw,
+                ScaleScore.RO_raw,
+                ScaleScore.AC_raw,
+                ScaleScore.AE_raw,
+                CombinationScore.ACCE_raw,
+                CombinationScore.AERO_raw,
+                LearningFlexibilityIndex.LFI_score,
+                User.date_of_birth,
+                AssessmentSession.end_time,
+            )
+            .select_from(AssessmentSession)
+            .join(User, User.id == AssessmentSession.user_id)
+            .join(ScaleScore, ScaleScore.session_id == AssessmentSession.id)
+            .join(CombinationScore, CombinationScore.session_id == AssessmentSession.id)
+            .outerjoin(LearningFlexibilityIndex, LearningFlexibilityIndex.session_id == AssessmentSession.id)
+            .where(AssessmentSession.status == SessionStatus.completed)
+            .where(AssessmentSession.end_time.is_not(None))
+        )
+        if kelas is not None:
+            stmt = stmt.where(User.kelas == kelas)
+        if country is not None:
+            stmt = stmt.where(User.country == country)
+        if date_from is not None:
+            stmt = stmt.where(AssessmentSession.end_time >= datetime.combine(date_from, time.min))
+        if date_to is not None:
+            stmt = stmt.where(AssessmentSession.end_time <= datetime.combine(date_to, time.max))
+        return [tuple(row) for row in self.db.execute(stmt)]
@@ -1,14 +1,73 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session, aliased
 
+from app.db.repositories.assessment import pack_item_mode_ranks
 from app.db.repositories.base import Repository
+from app.models.klsi.assessment import AssessmentSession, AssessmentSessionDelta
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import AssessmentItem, ItemChoice, SessionResponsePack, UserResponse
+from app.models.klsi.learning import (
+    CombinationScore,
+    LearningFlexibilityIndex,
+    LearningStyleType,
+    ScaleScore,
+    UserLearningStyle,
+)
 from app.models.klsi.research import ReliabilityResult, ResearchStudy, ValidityEvidence
 
 
+def study_session_filters(study: Optional[ResearchStudy]) -> list:
+    """Completed sessions whose end_time falls inside the study window.
+
+    Studies are not linked to sessions directly; an open bound (``None``
+    ``started_at``/``completed_at``) leaves that side of the window unbounded.
+    Passing ``None`` selects every completed session.
+    """
+
+    filters = [
+        AssessmentSession.status == SessionStatus.completed,
+        AssessmentSession.end_time.is_not(None),
+    ]
+    if study is None:
+        return filters
+    if study.started_at is not None:
+        filters.append(AssessmentSession.end_time >= study.started_at)
+    if study.completed_at is not None:
+        filters.append(AssessmentSession.end_time <= study.completed_at)
+    return filters
+
+
+# Row-level responses of sessions that also have a pack are compatibility
+# copies; the pack is authoritative.
+_NOT_PACKED = ~exists().where(SessionResponsePack.session_id == UserResponse.session_id)
+
+
+def iter_packed_item_ranks(
+    db: Session,
+    study: Optional[ResearchStudy],
+    *,
+    chunk_size: int = 5000,
+) -> Iterator[Tuple[int, int, str, int]]:
+    """``(session_id, item_number, mode, rank)`` decoded from response packs, ordered by session."""
+
+    stmt = (
+        select(SessionResponsePack)
+        .join(AssessmentSession, AssessmentSession.id == SessionResponsePack.session_id)
+        .where(*study_session_filters(study))
+        .order_by(SessionResponsePack.session_id.asc())
+        .execution_options(yield_per=chunk_size)
+    )
+    for pack in db.execute(stmt).scalars():
+        for item_number, mode, rank in pack_item_mode_ranks(pack):
+            yield pack.session_id, item_number, mode, rank
+
+
 @dataclass
 class ResearchStudyRepository(Repository[Session]):
     """Repository for research study CRUD operations."""
@@ -68,6 +127,88 @@ class ReliabilityRepository(Repository[Session]):
             .all()
         )
 
+    def replace_metrics(
+        self,
+        study_id: int,
+        results: Iterable[Tuple[str, float, Optional[str]]],
+    ) -> List[ReliabilityResult]:
+        """Overwrite computed metrics by name, leaving manually added rows intact."""
+
+        rows = [
+            ReliabilityResult(study_id=study_id, metric_name=name, value=value, notes=notes)
+            for name, value, notes in results
+        ]
+        if not rows:
+            return []
+        self.db.execute(
+            delete(ReliabilityResult)
+            .where(ReliabilityResult.study_id == study_id)
+            .where(ReliabilityResult.metric_name.in_([row.metric_name for row in rows]))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.add_all(rows)
+        self.db.flush()
+        return rows
+
+    def fetch_item_ranks(self, study: ResearchStudy) -> Sequence[Tuple[int, int, str, int]]:
+        """``(session_id, item_number, mode, rank)`` for every style-item response in the study."""
+
+        stmt = (
+            select(
+                UserResponse.session_id,
+                AssessmentItem.item_number,
+                ItemChoice.learning_mode,
+                UserResponse.rank_value,
+            )
+            .join(AssessmentSession, AssessmentSession.id == UserResponse.session_id)
+            .join(ItemChoice, ItemChoice.id == UserResponse.choice_id)
+            .join(AssessmentItem, AssessmentItem.id == UserResponse.item_id)
+            .where(AssessmentItem.item_type == ItemType.learning_style)
+            .where(*study_session_filters(study))
+            .where(_NOT_PACKED)
+        )
+        ranks = [
+            (session_id, item_number, mode.value, rank)
+            for session_id, item_number, mode, rank in self.db.execute(stmt)
+        ]
+        ranks.extend(iter_packed_item_ranks(self.db, study))
+        return ranks
+
+    def fetch_retest_pairs(self, study: ResearchStudy) -> Sequence[Tuple[int, ...]]:
+        """Scale scores of (previous, current) session pairs linked by a delta row.
+
+        Each tuple is ``CE, RO, AC, AE, ACCE, AERO`` of the earlier session
+        followed by the same six columns of the later one. The later session
+        must fall inside the study window.
+        """
+
+        prev_scale = aliased(ScaleScore)
+        prev_combo = aliased(CombinationScore)
+        stmt = (
+            select(
+                prev_scale.CE_raw,
+                prev_scale.RO_raw,
+                prev_scale.AC_raw,
+                prev_scale.AE_raw,
+                prev_combo.ACCE_raw,
+                prev_combo.AERO_raw,
+                ScaleScore.CE_raw,
+                ScaleScore.RO_raw,
+                ScaleScore.AC_raw,
+                ScaleScore.AE_raw,
+                CombinationScore.ACCE_raw,
+                CombinationScore.AERO_raw,
+            )
+            .select_from(AssessmentSessionDelta)
+            .join(AssessmentSession, AssessmentSession.id == AssessmentSessionDelta.session_id)
+            .join(ScaleScore, ScaleScore.session_id == AssessmentSessionDelta.session_id)
+            .join(CombinationScore, CombinationScore.session_id == AssessmentSessionDelta.session_id)
+            .join(prev_scale, prev_scale.session_id == AssessmentSessionDelta.previous_session_id)
+            .join(prev_combo, prev_combo.session_id == AssessmentSessionDelta.previous_session_id)
+            .where(*study_session_filters(study))
+        )
+        return [tuple(row) for row in self.db.execute(stmt)]
+
 
 @dataclass
 class ValidityRepository(Repository[Session]):
@@ -93,3 +234,104 @@ class ValidityRepository(Repository[Session]):
             .filter(ValidityEvidence.study_id == study_id)
             .all()
         )
+
+
+@dataclass
+class ResearchExportRepository(Repository[Session]):
+    """Streaming reads backing the bulk research export.
+
+    Both iterators are ordered by session id so callers can merge them in a
+    single pass; ``yield_per`` enables server-side cursors where the driver
+    supports them, keeping memory flat regardless of cohort size.
+    """
+
+    def style_item_numbers(self) -> List[int]:
+        stmt = (
+            select(AssessmentItem.item_number)
+            .where(AssessmentItem.item_type == ItemType.learning_style)
+            .order_by(AssessmentItem.item_number.asc())
+        )
+        return list(self.db.execute(stmt).scalars())
+
+    def count_sessions(self, study: Optional[ResearchStudy]) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(AssessmentSession)
+            .join(ScaleScore, ScaleScore.session_id == AssessmentSession.id)
+            .where(*study_session_filters(study))
+        )
+        return int(self.db.execute(stmt).scalar() or 0)
+
+    def iter_session_scores(
+        self,
+        study: Optional[ResearchStudy],
+        *,
+        chunk_size: int = 1000,
+    ) -> Iterator[Tuple]:
+        """``(session_id, end_time, CE, RO, AC, AE, ACCE, AERO, LFI, style)`` per session."""
+
+        stmt = (
+            select(
+                AssessmentSession.id,
+                AssessmentSession.end_time,
+                ScaleScore.CE_raw,
+                ScaleScore.RO_raw,
+                ScaleScore.AC_raw,
+                ScaleScore.AE_raw,
+                CombinationScore.ACCE_raw,
+                CombinationScore.AERO_raw,
+                LearningFlexibilityIndex.LFI_score,
+                LearningStyleType.style_name,
+            )
+            .join(ScaleScore, ScaleScore.session_id == AssessmentSession.id)
+            .outerjoin(CombinationScore, CombinationScore.session_id == AssessmentSession.id)
+            .outerjoin(
+                LearningFlexibilityIndex,
+                LearningFlexibilityIndex.session_id == AssessmentSession.id,
+            )
+            .outerjoin(UserLearningStyle, UserLearningStyle.session_id == AssessmentSession.id)
+            .outerjoin(
+                LearningStyleType,
+                LearningStyleType.id == UserLearningStyle.primary_style_type_id,
+            )
+            .where(*study_session_filters(study))
+            .order_by(AssessmentSession.id.asc())
+            .execution_options(yield_per=chunk_size)
+        )
+        for row in self.db.execute(stmt):
+            yield tuple(row)
+
+    def iter_item_ranks(
+        self,
+        study: Optional[ResearchStudy],
+        *,
+        chunk_size: int = 5000,
+    ) -> Iterator[Tuple[int, int, str, int]]:
+        """``(session_id, item_number, mode, rank)`` ordered by session and item."""
+
+        stmt = (
+            select(
+                UserResponse.session_id,
+                AssessmentItem.item_number,
+                ItemChoice.learning_mode,
+                UserResponse.rank_value,
+            )
+            .join(AssessmentSession, AssessmentSession.id == UserResponse.session_id)
+            .join(ItemChoice, ItemChoice.id == UserResponse.choice_id)
+            .join(AssessmentItem, AssessmentItem.id == UserResponse.item_id)
+            .where(AssessmentItem.item_type == ItemType.learning_style)
+            .where(*study_session_filters(study))
+            .where(_NOT_PACKED)
+            .order_by(UserResponse.session_id.asc(), AssessmentItem.item_number.asc())
+            .execution_options(yield_per=chunk_size)
+        )
+        row_ranks = (
+            (session_id, item_number, mode.value, rank)
+            for session_id, item_number, mode, rank in self.db.execute(stmt)
+        )
+        # Both streams are ordered by session, so merging keeps the contract.
+        yield from heapq.merge(
+            row_ranks,
+            iter_packed_item_ranks(self.db, study, chunk_size=chunk_size),
+            key=lambda entry: entry[0],
+        )
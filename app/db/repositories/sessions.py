@@ -2,10 +2,14 @@ from __future__ import annotations
 
 from typing import Optional
 
+from sqlalchemy import BindParameter, bindparam, select
 from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.db.repositories.assessment import pack_context_scores
 from app.db.repositories.base import Repository
+from app.db.repositories.statements import prepared
 from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.items import SessionResponsePack
 from app.models.klsi.learning import BackupLearningStyle, LFIContextScore, UserLearningStyle
 from app.models.klsi.enums import SessionStatus
 
@@ -13,77 +17,93 @@ from app.models.klsi.enums import SessionStatus
 from dataclasses import dataclass
 
 
+_session_id: BindParameter[int] = bindparam("session_id")
+
+_GET_BY_ID = prepared(
+    "sessions.get_by_id",
+    select(AssessmentSession).where(AssessmentSession.id == _session_id).limit(1),
+)
+_GET_FOR_USER = prepared(
+    "sessions.get_for_user",
+    select(AssessmentSession)
+    .where(AssessmentSession.id == _session_id, AssessmentSession.user_id == bindparam("user_id"))
+    .limit(1),
+)
+_IS_COMPLETED = prepared(
+    "sessions.is_completed",
+    select(AssessmentSession.id)
+    .where(AssessmentSession.id == _session_id, AssessmentSession.status == SessionStatus.completed)
+    .limit(1),
+)
+_GET_WITH_DETAILS = prepared(
+    "sessions.get_with_details",
+    select(AssessmentSession)
+    .options(
+        joinedload(AssessmentSession.scale_score),
+        joinedload(AssessmentSession.combination_score),
+        joinedload(AssessmentSession.learning_style).joinedload(UserLearningStyle.style_type),
+        joinedload(AssessmentSession.percentile_score),
+        joinedload(AssessmentSession.lfi_index),
+        selectinload(AssessmentSession.backup_styles).joinedload(BackupLearningStyle.style_type),
+        selectinload(AssessmentSession.lfi_context_scores),
+        joinedload(AssessmentSession.response_pack),
+        joinedload(AssessmentSession.user),
+    )
+    .where(AssessmentSession.id == _session_id)
+    .limit(1),
+)
+_GET_WITH_USER = prepared(
+    "sessions.get_with_user",
+    select(AssessmentSession)
+    .options(joinedload(AssessmentSession.user))
+    .where(AssessmentSession.id == _session_id)
+    .limit(1),
+)
+_GET_WITH_INSTRUMENT = prepared(
+    "sessions.get_with_instrument",
+    select(AssessmentSession)
+    .options(joinedload(AssessmentSession.instrument))
+    .where(AssessmentSession.id == _session_id)
+    .limit(1),
+)
+_LIST_LFI_CONTEXT_SCORES = prepared(
+    "sessions.list_lfi_context_scores",
+    select(LFIContextScore).where(LFIContextScore.session_id == _session_id),
+)
+
+
 @dataclass(slots=True, repr=True)
 class SessionRepository(Repository[Session]):
     """Repository for assessment session access patterns."""
 
     def get_by_id(self, session_id: int) -> Optional[AssessmentSession]:
-        return (
-            self.db.query(AssessmentSession)
-            .filter(AssessmentSession.id == session_id)
-            .first()
-        )
+        return self.db.execute(_GET_BY_ID, {"session_id": session_id}).scalars().first()
 
     def get_for_user(self, session_id: int, user_id: int) -> Optional[AssessmentSession]:
-        return (
-            self.db.query(AssessmentSession)
-            .filter(AssessmentSession.id == session_id)
-            .filter(AssessmentSession.user_id == user_id)
-            .first()
-        )
+        params = {"session_id": session_id, "user_id": user_id}
+        return self.db.execute(_GET_FOR_USER, params).scalars().first()
 
     def is_completed(self, session_id: int) -> bool:
-        return (
-            self.db.query(AssessmentSession)
-            .filter(AssessmentSession.id == session_id)
-            .filter(AssessmentSession.status == SessionStatus.completed)
-            .count()
-            > 0
-        )
+        return self.db.execute(_IS_COMPLETED, {"session_id": session_id}).first() is not None
 
     def get_with_details(self, session_id: int) -> Optional[AssessmentSession]:
         """Fetch session with all report-critical relationships eagerly loaded."""
-        return (
-            self.db.query(AssessmentSession)
-            .options(
-                joinedload(AssessmentSession.scale_score),
-                joinedload(AssessmentSession.combination_score),
-                joinedload(AssessmentSession.learning_style).joinedload(UserLearningStyle.style_type),
-                joinedload(AssessmentSession.percentile_score),
-                joinedload(AssessmentSession.lfi_index),
-                selectinload(AssessmentSession.backup_styles).joinedload(BackupLearningStyle.style_type),
-                selectinload(AssessmentSession.lfi_context_scores),
-                joinedload(AssessmentSession.user),
-            )
-            .filter(AssessmentSession.id == session_id)
-            .first()
-        )
+        return self.db.execute(_GET_WITH_DETAILS, {"session_id": session_id}).unique().scalars().first()
 
     def get_with_user(self, session_id: int) -> Optional[AssessmentSession]:
         """Fetch session with associated user eager-loaded."""
-        return (
-            self.db.query(AssessmentSession)
-            .options(joinedload(AssessmentSession.user))
-            .filter(AssessmentSession.id == session_id)
-            .first()
-        )
+        return self.db.execute(_GET_WITH_USER, {"session_id": session_id}).unique().scalars().first()
 
     def get_with_instrument(self, session_id: int) -> Optional[AssessmentSession]:
         """Fetch a session with instrument relationship eagerly loaded."""
-        return (
-            self.db.query(AssessmentSession)
-            .options(joinedload(AssessmentSession.instrument))
-            .filter(AssessmentSession.id == session_id)
-            .first()
-        )
+        return self.db.execute(_GET_WITH_INSTRUMENT, {"session_id": session_id}).unique().scalars().first()
 
     def list_lfi_context_scores(self, session_id: int) -> list[LFIContextScore]:
-        """Return all LFI context score rows for a session."""
-        return (
-            self.db.query(LFIContextScore)
-            .filter(LFIContextScore.session_id == session_id)
-            .all()
-        )
+        """Return all LFI context scores for a session, decoded from its pack if it has one."""
+        pack = self.db.get(SessionResponsePack, session_id)
+        if pack is not None:
+            return pack_context_scores(pack)
+        return list(self.db.execute(_LIST_LFI_CONTEXT_SCORES, {"session_id": session_id}).scalars())
 
     def get_previous_completed_session(
         self,
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Dict, TypeVar
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.sql.base import Executable
+
+from app.core.metrics import get_counters, inc_counter
+
+# Execution option carrying a statement's name through to the engine events.
+STATEMENT_OPTION = "klsi_statement"
+_COUNTER_PREFIX = "db.statement."
+
+TExecutable = TypeVar("TExecutable", bound=Executable)
+
+
+def prepared(name: str, stmt: TExecutable) -> TExecutable:
+    """Tag a module-level statement so its compile/cache-hit counts are tracked.
+
+    Hot repository queries are built once at import with ``bindparam`` values.
+    SQLAlchemy memoizes the cache key of a reused statement object, so each call
+    only looks up the compiled form. ``name`` labels the counters.
+    """
+
+    return stmt.execution_options(**{STATEMENT_OPTION: name})
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement_cache(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    name = context.execution_options.get(STATEMENT_OPTION)
+    if name is None:
+        return
+    if context.cache_hit == CACHE_HIT:
+        inc_counter(f"{_COUNTER_PREFIX}{name}.cache_hit")
+    elif context.cache_hit == CACHE_MISS:
+        inc_counter(f"{_COUNTER_PREFIX}{name}.compiled")
+    else:
+        inc_counter(f"{_COUNTER_PREFIX}{name}.uncached")
+
+
+def get_statement_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Compile/cache-hit counts per prepared statement name."""
+
+    stats: Dict[str, Dict[str, int]] = {}
+    for key, value in get_counters().items():
+        if not key.startswith(_COUNTER_PREFIX):
+            continue
+        name, _, outcome = key[len(_COUNTER_PREFIX) :].rpartition(".")
+        entry = stats.setdefault(name, {"compiled": 0, "cache_hit": 0, "uncached": 0})
+        entry[outcome] = int(value)
+    return stats
+
+
+__all__ = ["STATEMENT_OPTION", "prepared", "get_statement_cache_stats"]
@@ -3,11 +3,28 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.db.repositories.base import Repository
+from app.db.repositories.statements import prepared
 from app.models.klsi.learning import BackupLearningStyle, LearningStyleType
 
+_LIST_STYLE_TYPES = prepared("styles.list_learning_style_types", select(LearningStyleType))
+_STYLE_BY_NAME = prepared(
+    "styles.get_by_name",
+    select(LearningStyleType).where(LearningStyleType.style_name == bindparam("style_name")).limit(1),
+)
+_BACKUP_STYLE = prepared(
+    "styles.backup_style",
+    select(BackupLearningStyle)
+    .where(
+        BackupLearningStyle.session_id == bindparam("session_id"),
+        BackupLearningStyle.style_type_id == bindparam("style_type_id"),
+    )
+    .limit(1),
+)
+
 
 @dataclass(slots=True, repr=True)
 class StyleRepository(Repository[Session]):
@@ -15,15 +32,11 @@ class StyleRepository(Repository[Session]):
 
     def list_learning_style_types(self) -> List[LearningStyleType]:
         """Return all learning style type rows."""
-        return self.db.query(LearningStyleType).all()
+        return list(self.db.execute(_LIST_STYLE_TYPES).scalars())
 
     def get_by_name(self, style_name: str) -> Optional[LearningStyleType]:
         """Fetch a learning style type by its canonical name."""
-        return (
-            self.db.query(LearningStyleType)
-            .filter(LearningStyleType.style_name == style_name)
-            .first()
-        )
+        return self.db.execute(_STYLE_BY_NAME, {"style_name": style_name}).scalars().first()
 
     def upsert_backup_style(
         self,
@@ -34,14 +47,10 @@ class StyleRepository(Repository[Session]):
         contexts: Optional[List[str]] = None,
     ) -> BackupLearningStyle:
         """Create or update a backup learning style row for a session."""
-        existing = (
-            self.db.query(BackupLearningStyle)
-            .filter(
-                BackupLearningStyle.session_id == session_id,
-                BackupLearningStyle.style_type_id == style_type_id,
-            )
-            .first()
-        )
+        existing = self.db.execute(
+            _BACKUP_STYLE,
+            {"session_id": session_id, "style_type_id": style_type_id},
+        ).scalars().first()
         payload = {"contexts": contexts} if contexts is not None else None
         if existing:
             existing.frequency_count = frequency_count
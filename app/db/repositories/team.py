@@ -2,22 +2,30 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, insert, or_, select
 from sqlalchemy.orm import Session
 
 from app.db.repositories.base import Repository
 from app.models.klsi.assessment import AssessmentSession
 from app.models.klsi.enums import SessionStatus
 from app.models.klsi.learning import (
+    CombinationScore,
     LearningFlexibilityIndex,
     LearningStyleType,
+    ScaleScore,
     UserLearningStyle,
 )
 from app.models.klsi.team import Team, TeamAssessmentRollup, TeamMember
 
 
+def _session_date_expr():
+    return func.date(
+        func.coalesce(AssessmentSession.end_time, AssessmentSession.start_time)
+    )
+
+
 @dataclass(slots=True)
 class TeamSessionRow:
     session_id: int
@@ -63,6 +71,11 @@ class TeamRepository(Repository[Session]):
             .all()
         )
 
+    def ids_by_name(self, names: Sequence[str]) -> Dict[str, int]:
+        if not names:
+            return {}
+        return {name: team_id for team_id, name in self.db.execute(select(Team.id, Team.name).where(Team.name.in_(names)))}
+
     def delete(self, team: Team) -> None:
         self.db.delete(team)
 
@@ -103,6 +116,13 @@ class TeamMemberRepository(Repository[Session]):
     def delete(self, member: TeamMember) -> None:
         self.db.delete(member)
 
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Multi-row ``INSERT`` of ``team_id``/``user_id``/``role_in_team`` dicts."""
+        if not rows:
+            return 0
+        self.db.execute(insert(TeamMember), list(rows))
+        return len(rows)
+
     def count_by_team(self, team_id: int) -> int:
         return (
             self.db.query(TeamMember)
@@ -169,20 +189,14 @@ class TeamRollupRepository(Repository[Session]):
 class TeamAnalyticsRepository(Repository[Session]):
     """Repository exposing analytics-oriented queries for teams."""
 
-    def fetch_completed_sessions(
-        self,
-        team_id: int,
-        for_date: Optional[date] = None,
-    ) -> List[TeamSessionRow]:
+    def _completed_session_filters(self, team_id: int, for_date: Optional[date]) -> list:
         member_user_ids_subq = (
             self.db.query(TeamMember.user_id)
             .filter(TeamMember.team_id == team_id)
             .subquery()
         )
 
-        session_date_expr = func.date(
-            func.coalesce(AssessmentSession.end_time, AssessmentSession.start_time)
-        )
+        session_date_expr = _session_date_expr()
         filters = [
             AssessmentSession.user_id.in_(select(member_user_ids_subq.c.user_id)),
             AssessmentSession.status == SessionStatus.completed,
@@ -210,7 +224,15 @@ class TeamAnalyticsRepository(Repository[Session]):
                 filters.append(
                     or_(session_date_expr == for_date, session_date_expr == adjusted)
                 )
+        return filters
 
+    def fetch_completed_sessions(
+        self,
+        team_id: int,
+        for_date: Optional[date] = None,
+    ) -> List[TeamSessionRow]:
+        filters = self._completed_session_filters(team_id, for_date)
+        session_date_expr = _session_date_expr()
         query = (
             self.db.query(
                 AssessmentSession.id.label("session_id"),
@@ -246,3 +268,41 @@ class TeamAnalyticsRepository(Repository[Session]):
             )
             for row in rows
         ]
+
+    def iter_score_columns(
+        self,
+        team_id: int,
+        for_date: Optional[date] = None,
+        *,
+        chunk_size: int = 2000,
+    ) -> Iterator[Sequence[tuple]]:
+        """Yield ``(CE, RO, AC, AE, ACCE, AERO, LFI)`` tuples in chunks.
+
+        A single Core ``select`` over completed member sessions; rows are
+        fetched in partitions so callers can feed them straight into arrays
+        without materialising ORM objects. ``LFI`` is ``None`` when missing.
+        """
+
+        stmt = (
+            select(
+                ScaleScore.CE_raw,
+                ScaleScore.RO_raw,
+                ScaleScore.AC_raw,
+                ScaleScore.AE_raw,
+                CombinationScore.ACCE_raw,
+                CombinationScore.AERO_raw,
+                LearningFlexibilityIndex.LFI_score,
+            )
+            .select_from(AssessmentSession)
+            .join(ScaleScore, ScaleScore.session_id == AssessmentSession.id)
+            .join(CombinationScore, CombinationScore.session_id == AssessmentSession.id)
+            .outerjoin(
+                LearningFlexibilityIndex,
+                LearningFlexibilityIndex.session_id == AssessmentSession.id,
+            )
+            .where(and_(*self._completed_session_filters(team_id, for_date)))
+            .execution_options(yield_per=chunk_size)
+        )
+        result = self.db.execute(stmt)
+        for partition in result.tuples().partitions():
+            yield partition
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Sequence, Set
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.models.klsi.enums import EducationLevel, Gender
@@ -53,3 +54,21 @@ class UserRepository:
         )
         self.db.add(user)
         return user
+
+    def existing_emails(self, emails: Sequence[str]) -> Set[str]:
+        if not emails:
+            return set()
+        return set(self.db.scalars(select(User.email).where(User.email.in_(emails))))
+
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> Dict[str, int]:
+        """Multi-row ``INSERT`` of user column dicts; returns ``{email: id}``.
+
+        Bypasses the unit of work, so column defaults apply but ORM events do not.
+        """
+        if not rows:
+            return {}
+        result = self.db.execute(
+            insert(User).returning(User.id, User.email, sort_by_parameter_order=True),
+            list(rows),
+        )
+        return {email: user_id for user_id, email in result}
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from collections import deque
+from threading import Condition, get_ident
+from time import monotonic, perf_counter, sleep
+from typing import Any, Dict, cast
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter, observe_histogram
+
+logger = get_logger("kolb.db.sqlite_profile", component="db")
+
+WRITE_QUEUE_WAIT_BUCKETS: tuple[float, ...] = (1.0, 5.0, 25.0, 100.0, 500.0, 1000.0, 5000.0)
+WRITE_HOLD_BUCKETS: tuple[float, ...] = (5.0, 25.0, 100.0, 250.0, 1000.0, 5000.0)
+
+_SLOT_KEY = "sqlite_write_slot"
+
+
+def sqlite_production_pragmas() -> Dict[str, object]:
+    """Connect-time pragmas for a file-backed SQLite database under concurrent load."""
+
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -settings.sqlite_cache_size_kib,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+
+
+def install_sqlite_pragmas(engine_instance: Engine) -> None:
+    """Apply ``sqlite_production_pragmas()`` to every new DBAPI connection."""
+
+    pragmas = sqlite_production_pragmas()
+
+    @event.listens_for(engine_instance, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    message = str(getattr(exc, "orig", exc)).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+class SQLiteWriteQueue:
+    """FIFO queue admitting one write transaction at a time.
+
+    SQLite allows a single writer; without coordination concurrent finalizes
+    race for the lock and the loser fails with ``database is locked``. A
+    session takes a slot before its first flush or DML statement and gives it
+    back when its outermost transaction ends, so writers wait here in arrival
+    order instead of spinning inside SQLite. The slot is not tied to a thread:
+    FastAPI may close a request session on a different worker thread.
+    """
+
+    def __init__(self, *, timeout_sec: float) -> None:
+        self.timeout_sec = float(timeout_sec)
+        self._condition = Condition()
+        self._waiters: deque[object] = deque()
+        self._owner: object | None = None
+        self._owner_thread: int | None = None
+        self._acquired_at = 0.0
+
+    def acquire(self) -> object | None:
+        """Wait for the slot; return its ticket, or ``None`` when not taken.
+
+        The slot is skipped (``None``) when this thread already holds it
+        through another session, since waiting would deadlock, and when the
+        wait exceeds ``timeout_sec``; SQLite's ``busy_timeout`` then applies.
+        """
+
+        ticket = object()
+        started = perf_counter()
+        with self._condition:
+            if self._owner is not None and self._owner_thread == get_ident():
+                inc_counter("db.sqlite.write_queue.nested")
+                return None
+            self._waiters.append(ticket)
+            deadline = monotonic() + self.timeout_sec
+            while self._owner is not None or self._waiters[0] is not ticket:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(ticket)
+                    self._condition.notify_all()
+                    inc_counter("db.sqlite.write_queue.timeouts")
+                    logger.warning(
+                        "sqlite_write_queue_timeout",
+                        extra={"structured_data": {"waited_sec": self.timeout_sec, "depth": len(self._waiters)}},
+                    )
+                    return None
+                self._condition.wait(remaining)
+            self._waiters.popleft()
+            self._owner = ticket
+            self._owner_thread = get_ident()
+            self._acquired_at = perf_counter()
+        waited_ms = (perf_counter() - started) * 1000.0
+        inc_counter("db.sqlite.write_queue.acquired")
+        observe_histogram("db.sqlite.write_queue.wait_ms", waited_ms, buckets=WRITE_QUEUE_WAIT_BUCKETS)
+        return ticket
+
+    def release(self, ticket: object) -> None:
+        with self._condition:
+            if self._owner is not ticket:
+                return
+            held_ms = (perf_counter() - self._acquired_at) * 1000.0
+            self._owner = None
+            self._owner_thread = None
+            self._condition.notify_all()
+        observe_histogram("db.sqlite.write_queue.hold_ms", held_ms, buckets=WRITE_HOLD_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "busy": self._owner is not None,
+                "waiting": len(self._waiters),
+                "timeout_sec": self.timeout_sec,
+            }
+
+
+def _begin_immediate(session: Session) -> None:
+    """Take SQLite's write lock up front, retrying with backoff while busy.
+
+    Nothing has been written in the transaction yet, so a retry is safe. Other
+    processes (workers, scripts) can still hold the lock past ``busy_timeout``.
+    """
+
+    connection = session.connection()
+    if connection.dialect.name != "sqlite" or connection.connection.dbapi_connection is None:
+        return
+    dbapi_connection = cast(sqlite3.Connection, connection.connection.dbapi_connection)
+    if dbapi_connection.in_transaction:
+        return
+    attempts = settings.sqlite_write_retry_attempts
+    delay_ms = float(settings.sqlite_write_retry_base_ms)
+    for attempt in range(1, attempts + 1):
+        try:
+            dbapi_connection.execute("BEGIN IMMEDIATE")
+            if attempt > 1:
+                inc_counter("db.sqlite.write.retry_success")
+            return
+        except Exception as exc:  # sqlite3.OperationalError; driver-level, not wrapped
+            if not is_busy_error(exc):
+                raise
+            inc_counter("db.sqlite.write.busy")
+            if attempt == attempts:
+                inc_counter("db.sqlite.write.retry_exhausted")
+                logger.error("sqlite_write_busy", extra={"structured_data": {"attempts": attempts}})
+                raise OperationalError("BEGIN IMMEDIATE", None, exc) from exc
+            backoff_ms = delay_ms * random.uniform(0.5, 1.5)
+            inc_counter("db.sqlite.write.retries")
+            observe_histogram("db.sqlite.write.backoff_ms", backoff_ms, buckets=WRITE_QUEUE_WAIT_BUCKETS)
+            sleep(backoff_ms / 1000.0)
+            delay_ms *= 2
+
+
+def install_write_serialization(factory: sessionmaker[Session], queue: SQLiteWriteQueue) -> None:
+    """Route write transactions of sessions from ``factory`` through ``queue``."""
+
+    def _enter_write(session: Session) -> None:
+        if _SLOT_KEY in session.info:
+            return
+        session.info[_SLOT_KEY] = queue.acquire()
+        _begin_immediate(session)
+
+    @event.listens_for(factory, "before_flush")
+    def _before_flush(session, flush_context, instances):
+        if session.new or session.dirty or session.deleted:
+            _enter_write(session)
+
+    @event.listens_for(factory, "do_orm_execute")
+    def _before_dml(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            _enter_write(orm_execute_state.session)
+
+    @event.listens_for(factory, "after_transaction_end")
+    def _release_slot(session, transaction):
+        if transaction.parent is not None or _SLOT_KEY not in session.info:
+            return
+        ticket = session.info.pop(_SLOT_KEY)
+        if ticket is not None:
+            queue.release(ticket)
+
+
+__all__ = [
+    "SQLiteWriteQueue",
+    "install_sqlite_pragmas",
+    "install_write_serialization",
+    "is_busy_error",
+    "sqlite_production_pragmas",
+]
@@ -11,10 +11,11 @@ from app.engine.interfaces import ScoringContext
 from app.engine.pipelines import assign_pipeline_version, resolve_klsi_pipeline_from_nodes
 from app.engine.registry import get as get_definition
 from app.engine.strategy_registry import ensure_default_strategies_loaded, get_strategy
+from app.db.query_accounting import query_scope
 from app.db.repositories import SessionRepository, StyleRepository, PipelineRepository
 from app.models.klsi.audit import AuditLog
 from app.services.regression import analyze_lfi_contexts
-from app.services.validation import check_session_complete
+from app.services.validation import reusable_validation, take_validation_snapshot
 from app.engine.validation import ValidationResult
 from app.i18n.id_messages import EngineMessages, RegressionMessages, SessionErrorMessages
 
@@ -93,18 +94,24 @@ def finalize_assessment(
 
         validation_result = ValidationResult()
         if not skip_checks:
+            # Reuse the snapshot the runtime took for this finalize; standalone
+            # callers take one here.
+            snapshot = reusable_validation(db, session_id) or take_validation_snapshot(
+                db, session_id, definition=assessment
+            )
             # Run validation rules declared by the assessment definition.
-            issues = []
-            for rule in assessment.validation_rules():
-                issues.extend(rule.validate(db, session_id))
+            issues = snapshot.rule_issues_for(assessment)
+            if issues is None:
+                issues = []
+                for rule in assessment.validation_rules():
+                    issues.extend(rule.validate(db, session_id))
             if issues:
                 fatal = [i for i in issues if i.fatal]
                 if strategy:
                     return {"ok": False, "issues": [i.as_dict() for i in issues]}
 
             # Always ensure ipsative core validation runs (engine-agnostic guard).
-            completeness = check_session_complete(db, session_id)
-            validation_result.structural["item_completeness"] = completeness
+            validation_result.structural["item_completeness"] = snapshot.completeness
         ctx = ScoringContext()
         artifact_snapshots: dict[str, dict] = {}
 
@@ -157,7 +164,8 @@ def finalize_assessment(
                     merged["pipeline_warning"] = EngineMessages.PIPELINE_UNSUPPORTED_NODE_KEY
                     merged["pipeline_error"] = str(exc)
                     validation_result.provenance = merged
-            payload = strategy.finalize(db, session_id)
+            with query_scope(f"strategy_finalize.{session.strategy_code}"):
+                payload = strategy.finalize(db, session_id)
             scale = payload["scale"]
             combo = payload["combo"]
             style = payload["style"]
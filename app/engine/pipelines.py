@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.models.klsi.instrument import ScoringPipeline
 from app.models.klsi.learning import CombinationScore, ScaleScore
+from app.db.query_accounting import query_scope
 from app.engine.exceptions import ControlledAbort
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -303,7 +304,8 @@ class PipelineDefinition:
         for stage in self.stages:
             stage_name = getattr(stage, "__name__", str(stage))
             try:
-                stage_result = stage(db, session_id)
+                with query_scope(stage_name):
+                    stage_result = stage(db, session_id)
                 if isinstance(stage_result, dict):
                     _merge_stage_payload(results, stage_result)
                 results["stages_completed"].append(stage_name)
@@ -344,7 +346,8 @@ class PipelineDefinition:
         for stage in self.stages:
             stage_name = getattr(stage, "__name__", str(stage))
             try:
-                stage_result = stage(db, session_id)
+                with query_scope(stage_name):
+                    stage_result = stage(db, session_id)
                 yield (stage_name, stage_result)
             except ControlledAbort as abort:
                 yield (
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import lru_cache
 from hashlib import sha256
+from threading import Lock
 from time import perf_counter
 from typing import Any, Callable
 from uuid import uuid4
@@ -21,12 +23,14 @@ from app.core.errors import (
     ValidationError,
 )
 from app.core.logging import correlation_context, get_logger
-from app.core.metrics import count_calls, measure_time, timeit
-from app.db.database import get_repository_provider
+from app.core.metrics import count_calls, inc_counter, measure_time, timeit
+from app.db.database import get_repository_provider, mark_recent_write
+from app.db.item_catalog import get_item_catalog
 from app.engine.authoring import get_instrument_locale_resource, get_instrument_spec
-from app.engine.interfaces import InstrumentId
+from app.engine.interfaces import AssessmentDefinition, InstrumentId
 from app.engine.pipelines import assign_pipeline_version
-from app.engine.registry import engine_registry
+from app.engine.registry import RegistryError, engine_registry
+from app.engine.registry import get as get_definition
 from app.engine.runtime_components import (
     RuntimeErrorReporter,
     RuntimeScheduler,
@@ -42,8 +46,8 @@ from app.i18n.id_messages import EngineMessages
 from app.models.klsi.assessment import AssessmentSession
 from app.models.klsi.audit import AuditLog
 from app.models.klsi.enums import SessionStatus
-from app.models.klsi.user import User
-from app.services.validation import run_session_validations
+from app.services.principals import Principal
+from app.services.validation import ValidationSnapshot, take_validation_snapshot, validation_scope
 
 logger = get_logger("kolb.engine.runtime", component="engine")
 
@@ -61,6 +65,15 @@ class FinalizeContext:
     skip_validation: bool
     tracker: RuntimeStateTracker | None
     correlation_id: str
+    validation: ValidationSnapshot | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedDelivery:
+    """Encoded delivery payload and its strong ``ETag`` value (quoted)."""
+
+    body: bytes
+    etag: str
 
 
 @dataclass(slots=True)
@@ -219,7 +232,16 @@ class EngineRuntime:
         *,
         failure_event: str,
     ) -> ValidationReport:
-        validation = ValidationReport.from_mapping(run_session_validations(context.db, session.id))
+        snapshot = context.validation
+        if snapshot is not None and snapshot.session_id == session.id and not snapshot.is_current(context.db):
+            inc_counter("validation.snapshot.stale")
+            snapshot = None
+        if snapshot is None or snapshot.session_id != session.id:
+            snapshot = take_validation_snapshot(context.db, session.id, definition=self._definition(session))
+            context.validation = snapshot
+        else:
+            inc_counter("validation.snapshot.reused")
+        validation = ValidationReport.from_mapping(snapshot.as_report())
         if not validation.ready and not context.skip_validation:
             logger.warning(
                 failure_event,
@@ -275,18 +297,21 @@ class EngineRuntime:
             )
 
         try:
-            if transactional:
-                with context.db.begin():
+            # Scorers re-check completeness inside finalize; let them reuse the
+            # snapshot validated above instead of querying the session again.
+            with validation_scope(context.validation):
+                if transactional:
+                    with context.db.begin():
+                        result = scorer.finalize(context.db, session.id, skip_checks=context.skip_validation)
+                        _ensure_ok(result)
+                        session.status = SessionStatus.completed
+                        session.end_time = datetime.now(timezone.utc)
+                else:
                     result = scorer.finalize(context.db, session.id, skip_checks=context.skip_validation)
                     _ensure_ok(result)
                     session.status = SessionStatus.completed
                     session.end_time = datetime.now(timezone.utc)
-            else:
-                result = scorer.finalize(context.db, session.id, skip_checks=context.skip_validation)
-                _ensure_ok(result)
-                session.status = SessionStatus.completed
-                session.end_time = datetime.now(timezone.utc)
-                context.db.commit()
+                    context.db.commit()
         except DomainError:
             if not transactional:
                 context.db.rollback()
@@ -332,6 +357,9 @@ class EngineRuntime:
         }
         if extra:
             structured.update(extra)
+        # Finalize has committed by now; keep this user's reads on the primary
+        # until replicas catch up with the freshly written results.
+        mark_recent_write(artifacts.session.user_id)
         logger.info(log_event, extra={"structured_data": structured})
         return payload_dict
 
@@ -450,6 +478,14 @@ class EngineRuntime:
             # Non-fatal: keep result success even if audit write fails
 
 
+    def _definition(self, session: AssessmentSession) -> AssessmentDefinition | None:
+        # Same fallback as scoring.finalize_session, so the rules evaluated here
+        # are the ones finalize_assessment would run.
+        try:
+            return get_definition(session.assessment_id or "KLSI", session.assessment_version or "4.0")
+        except RegistryError:
+            return None
+
     def _instrument_id(self, session: AssessmentSession) -> InstrumentId:
         if session.instrument:
             return InstrumentId(session.instrument.code, session.instrument.version)
@@ -458,7 +494,7 @@ class EngineRuntime:
     def start_session(
         self,
         db: Session,
-        user: User,
+        user: Principal,
         instrument_code: str,
         instrument_version: str | None = None,
     ) -> AssessmentSession:
@@ -555,8 +591,41 @@ class EngineRuntime:
             return session
 
     def delivery_package(self, db: Session, session_id: int, *, locale: str | None = None) -> dict:
+        session = self._resolve_session(db, session_id)
+        return self._compose_delivery(db, session_id, self._instrument_id(session), locale)
+
+    def serialized_delivery(
+        self, db: Session, session_id: int, *, locale: str | None = None
+    ) -> SerializedDelivery:
+        """Delivery payload as JSON bytes, encoded once per instrument, locale and item bank.
+
+        Entries are keyed by the item catalog's ``content_hash``, so an item
+        bank edit re-encodes on the next request. Unknown locales render the
+        same payload as no locale and share its entry.
+        """
+
         session = self._resolve_session(db, session_id)
         inst_id = self._instrument_id(session)
+        if locale and _cached_locale(inst_id.key, inst_id.version, locale) is None:
+            locale = None
+        key = (inst_id.key, inst_id.version, locale)
+        bank_hash = get_item_catalog(db).content_hash
+        with _delivery_cache_lock:
+            cached = _delivery_cache.get(key)
+        if cached is not None and cached[0] == bank_hash:
+            inc_counter("engine.delivery.payload_hit")
+            return cached[1]
+        payload = self._compose_delivery(db, session_id, inst_id, locale)
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        serialized = SerializedDelivery(body=body, etag=f'"{sha256(body).hexdigest()[:32]}"')
+        with _delivery_cache_lock:
+            _delivery_cache[key] = (bank_hash, serialized)
+        inc_counter("engine.delivery.payload_build")
+        return serialized
+
+    def _compose_delivery(
+        self, db: Session, session_id: int, inst_id: InstrumentId, locale: str | None
+    ) -> dict:
         plugin = self._registry.plugin(inst_id)
         items = plugin.fetch_items(db, session_id)
         delivery = plugin.delivery()
@@ -587,6 +656,7 @@ class EngineRuntime:
         session_id: int,
         *,
         skip_validation: bool = False,
+        validation: ValidationSnapshot | None = None,
     ) -> dict:
         correlation_id = str(uuid4())
         with correlation_context(correlation_id):
@@ -597,6 +667,7 @@ class EngineRuntime:
                 skip_validation=skip_validation,
                 tracker=tracker,
                 correlation_id=correlation_id,
+                validation=validation,
             )
             artifacts = self._execute_finalize_pipeline(
                 context,
@@ -622,11 +693,14 @@ class EngineRuntime:
         action: str,
         build_payload: Callable[[dict], bytes],
         skip_validation: bool = False,
+        validation: ValidationSnapshot | None = None,
     ) -> dict:
         """Finalize session artifacts and write an AuditLog entry atomically.
 
         build_payload: callable that receives the result dict (post-finalize) and
         returns bytes to be hashed for payload_hash.
+        validation: snapshot the caller already took for this request; it is
+        reused instead of validating the session again.
         """
         correlation_id = str(uuid4())
         with correlation_context(correlation_id):
@@ -637,6 +711,7 @@ class EngineRuntime:
                 skip_validation=skip_validation,
                 tracker=tracker,
                 correlation_id=correlation_id,
+                validation=validation,
             )
             artifacts = self._execute_finalize_pipeline(
                 context,
@@ -689,6 +764,10 @@ runtime = EngineRuntime()
 
 
 # Caching helpers (module-level to persist across runtime calls)
+_delivery_cache: dict[tuple[str, str, str | None], tuple[str, SerializedDelivery]] = {}
+_delivery_cache_lock = Lock()
+
+
 @lru_cache(maxsize=128)
 def _cached_manifest(
     instrument_code: str, instrument_version: str
@@ -18,6 +18,7 @@ class DomainErrorMessages:
     NOT_FOUND: str = "Resource tidak ditemukan"
     CONFLICT: str = "Terjadi konflik state"
     CONFIGURATION_ERROR: str = "Konfigurasi sistem tidak valid"
+    SERVICE_UNAVAILABLE: str = "Layanan sedang sibuk, coba lagi nanti"
 
 
 class SessionErrorMessages:
@@ -89,6 +90,15 @@ class AuthMessages:
     INVALID_CREDENTIALS: str = "Kredensial salah"
 
 
+class ProvisioningMessages:
+    """Bulk user provisioning row messages."""
+
+    INVALID_JSON: str = "Baris NDJSON tidak valid: {detail}"
+    DUPLICATE_EMAIL: str = "Email muncul lebih dari sekali dalam unggahan"
+    TEAM_NOT_FOUND: str = "Tim '{team}' tidak ditemukan"
+    CHUNK_CONFLICT: str = "Bentrok dengan pendaftaran bersamaan; unggah ulang baris ini"
+
+
 class AdminMessages:
     """Administration-specific Indonesian messages."""
 
@@ -180,6 +190,7 @@ class SecurityMessages:
     TOKEN_MISSING_SUB: str = "Token tidak memiliki klaim 'sub' (identifier pengguna)"
     INVALID_JWT_TOKEN: str = "Token JWT tidak valid: {detail}"
     TOKEN_VALIDATION_FAILED: str = "Validasi token gagal: {detail}"
+    PASSWORD_HASHING_BUSY: str = "Terlalu banyak permintaan autentikasi, coba lagi sebentar lagi"
 
 
 class KLSI4Messages:
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, List, Sequence
+from typing import Dict, Sequence
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from app.engine.interfaces import (
     DeliveryConfig,
@@ -14,9 +14,12 @@ from app.engine.interfaces import (
     InstrumentPlugin,
     ItemDTO,
 )
+from app.core.config import settings
+from app.db.item_catalog import get_item_catalog
+from app.db.repositories.assessment import ResponsePackRepository
 from app.engine.registry import engine_registry
 from app.models.klsi.assessment import AssessmentSession
-from app.models.klsi.items import AssessmentItem, ItemChoice, UserResponse
+from app.models.klsi.items import UserResponse
 from app.models.klsi.learning import LFIContextScore
 from app.models.klsi.norms import PercentileScore
 from app.models.klsi.enums import SessionStatus
@@ -61,32 +64,19 @@ class KLSI4Plugin(
 
     def fetch_items(self, db: Session, session_id: int) -> Sequence[ItemDTO]:
         self._ensure_session(db, session_id)
-        items = (
-            db.query(AssessmentItem)
-            .order_by(AssessmentItem.item_number.asc())
-            .options(joinedload(AssessmentItem.choices))
-            .all()
-        )
-        result: List[ItemDTO] = []
-        for item in items:
-            options = [
-                {
-                    "id": choice.id,
-                    "learning_mode": choice.learning_mode.value,
-                    "text": choice.choice_text,
-                }
-                for choice in item.choices
-            ]
-            result.append(
-                ItemDTO(
-                    id=item.id,
-                    number=item.item_number,
-                    type=item.item_type.value,
-                    stem=item.item_stem,
-                    options=options,
-                )
+        return [
+            ItemDTO(
+                id=item.id,
+                number=item.number,
+                type=item.type,
+                stem=item.stem,
+                options=[
+                    {"id": choice.id, "learning_mode": choice.learning_mode, "text": choice.text}
+                    for choice in item.choices
+                ],
             )
-        return result
+            for item in get_item_catalog(db).items
+        ]
 
     def validate_submit(self, db: Session, session_id: int, payload: Dict[str, object]) -> None:
         self._ensure_session(db, session_id)
@@ -175,12 +165,16 @@ class KLSI4Plugin(
             normalized[cid] = rval
         if set(normalized.values()) != {1, 2, 3, 4}:
             raise HTTPException(status_code=400, detail=KLSI4Messages.RANKS_MUST_BE_UNIQUE)
-        valid_choices = {
-            c.id
-            for c in db.query(ItemChoice).filter(ItemChoice.item_id == item_id_int).all()
-        }
+        valid_choices = get_item_catalog(db).choice_ids_by_item.get(item_id_int, frozenset())
         if valid_choices != set(normalized.keys()):
             raise HTTPException(status_code=400, detail=KLSI4Messages.CHOICES_MISMATCH)
+        # A batch-submitted session keeps its ranks packed; update the slot there.
+        packs = ResponsePackRepository(db)
+        if packs.get(session_id) is not None:
+            packs.save_submission(session_id, items=[(item_id_int, normalized)], contexts=())
+            if not settings.packed_responses_write_rows:
+                db.commit()
+                return
         # Upsert semantics: allow re-submission; treat as overwrite not rejection.
         db.query(UserResponse).filter(
             UserResponse.session_id == session_id,
@@ -219,6 +213,19 @@ class KLSI4Plugin(
             raise HTTPException(status_code=400, detail=KLSI4Messages.CONTEXT_RANKS_NUMERIC) from None
         if set(ranks.values()) != {1, 2, 3, 4}:
             raise HTTPException(status_code=400, detail=KLSI4Messages.CONTEXT_RANKS_UNIQUE)
+        overwrite = bool(payload.get("overwrite", False))
+        packs = ResponsePackRepository(db)
+        pack = packs.get(session_id)
+        if pack is not None:
+            if packs.has_context(pack, context_name) and not overwrite:
+                raise HTTPException(
+                    status_code=400,
+                    detail=KLSI4Messages.CONTEXT_ALREADY_SUBMITTED,
+                )
+            packs.save_submission(session_id, items=(), contexts=[(context_name, ranks)])
+            if not settings.packed_responses_write_rows:
+                db.commit()
+                return
         existing = (
             db.query(LFIContextScore)
             .filter(
@@ -227,7 +234,6 @@ class KLSI4Plugin(
             )
             .first()
         )
-        overwrite = bool(payload.get("overwrite", False))
         if existing:
             if overwrite:
                 # Upsert semantics: allow correction before finalize when client opts-in.
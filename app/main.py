@@ -2,27 +2,44 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import importlib
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from fastapi import Depends, FastAPI, Response
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.formatting import format_decimal
 from app.core.logging import configure_logging, get_logger
 from app.core.metrics import get_counters, get_metrics
-from app.db.database import Base, engine, get_db, transactional_session
+from app.db.async_database import dispose_async_gateway
+from app.db.item_catalog import get_item_catalog
+from app.db.query_accounting import QueryAccountingMiddleware
+from app.db.read_your_writes import ReadYourWritesMiddleware
+from app.db.database import (
+    WORKLOAD_ADMIN,
+    Base,
+    engine,
+    get_db,
+    get_workload_gateway,
+    transactional_session,
+)
 from app.i18n import preload_i18n_resources
 from app.core.sentinels import UNKNOWN
 from app.routers.admin import router as admin_router
+from app.routers.analytics import router as analytics_router
 from app.routers.auth import router as auth_router
 from app.routers.exceptions import register_exception_handlers
+from app.routers.metrics import router as metrics_router
 from app.routers.reports import router as reports_router
 from app.routers.research import router as research_router
 from app.routers.score import router as score_router
 from app.routers.teams import router as teams_router
 from app.routers.telemetry import router as telemetry_router
+from app.services.class_stats import ClassStatsRefreshScheduler
+from app.services.password_hashing import password_hasher
 from app.services.seeds import seed_assessment_items, seed_instruments, seed_learning_styles
 from app.engine.registry import engine_registry
 
@@ -30,6 +47,9 @@ from app.engine.registry import engine_registry
 importlib.import_module("app.instruments.klsi4")
 from app.routers.engine import router as engine_router
 
+if TYPE_CHECKING:  # pragma: no cover - type checking helpers only
+    from app.core.metrics_multiprocess import MetricsShardWriter
+
 
 configure_logging(environment=settings.environment)
 logger = get_logger("kolb.app.main", component="app")
@@ -75,6 +95,15 @@ async def lifespan(app: FastAPI):
     See: migrations/versions/*.py for production schema changes
     """
     # Startup
+    metrics_writer: MetricsShardWriter | None = None
+    if settings.metrics_multiprocess_dir:
+        # POSIX-only module (fcntl locks); imported here so it is never loaded
+        # unless multiprocess metrics are enabled.
+        from app.core.metrics_multiprocess import start_multiprocess_metrics
+
+        metrics_writer = start_multiprocess_metrics(
+            settings.metrics_multiprocess_dir, settings.metrics_multiprocess_flush_sec
+        )
     # NOTE: In production, disable create_all() via RUN_STARTUP_DDL=false env var
     # and rely on Alembic migrations only
     if settings.run_startup_ddl:
@@ -93,23 +122,52 @@ async def lifespan(app: FastAPI):
             "i18n_preload_complete",
             extra={"structured_data": stats}
         )
+    try:
+        with transactional_session() as db:
+            get_item_catalog(db)
+    except SQLAlchemyError as exc:
+        # Schema not migrated yet: the catalog is built on first use instead.
+        logger.warning("item_catalog_preload_failed", extra={"structured_data": {"error": str(exc)}})
     discovery_stats = _auto_discover_plugins()
     logger.info("plugin_discovery_complete", extra={"structured_data": discovery_stats})
+    class_stats_scheduler: ClassStatsRefreshScheduler | None = None
+    if settings.class_stats_mv_refresh_interval_sec > 0 and engine.dialect.name == "postgresql":
+        class_stats_scheduler = ClassStatsRefreshScheduler(
+            settings.class_stats_mv_refresh_interval_sec,
+            get_workload_gateway(WORKLOAD_ADMIN).session_factory,
+        )
+        class_stats_scheduler.start()
+        logger.info(
+            "class_stats_mv_refresh_scheduled",
+            extra={"structured_data": {"interval_sec": settings.class_stats_mv_refresh_interval_sec}},
+        )
     yield
-    # Shutdown: nothing
+    # Shutdown
+    if class_stats_scheduler is not None:
+        class_stats_scheduler.stop()
+    await dispose_async_gateway()
+    password_hasher.shutdown()
+    if metrics_writer is not None:
+        from app.core.metrics_multiprocess import stop_multiprocess_metrics
+
+        stop_multiprocess_metrics(metrics_writer)
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.add_middleware(QueryAccountingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 register_exception_handlers(app)
 
 # Register routers at import time so tests see routes without requiring startup
 app.include_router(auth_router)
 app.include_router(engine_router)
 app.include_router(admin_router)
+app.include_router(analytics_router)
 app.include_router(reports_router)
 app.include_router(score_router)
 app.include_router(teams_router)
 app.include_router(research_router)
 app.include_router(telemetry_router)
+app.include_router(metrics_router)
 
 if GUIDES_STATIC_DIR.exists():
     app.mount(
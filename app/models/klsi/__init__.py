@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .analytics import ClassStyleStat
 from .audit import AuditLog
 from .assessment import AssessmentSession, AssessmentSessionDelta
 from .enums import (
@@ -11,7 +12,7 @@ from .enums import (
     SessionStatus,
 )
 from .instrument import Instrument, InstrumentScale, ScoringPipeline, ScoringPipelineNode
-from .items import AssessmentItem, ItemChoice, UserResponse
+from .items import AssessmentItem, ItemChoice, SessionResponsePack, UserResponse
 from .learning import (
     BackupLearningStyle,
     CombinationScore,
@@ -44,6 +45,7 @@ __all__ = [
     "AssessmentItem",
     "ItemChoice",
     "UserResponse",
+    "SessionResponsePack",
     "ScaleScore",
     "CombinationScore",
     "LearningStyleType",
@@ -62,4 +64,5 @@ __all__ = [
     "ResearchStudy",
     "ReliabilityResult",
     "ValidityEvidence",
+    "ClassStyleStat",
 ]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+__all__ = ["ClassStyleStat"]
+
+
+class ClassStyleStat(Base):
+    """Portable counterpart of the ``mv_class_style_stats`` materialized view.
+
+    One row per (kelas, date, ACCE band, AERO band, primary style) holding the
+    number of completed sessions in that cell. Maintained incrementally on
+    finalize and rebuildable in bulk for SQLite and PostgreSQL alike.
+    """
+
+    __tablename__ = "class_style_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kelas: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    stat_date: Mapped[date] = mapped_column(Date)
+    acce_band: Mapped[str] = mapped_column(String(4))
+    aero_band: Mapped[str] = mapped_column(String(4))
+    style_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    session_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "kelas",
+            "stat_date",
+            "acce_band",
+            "aero_band",
+            "style_name",
+            name="uq_class_style_stats_grain",
+        ),
+        Index("ix_class_style_stats_kelas_date", "kelas", "stat_date"),
+    )
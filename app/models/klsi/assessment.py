@@ -34,6 +34,7 @@ class AssessmentSession(Base):
     user: Mapped["User"] = relationship(back_populates="sessions")
     instrument: Mapped[Optional["Instrument"]] = relationship(back_populates="sessions")
     responses: Mapped[list["UserResponse"]] = relationship(back_populates="session")
+    response_pack: Mapped[Optional["SessionResponsePack"]] = relationship(back_populates="session", uselist=False)
     scale_score: Mapped[Optional["ScaleScore"]] = relationship(back_populates="session", uselist=False)
     combination_score: Mapped[Optional["CombinationScore"]] = relationship(back_populates="session", uselist=False)
     learning_style: Mapped[Optional["UserLearningStyle"]] = relationship(back_populates="session", uselist=False)
@@ -73,4 +74,4 @@ if TYPE_CHECKING:  # pragma: no cover
     )
     from app.models.klsi.norms import PercentileScore
     from app.models.klsi.user import User
-    from app.models.klsi.items import UserResponse
\ No newline at end of file
+    from app.models.klsi.items import SessionResponsePack, UserResponse
\ No newline at end of file
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import CheckConstraint, Enum, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -12,6 +23,7 @@ __all__ = [
     "AssessmentItem",
     "ItemChoice",
     "UserResponse",
+    "SessionResponsePack",
 ]
 
 
@@ -61,5 +73,33 @@ class UserResponse(Base):
     choice: Mapped[ItemChoice] = relationship(back_populates="responses")
 
 
+class SessionResponsePack(Base):
+    """All forced-choice rankings of one session in two small blobs.
+
+    ``item_ranks`` holds one permutation index per learning-style item (slot
+    ``item_number - 1``) and ``context_ranks`` one per LFI context in config
+    order; see ``app.assessments.klsi_v4.packing``. When a pack exists it is
+    authoritative and ``user_responses`` / ``lfi_context_scores`` rows are only
+    written for compatibility (``PACKED_RESPONSES_WRITE_ROWS``).
+
+    ``archived_at`` is set when the archival job folded a completed session's
+    rows into the pack and deleted them.
+    """
+
+    __tablename__ = "session_response_packs"
+
+    session_id: Mapped[int] = mapped_column(ForeignKey("assessment_sessions.id"), primary_key=True)
+    item_ranks: Mapped[bytes] = mapped_column(LargeBinary(12))
+    context_ranks: Mapped[bytes] = mapped_column(LargeBinary(8))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+    archived_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    session: Mapped["AssessmentSession"] = relationship(back_populates="response_pack")
+
+
 if TYPE_CHECKING:  # pragma: no cover
     from app.models.klsi.assessment import AssessmentSession
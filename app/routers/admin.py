@@ -1,13 +1,25 @@
 import csv
+import json
+from datetime import date
 from hashlib import sha256
 from io import StringIO
+from typing import Iterator
 
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.db.repositories import NormativeConversionRepository
+from app.db.database import (
+    WORKLOAD_ADMIN,
+    get_admin_db,
+    get_db,
+    get_workload_gateway,
+    get_workload_pool_snapshot,
+    sqlite_write_queue,
+)
+from app.db.pool_telemetry import get_pool_telemetry_snapshot
+from app.db.repositories import NormativeConversionRepository, get_statement_cache_stats
 from app.models.klsi.audit import AuditLog
 from app.engine.norms.factory import (
     build_composite_norm_provider,
@@ -20,20 +32,43 @@ from app.engine.norms.factory import (
 from app.assessments.klsi_v4.logic import clear_percentile_cache
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.norm_builder import DEFAULT_MIN_SAMPLE, NormSampleFilter, build_empirical_norms
+from app.services.password_hashing import PasswordHasher
 from app.services.security import get_current_user
+from app.services.user_provisioning import parse_provision_rows, provision_users
 from app.services import pipelines as pipeline_service
-from app.core.metrics import get_metrics, get_counters
+from app.core.metrics import get_metrics, get_counters, get_quantiles
 from app.i18n.id_messages import AdminMessages, AuthorizationMessages
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 logger = get_logger("kolb.routers.admin", component="router")
 
+def _invalidate_norm_caches(db: Session, *, norm_group: str, norm_version: str, user_id: int) -> None:
+    """Invalidate in-process normative caches so subsequent lookups see fresh data."""
+    try:
+        provider = build_composite_norm_provider(db)
+        if hasattr(provider, "_db_lookup"):
+            clear_norm_db_cache(getattr(provider, "_db_lookup"))
+            clear_percentile_cache()
+    except Exception:
+        logger.exception(
+            "norm_cache_invalidation_failed",
+            extra={
+                "structured_data": {
+                    "norm_group": norm_group,
+                    "norm_version": norm_version,
+                    "user_id": user_id,
+                }
+            },
+        )
+
+
 @router.post("/norms/import")
 def import_norms(
     norm_group: str,
     file: UploadFile = File(...),
     norm_version: str = "default",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_admin_db),
     authorization: str | None = Header(default=None),
 ):
     user = get_current_user(authorization, db)
@@ -92,23 +127,7 @@ def import_norms(
             if created:
                 inserted += 1
         db.add(AuditLog(actor=user.email, action=f'norm_import:{norm_group}:{norm_version}', payload_hash=batch_hash))
-    # Invalidate in-process normative cache so subsequent lookups see fresh data
-    try:
-        provider = build_composite_norm_provider(db)
-        if hasattr(provider, "_db_lookup"):
-            clear_norm_db_cache(getattr(provider, "_db_lookup"))
-            clear_percentile_cache()
-    except Exception as exc:
-        logger.exception(
-            "norm_cache_invalidation_failed",
-            extra={
-                "structured_data": {
-                    "norm_group": norm_group,
-                    "norm_version": norm_version,
-                    "user_id": user.id,
-                }
-            },
-        )
+    _invalidate_norm_caches(db, norm_group=norm_group, norm_version=norm_version, user_id=user.id)
     return {
         "norm_group": norm_group,
         "norm_version": norm_version,
@@ -118,6 +137,58 @@ def import_norms(
     }
 
 
+class BuildNormsRequest(BaseModel):
+    norm_group: str = Field(min_length=1, max_length=150)
+    norm_version: str = Field(min_length=1, max_length=40)
+    kelas: str | None = Field(default=None, max_length=20)
+    country: str | None = Field(default=None, max_length=100)
+    age_band: str | None = Field(default=None, max_length=10)
+    date_from: date | None = None
+    date_to: date | None = None
+    min_sample: int = Field(default=DEFAULT_MIN_SAMPLE, ge=1)
+
+
+@router.post("/norms/build")
+def build_norms(
+    payload: BuildNormsRequest,
+    db: Session = Depends(get_admin_db),
+    authorization: str | None = Header(default=None),
+):
+    """Build empirical percentile tables from completed sessions (Mediator only).
+
+    Covers CE, RO, AC, AE, ACCE, AERO and LFI. LFI is raw ``round(LFI_score * 100)``
+    and is skipped when fewer than ``min_sample`` sessions in the cohort have one.
+    """
+    user = get_current_user(authorization, db)
+    if user.role != 'MEDIATOR':
+        raise HTTPException(status_code=403, detail=AuthorizationMessages.MEDIATOR_NORM_IMPORT_ONLY)
+    norm_group = payload.norm_group.strip()
+    norm_version = payload.norm_version.strip()
+    sample_filter = NormSampleFilter(
+        kelas=payload.kelas,
+        country=payload.country,
+        age_band=payload.age_band,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+    )
+    payload_hash = sha256(payload.model_dump_json().encode('utf-8')).hexdigest()
+    try:
+        result = build_empirical_norms(
+            db,
+            norm_group=norm_group,
+            norm_version=norm_version,
+            sample_filter=sample_filter,
+            min_sample=payload.min_sample,
+        )
+        db.add(AuditLog(actor=user.email, action=f'norm_build:{norm_group}:{norm_version}', payload_hash=payload_hash))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _invalidate_norm_caches(db, norm_group=norm_group, norm_version=norm_version, user_id=user.id)
+    return result
+
+
 @router.get("/norms/cache-stats")
 def get_norm_cache_stats(
     db: Session = Depends(get_db),
@@ -159,15 +230,55 @@ def get_external_norm_cache_stats(
     return {"external_cache": stats}
 
 
+def _stream_provisioning(fmt: str, text: str) -> Iterator[bytes]:
+    hasher = PasswordHasher(settings.user_provision_hash_workers, 0, settings.password_hash_retry_after_sec)
+    try:
+        results = provision_users(
+            get_workload_gateway(WORKLOAD_ADMIN).session_factory,
+            parse_provision_rows(fmt, text),
+            hasher=hasher,
+        )
+        for result in results:
+            yield (json.dumps(result.as_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+    finally:
+        hasher.shutdown()
+
+
+@router.post("/users/provision")
+def provision_users_endpoint(
+    file: UploadFile = File(...),
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_admin_db),
+    authorization: str | None = Header(default=None),
+):
+    """Create users (and optional team memberships) from a CSV/NDJSON upload (Mediator only).
+
+    Columns: ``full_name``, ``email``, optional ``password``, ``nim``, ``kelas``,
+    ``tahun_masuk``, ``team`` (existing team name) and ``role_in_team``.
+    Streams one NDJSON result per input row as each chunk commits.
+    """
+    user = get_current_user(authorization, db)
+    if user.role != 'MEDIATOR':
+        raise HTTPException(status_code=403, detail=AuthorizationMessages.MEDIATOR_REQUIRED)
+    text = file.file.read().decode('utf-8-sig')
+    db.add(AuditLog(actor=user.email, action=f'user_provision:{format}', payload_hash=sha256(text.encode('utf-8')).hexdigest()))
+    db.commit()
+    return StreamingResponse(_stream_provisioning(format, text), media_type="application/x-ndjson")
+
+
 @router.get("/perf-metrics")
 def get_perf_metrics(
     reset: bool = False,
+    window_minutes: int | None = Query(default=None, ge=0),
     db: Session = Depends(get_db),
     authorization: str | None = Header(default=None),
 ):
     """Return lightweight performance metrics (Mediator only).
 
-    Includes timing counters and norm provider cache stats.
+    Includes timing counters, norm provider cache stats and compile/cache-hit
+    counts for prepared repository statements. `quantiles` gives p50/p90/p99/p99.9
+    per timing over the last `window_minutes` (default and cap:
+    `metrics_quantile_window_minutes`; `0` = since start or reset).
     Use `reset=true` to clear counters after reading.
     """
     user = get_current_user(authorization, db)
@@ -176,6 +287,8 @@ def get_perf_metrics(
             status_code=403,
             detail=AuthorizationMessages.MEDIATOR_METRICS_ONLY,
         )
+    statement_cache = get_statement_cache_stats()
+    quantiles = get_quantiles(window_minutes)
     timing = get_metrics(reset=reset)
     counters = get_counters(reset=reset)
     # Toggle visibility for ops
@@ -195,14 +308,44 @@ def get_perf_metrics(
     preload = getattr(provider, "_preload_stats", preload_cache_stats())
     return {
         "timings": timing,
+        "quantiles": quantiles,
         "counters": counters,
         "norm_db_cache": db_cache,
         "external_norm_cache": ext_cache,
         "norm_preload": preload,
+        "statement_cache": statement_cache,
         "toggles": toggles,
     }
 
 
+@router.get("/db/pools")
+def get_db_pool_state(
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+):
+    """Return live connection pool state (Mediator only).
+
+    ``pools`` lists checked-out/checked-in/overflow counts, utilization, peak
+    checkouts and event counters per instrumented pool; ``workloads`` the
+    configured sizing; ``sqlite_write_queue`` the writer queue in SQLite
+    production mode. Wait/hold histograms are under ``db.pool.<name>.*``.
+    """
+    user = get_current_user(authorization, db)
+    if user.role != 'MEDIATOR':
+        raise HTTPException(
+            status_code=403,
+            detail=AuthorizationMessages.MEDIATOR_METRICS_ONLY,
+        )
+    return {
+        "pools": get_pool_telemetry_snapshot(),
+        "workloads": get_workload_pool_snapshot(),
+        "saturation_ratio": settings.db_pool_saturation_ratio,
+        "sqlite_write_queue": (
+            sqlite_write_queue.snapshot() if sqlite_write_queue is not None else None
+        ),
+    }
+
+
 @router.get("/instruments/{instrument_code}/pipelines")
 def list_instrument_pipelines(
     instrument_code: str,
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.db.database import get_admin_db, get_analytics_read_db
+from app.services.principals import Principal
+from app.i18n.id_messages import AuthorizationMessages
+from app.services.class_stats import (
+    rebuild_class_style_stats,
+    refresh_class_style_view,
+    summarize_class_style_stats,
+)
+from app.services.security import get_current_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+logger = get_logger("kolb.routers.analytics", component="router")
+
+
+def _require_mediator(user: Principal) -> None:
+    if user.role != "MEDIATOR":
+        raise HTTPException(status_code=403, detail=AuthorizationMessages.MEDIATOR_REQUIRED)
+
+
+def _log_db_failure(event: str, **structured: Any) -> None:
+    logger.exception(event, extra={"structured_data": structured})
+
+
+@router.get("/classes/{kelas}/style-stats", response_model=dict)
+def class_style_stats(
+    kelas: str,
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
+    db: Session = Depends(get_analytics_read_db),
+    authorization: str | None = Header(default=None),
+):
+    """Class-level style distribution read from the ``class_style_stats`` aggregate."""
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    return summarize_class_style_stats(db, kelas, date_from=date_from, date_to=date_to)
+
+
+@router.post("/class-stats/rebuild", response_model=dict)
+def rebuild_class_stats(
+    kelas: Optional[str] = Query(default=None),
+    db: Session = Depends(get_admin_db),
+    authorization: str | None = Header(default=None),
+):
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    try:
+        written = rebuild_class_style_stats(db, kelas=kelas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        _log_db_failure("class_stats_rebuild_failed", user_id=user.id, kelas=kelas)
+        raise
+    return {"kelas": kelas, "rows_written": written}
+
+
+@router.post("/class-stats/refresh-view", response_model=dict)
+def refresh_class_stats_view(
+    concurrently: Optional[bool] = Query(default=None),
+    db: Session = Depends(get_admin_db),
+    authorization: str | None = Header(default=None),
+):
+    """Refresh ``mv_class_style_stats`` (PostgreSQL only; no-op elsewhere)."""
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    try:
+        refreshed = refresh_class_style_view(db, concurrently=concurrently)
+        db.commit()
+    except Exception:
+        db.rollback()
+        _log_db_failure("class_stats_refresh_view_failed", user_id=user.id)
+        raise
+    return {"refreshed": refreshed}
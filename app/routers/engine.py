@@ -6,16 +6,20 @@ from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, Header, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.assessments.constants import LEARNING_MODES
+from app.assessments.klsi_v4.packing import CONTEXT_ORDER, RANK_PERMUTATIONS
+from app.db.async_database import get_async_db
 from app.db.database import get_db
 from app.engine.authoring import (
     get_instrument_locale_resource,
     get_instrument_spec,
     list_instrument_specs,
 )
-from app.services.security import get_current_user
-from app.schemas.session import SessionSubmissionPayload
+from app.services.security import get_current_user, get_current_user_async
+from app.schemas.session import CompactSessionSubmissionPayload, SessionSubmissionPayload
 from app.core.errors import InstrumentNotFoundError, PermissionDeniedError
 from app.core.metrics import (
     get_metrics,
@@ -24,7 +28,7 @@ from app.core.metrics import (
     get_last_runs,
     inc_counter,
 )
-from app.services.engine import EngineSessionService
+from app.services.engine import EngineSessionService, load_delivery_package
 from app.i18n.id_messages import AuthorizationMessages, EngineMessages
 
 def _format_sunset(value: datetime | None) -> str | None:
@@ -41,6 +45,10 @@ class StartSessionRequest(BaseModel):
     instrument_version: Optional[str] = None
 
 
+class BootstrapSessionRequest(StartSessionRequest):
+    locale: Optional[str] = None
+
+
 class SubmissionPayload(BaseModel):
     kind: Literal["item", "context"]
     item_id: Optional[int] = None
@@ -112,16 +120,42 @@ def start_engine_session(
     return {"session_id": session.id}
 
 
-@router.get("/sessions/{session_id}/delivery", response_model=dict)
-def get_delivery(
-    session_id: int,
-    locale: str | None = None,
+@router.post("/sessions/bootstrap", response_model=dict)
+def bootstrap_engine_session(
+    payload: BootstrapSessionRequest,
     db: Session = Depends(get_db),
     authorization: str | None = Header(default=None),
 ):
+    """``/sessions/start`` and ``/sessions/{id}/delivery`` in one round trip.
+
+    ``X-Delivery-ETag`` can be sent as ``If-None-Match`` on later delivery requests.
+    """
     user = get_current_user(authorization, db)
     service = EngineSessionService(db)
-    return service.delivery_package(session_id, user, locale=locale)
+    session, delivery = service.bootstrap_session(
+        user,
+        instrument_code=payload.instrument_code,
+        instrument_version=payload.instrument_version,
+        locale=payload.locale,
+    )
+    body = b'{"session_id":%d,"delivery":%b}' % (session.id, delivery.body)
+    return Response(content=body, media_type="application/json", headers={"X-Delivery-ETag": delivery.etag})
+
+
+@router.get("/sessions/{session_id}/delivery", response_model=dict)
+async def get_delivery(
+    session_id: int,
+    locale: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    authorization: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    user = await get_current_user_async(authorization, db)
+    delivery = await load_delivery_package(db, session_id, user, locale=locale)
+    headers = {"ETag": delivery.etag}
+    if if_none_match and delivery.etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=delivery.body, media_type="application/json", headers=headers)
 
 
 @router.post("/sessions/{session_id}/submit_all", response_model=dict)
@@ -138,6 +172,30 @@ def submit_all_responses(
     return {"ok": True, "result": result}
 
 
+@router.post("/sessions/{session_id}/submit_all/compact", response_model=dict)
+def submit_all_compact(
+    session_id: int,
+    payload: CompactSessionSubmissionPayload,
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+):
+    """``submit_all`` with each item and context sent as a rank permutation index (see ``/submission-codec``)."""
+    user = get_current_user(authorization, db)
+    service = EngineSessionService(db)
+    result = service.submit_compact_batch(session_id, user, payload)
+    return {"ok": True, "result": result}
+
+
+@router.get("/submission-codec", response_model=dict)
+def get_submission_codec():
+    """Permutation table and context order for compact batch submissions."""
+    return {
+        "modes": list(LEARNING_MODES),
+        "permutations": [list(ranks) for ranks in RANK_PERMUTATIONS],
+        "contexts": list(CONTEXT_ORDER),
+    }
+
+
 @router.post("/sessions/{session_id}/interactions", response_model=dict)
 def submit_interaction(
     session_id: int,
@@ -29,4 +29,8 @@ def register_exception_handlers(app: FastAPI) -> None:
         correlation_id = _CORRELATION_ID.get()
         if correlation_id:
             payload["correlation_id"] = correlation_id
-        return JSONResponse(status_code=getattr(exc, "status_code", 400), content=payload)
+        headers = None
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            headers = {"Retry-After": str(retry_after)}
+        return JSONResponse(status_code=getattr(exc, "status_code", 400), content=payload, headers=headers)
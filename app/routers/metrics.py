@@ -0,0 +1,21 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from app.core.config import settings
+from app.core.prometheus import CONTENT_TYPE, prometheus_renderer
+from app.i18n.id_messages import SecurityMessages
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", response_class=Response)
+def prometheus_metrics(authorization: str | None = Header(default=None)):
+    """Prometheus scrape endpoint for this process's metrics registry.
+
+    When ``METRICS_SCRAPE_TOKEN`` is set, scrapers must send it as a Bearer token.
+    """
+    token = settings.metrics_scrape_token
+    if token and not hmac.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail=SecurityMessages.INVALID_AUTH_HEADER)
+    return Response(content=prometheus_renderer.render(), media_type=CONTENT_TYPE)
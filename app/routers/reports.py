@@ -1,22 +1,22 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.db.repositories import SessionRepository
-from app.models.klsi.user import User
+from app.db.async_database import get_async_read_db
+from app.db.repositories import AsyncSessionReadRepository
+from app.services.principals import Principal
 from app.services.report import build_report
-from app.services.security import get_current_user
+from app.services.security import get_current_user_async
 from app.i18n.id_messages import SessionErrorMessages
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
-def _try_get_current_user(authorization: str | None, db: Session) -> User | None:
+async def _try_get_current_user(authorization: str | None, db: AsyncSession) -> Principal | None:
     """Attempt to resolve current user; return None on auth errors."""
     if not authorization:
         return None
     try:
-        return get_current_user(authorization, db)
+        return await get_current_user_async(authorization, db)
     except HTTPException as exc:
         if exc.status_code == 401:
             return None
@@ -24,15 +24,15 @@ def _try_get_current_user(authorization: str | None, db: Session) -> User | None
 
 
 @router.get("/{session_id}")
-def get_report(
+async def get_report(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     authorization: str | None = Header(default=None)
 ):
     # Get current viewer
-    viewer = _try_get_current_user(authorization, db)
-    repo = SessionRepository(db)
-    session = repo.get_by_id(session_id)
+    viewer = await _try_get_current_user(authorization, db)
+    repo = AsyncSessionReadRepository(db)
+    session = await repo.get_by_id(session_id)
     if not session:
         raise HTTPException(status_code=404, detail=SessionErrorMessages.NOT_FOUND)
     
@@ -46,8 +46,10 @@ def get_report(
         elif viewer.id != session.user_id:
             raise HTTPException(status_code=403, detail=SessionErrorMessages.FORBIDDEN)
     
+    # build_report stays synchronous; run_sync drives it on the async
+    # connection inside a greenlet, so no threadpool worker is held.
     try:
-        data = build_report(db, session_id, viewer_role=viewer_role)
+        data = await db.run_sync(build_report, session_id, viewer_role=viewer_role)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from None
     return data
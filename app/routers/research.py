@@ -3,15 +3,16 @@ from __future__ import annotations
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_analytics_db, get_analytics_read_db, get_db
 from app.db.repositories import (
     ReliabilityRepository,
     ResearchStudyRepository,
     ValidityRepository,
 )
-from app.models.klsi.user import User
+from app.services.principals import Principal
 from app.schemas.research import (
     ReliabilityCreate,
     ResearchStudyCreate,
@@ -21,6 +22,8 @@ from app.schemas.research import (
 )
 from app.core.logging import get_logger
 from app.i18n.id_messages import AuthorizationMessages, ResearchMessages
+from app.services.reliability import compute_study_reliability
+from app.services.research_export import EXPORT_FORMATS, stream_research_export
 from app.services.security import get_current_user
 
 router = APIRouter(prefix="/research", tags=["research"])
@@ -31,11 +34,34 @@ def _log_db_failure(event: str, **structured: Any) -> None:
     logger.exception(event, extra={"structured_data": structured})
 
 
-def _require_mediator(user: User) -> None:
+def _require_mediator(user: Principal) -> None:
     if user.role != "MEDIATOR":
         raise HTTPException(status_code=403, detail=AuthorizationMessages.MEDIATOR_REQUIRED)
 
 
+@router.get("/export")
+def export_research_data(
+    format: str = Query(default="csv", pattern="^(csv|ndjson|npz)$"),
+    study_id: Optional[int] = Query(default=None),
+    db: Session = Depends(get_analytics_read_db),
+    authorization: str | None = Header(default=None),
+):
+    """Stream a session-by-item rank matrix with derived scores.
+
+    Without ``study_id`` every completed session is exported.
+    """
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    if study_id is not None and ResearchStudyRepository(db).get(study_id) is None:
+        raise HTTPException(status_code=404, detail=ResearchMessages.NOT_FOUND)
+    scope = f"study-{study_id}" if study_id is not None else "all"
+    return StreamingResponse(
+        stream_research_export(format, study_id=study_id),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="klsi-export-{scope}.{format}"'},
+    )
+
+
 @router.post("/studies", response_model=ResearchStudyOut)
 def create_study(
     payload: ResearchStudyCreate,
@@ -183,6 +209,37 @@ def add_reliability(
     return {"id": row.id, "metric_name": row.metric_name, "value": row.value}
 
 
+@router.post("/studies/{study_id}/reliability/compute", response_model=dict)
+def compute_reliability(
+    study_id: int,
+    persist: bool = Query(default=True),
+    db: Session = Depends(get_analytics_db),
+    authorization: str | None = Header(default=None),
+):
+    """Compute alpha, split-half and test-retest coefficients for the study window."""
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    study_repo = ResearchStudyRepository(db)
+    try:
+        study = study_repo.get(study_id)
+        if not study:
+            raise HTTPException(status_code=404, detail=ResearchMessages.NOT_FOUND)
+        result = compute_study_reliability(db, study, persist=persist)
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception:
+        db.rollback()
+        _log_db_failure(
+            "research_compute_reliability_failed",
+            study_id=study_id,
+            user_id=user.id,
+        )
+        raise
+    return result
+
+
 @router.post("/studies/{study_id}/validity", response_model=dict)
 def add_validity(
     study_id: int,
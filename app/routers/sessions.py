@@ -9,9 +9,9 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.db.repositories import SessionRepository
 from app.engine.runtime import runtime
-from app.models.klsi.user import User
+from app.services.principals import Principal
 from app.services.security import get_current_user
-from app.services.validation import run_session_validations
+from app.services.validation import run_session_validations, take_validation_snapshot
 from app.schemas.session import (
     LegacyContextSubmissionPayload,
     LegacyItemSubmissionPayload,
@@ -221,10 +221,10 @@ def finalize(session_id: int, db: Session = Depends(get_db), authorization: str
         raise HTTPException(status_code=403, detail=SessionErrorMessages.ACCESS_DENIED)
     # Explicit guard: require all 8 LFI contexts present before finalize,
     # even if engine validation would catch it. Gives clearer 400 with detail.
-    validation_snapshot = run_session_validations(db, session_id)
-    if not validation_snapshot.get("ready", False):
-        issues = validation_snapshot.get("issues", [])
-        raise HTTPException(status_code=400, detail={"issues": issues, "diagnostics": validation_snapshot.get("diagnostics")})
+    validation_snapshot = take_validation_snapshot(db, session_id)
+    if not validation_snapshot.ready:
+        report = validation_snapshot.as_report()
+        raise HTTPException(status_code=400, detail={"issues": report.get("issues", []), "diagnostics": report.get("diagnostics")})
     def _payload_builder(res: dict) -> bytes:
         combination = res.get("combination")
         lfi = res.get("lfi")
@@ -241,6 +241,7 @@ def finalize(session_id: int, db: Session = Depends(get_db), authorization: str
         actor_email=user.email,
         action="FINALIZE_SESSION_USER",
         build_payload=_payload_builder,
+        validation=validation_snapshot,
     )
     combination = result.get("combination")
     lfi = result.get("lfi")
@@ -270,7 +271,7 @@ def finalize(session_id: int, db: Session = Depends(get_db), authorization: str
 def session_validation(session_id: int, db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
     """Mengembalikan status kelengkapan sesi (item ipsatif & konteks LFI)."""
     # Autentikasi opsional: jika token ada pastikan pemilik sesi atau mediator
-    viewer: User | None = None
+    viewer: Principal | None = None
     if authorization:
         try:
             viewer = get_current_user(authorization, db)
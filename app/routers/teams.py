@@ -4,16 +4,19 @@ from datetime import date
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
-from app.db.database import get_db
+from app.db.async_database import get_async_read_db
+from app.db.database import get_analytics_read_db, get_db
 from app.db.repositories import (
+    AsyncTeamRollupReadRepository,
     TeamMemberRepository,
     TeamRepository,
     TeamRollupRepository,
 )
-from app.models.klsi.user import User
+from app.services.principals import Principal
 from app.schemas.team import (
     TeamCreate,
     TeamMemberAdd,
@@ -24,12 +27,13 @@ from app.schemas.team import (
 )
 from app.i18n.id_messages import AuthorizationMessages, TeamMessages
 from app.services.rollup import compute_team_rollup
+from app.services.team_distribution import compute_team_distribution
 from app.services.security import get_current_user
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 logger = get_logger("kolb.routers.teams", component="router")
 
-def _require_mediator(user: User):
+def _require_mediator(user: Principal):
     if user.role != 'MEDIATOR':
         raise HTTPException(status_code=403, detail=AuthorizationMessages.MEDIATOR_REQUIRED)
 
@@ -223,9 +227,32 @@ def remove_member(
 
 
 @router.get("/{team_id}/rollups", response_model=list[TeamRollupOut])
-def list_rollups(team_id: int, db: Session = Depends(get_db)):
-    repo = TeamRollupRepository(db)
-    return repo.list_by_team(team_id)
+async def list_rollups(team_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    repo = AsyncTeamRollupReadRepository(db)
+    return await repo.list_by_team(team_id)
+
+
+@router.get("/{team_id}/distribution", response_model=dict)
+def team_distribution(
+    team_id: int,
+    db: Session = Depends(get_analytics_read_db),
+    authorization: str | None = Header(default=None),
+    for_date: Optional[date] = Query(default=None, description="Optional session date filter"),
+    mode_bin_width: int = Query(1, ge=1, le=12),
+    grid_bin_width: int = Query(6, ge=1, le=24),
+):
+    """Per-mode histograms, LFI quantiles and ACCE/AERO density for a team."""
+    user = get_current_user(authorization, db)
+    _require_mediator(user)
+    if TeamRepository(db).get(team_id) is None:
+        raise HTTPException(status_code=404, detail=TeamMessages.NOT_FOUND)
+    return compute_team_distribution(
+        db,
+        team_id,
+        for_date=for_date,
+        mode_bin_width=mode_bin_width,
+        grid_bin_width=grid_bin_width,
+    )
 
 
 @router.post("/{team_id}/rollup/run", response_model=TeamRollupOut)
@@ -15,6 +15,18 @@ class UserCreate(BaseModel):
     kelas: str | None = None  # format IF-<number>
     tahun_masuk: int | None = None
 
+class UserProvisionRow(BaseModel):
+    """One row of a bulk provisioning upload; ``team`` is an existing team name."""
+
+    full_name: str
+    email: EmailStr
+    password: str | None = None
+    nim: str | None = None
+    kelas: str | None = None
+    tahun_masuk: int | None = None
+    team: str | None = None
+    role_in_team: str | None = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
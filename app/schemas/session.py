@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.assessments.klsi_v4.logic import CONTEXT_NAMES
+from app.assessments.klsi_v4.packing import RANK_PERMUTATIONS
 from app.i18n.id_messages import ValidationMessages
 
 
@@ -69,6 +70,22 @@ class SessionSubmissionPayload(BaseModel):
         return v
 
 
+PermutationIndex = Annotated[int, Field(ge=0, lt=len(RANK_PERMUTATIONS))]
+
+
+class CompactSessionSubmissionPayload(BaseModel):
+    """Permutation-coded batch submission.
+
+    ``items[n]`` ranks item number ``n + 1`` and ``contexts[n]`` the n-th LFI
+    context in ``GET /engine/submission-codec`` order. Each value indexes the
+    24 rank permutations of (CE, RO, AC, AE), so every entry is a valid
+    ranking by construction.
+    """
+
+    items: list[PermutationIndex] = Field(..., min_length=12, max_length=12)
+    contexts: list[PermutationIndex] = Field(..., min_length=8, max_length=8)
+
+
 class LegacyItemSubmissionPayload(ItemRank):
     """Payload model for legacy /submit_item requests."""
 
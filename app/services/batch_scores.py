@@ -17,12 +17,12 @@ else:  # Runtime fallback keeps import lazy until needed
 _NUMPY_MODULE = None
 
 
-def _require_numpy():
+def require_numpy():
     """Import numpy lazily to avoid module load in non-batch workloads."""
 
     global _NUMPY_MODULE
     if _NUMPY_MODULE is None:
-        import numpy as np  # type: ignore[import-not-found]
+        import numpy as np
 
         _NUMPY_MODULE = np
     return _NUMPY_MODULE
@@ -45,7 +45,7 @@ def vectorized_combination_metrics(
         balance_aero).
     """
 
-    np_mod = _require_numpy()
+    np_mod = require_numpy()
     matrix = np_mod.asarray(mode_matrix, dtype=np_mod.int64)
     if matrix.ndim != 2 or (matrix.size and matrix.shape[1] != 4):
         raise ValueError("mode_matrix must be shape (n, 4)")
@@ -110,7 +110,7 @@ def compute_batch_combination_metrics(
 
 
 def _vectors_to_matrix(vectors: Sequence[ScoreVector]) -> ModeMatrix:
-    np_mod = _require_numpy()
+    np_mod = require_numpy()
     matrix = np_mod.empty((len(vectors), 4), dtype=np_mod.int64)
     for idx, vector in enumerate(vectors):
         matrix[idx] = (vector.CE, vector.RO, vector.AC, vector.AE)
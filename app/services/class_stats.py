@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from datetime import date
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter, metrics_registry, record_last_run
+from app.db.repositories import ClassStyleStatsRepository
+from app.models.klsi.learning import LearningStyleType
+from app.models.klsi.user import User
+
+logger = get_logger("kolb.services.class_stats", component="services")
+
+# Inclusive upper bounds of the Low/Mid bands (Guide p.50, mirrors migration 0002).
+ACCE_BAND_CUTS: tuple[int, int] = (5, 14)
+AERO_BAND_CUTS: tuple[int, int] = (0, 11)
+
+__all__ = [
+    "ACCE_BAND_CUTS",
+    "AERO_BAND_CUTS",
+    "band_for",
+    "record_completed_session",
+    "rebuild_class_style_stats",
+    "summarize_class_style_stats",
+    "refresh_class_style_view",
+    "ClassStatsRefreshScheduler",
+]
+
+
+def band_for(value: int, cuts: tuple[int, int]) -> str:
+    """Map a dialectic raw score to the Low/Mid/High band used by class stats."""
+
+    if value <= cuts[0]:
+        return "Low"
+    if value <= cuts[1]:
+        return "Mid"
+    return "High"
+
+
+def record_completed_session(
+    db: Session,
+    *,
+    user_id: int,
+    acce: int,
+    aero: int,
+    style_type_id: Optional[int],
+    completed_on: date,
+) -> bool:
+    """Increment the class aggregate for a freshly finalized session.
+
+    Runs inside a SAVEPOINT so a failure here never aborts the surrounding
+    finalize transaction; the next bulk rebuild heals any missed increment.
+    """
+
+    if not settings.class_stats_incremental_enabled:
+        return False
+    try:
+        with db.begin_nested():
+            user = db.get(User, user_id)
+            style = db.get(LearningStyleType, style_type_id) if style_type_id else None
+            ClassStyleStatsRepository(db).increment(
+                kelas=user.kelas if user else None,
+                stat_date=completed_on,
+                acce_band=band_for(int(acce), ACCE_BAND_CUTS),
+                aero_band=band_for(int(aero), AERO_BAND_CUTS),
+                style_name=style.style_name if style else None,
+            )
+    except SQLAlchemyError as exc:
+        inc_counter("class_stats.increment.failed")
+        logger.warning(
+            "class_stats_increment_failed",
+            extra={"structured_data": {"user_id": user_id, "error": str(exc)}},
+        )
+        return False
+    inc_counter("class_stats.increment")
+    return True
+
+
+def rebuild_class_style_stats(db: Session, *, kelas: Optional[str] = None) -> int:
+    """Rebuild the aggregate in bulk (whole table or a single class)."""
+
+    started = perf_counter()
+    written = ClassStyleStatsRepository(db).rebuild(
+        acce_cuts=ACCE_BAND_CUTS,
+        aero_cuts=AERO_BAND_CUTS,
+        kelas=kelas,
+    )
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("class_stats.rebuild", elapsed_ms)
+    record_last_run("class_stats.rebuild", elapsed_ms, metadata={"kelas": kelas, "rows": written})
+    return written
+
+
+def summarize_class_style_stats(
+    db: Session,
+    kelas: str,
+    *,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Return per-day rows plus style/band totals for a class."""
+
+    rows = ClassStyleStatsRepository(db).list_for_kelas(kelas, date_from=date_from, date_to=date_to)
+    style_counts: Counter[str] = Counter()
+    grid_counts: Counter[str] = Counter()
+    total = 0
+    for row in rows:
+        total += row.session_count
+        if row.style_name:
+            style_counts[row.style_name] += row.session_count
+        grid_counts[f"{row.acce_band}/{row.aero_band}"] += row.session_count
+    return {
+        "kelas": kelas,
+        "date_from": date_from,
+        "date_to": date_to,
+        "total_sessions": total,
+        "style_counts": dict(style_counts),
+        "band_grid": dict(grid_counts),
+        "rows": [
+            {
+                "date": row.stat_date,
+                "acce_band": row.acce_band,
+                "aero_band": row.aero_band,
+                "style_name": row.style_name,
+                "count": row.session_count,
+            }
+            for row in rows
+        ],
+    }
+
+
+def refresh_class_style_view(db: Session, *, concurrently: bool | None = None) -> bool:
+    """Refresh ``mv_class_style_stats`` on PostgreSQL; returns False elsewhere."""
+
+    use_concurrently = (
+        settings.class_stats_mv_refresh_concurrently if concurrently is None else concurrently
+    )
+    started = perf_counter()
+    refreshed = ClassStyleStatsRepository(db).refresh_materialized_view(concurrently=use_concurrently)
+    if refreshed:
+        elapsed_ms = (perf_counter() - started) * 1000.0
+        metrics_registry.record("class_stats.mv_refresh", elapsed_ms)
+        record_last_run("class_stats.mv_refresh", elapsed_ms)
+    return refreshed
+
+
+class ClassStatsRefreshScheduler:
+    """Daemon thread refreshing the PostgreSQL materialized view periodically."""
+
+    def __init__(self, interval_sec: float, session_factory: Any) -> None:
+        self._interval = float(interval_sec)
+        self._session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self._interval <= 0 or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="class-stats-mv-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def run_once(self) -> bool:
+        with self._session_factory() as db:
+            try:
+                refreshed = refresh_class_style_view(db)
+                db.commit()
+                return refreshed
+            except SQLAlchemyError as exc:
+                db.rollback()
+                inc_counter("class_stats.mv_refresh.failed")
+                logger.warning(
+                    "class_stats_mv_refresh_failed",
+                    extra={"structured_data": {"error": str(exc)}},
+                )
+                return False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.run_once()
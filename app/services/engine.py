@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.assessments.klsi_v4.packing import CONTEXT_ORDER, decode_ranks, pack_slots
+from app.core.config import settings
 from app.core.errors import (
     ConfigurationError,
     DomainError,
@@ -11,18 +14,20 @@ from app.core.errors import (
     SessionFinalizedError,
     SessionNotFoundError,
 )
+from app.db.repositories.assessment import ResponsePackRepository
+from app.db.repositories.async_reads import AsyncSessionReadRepository
 from app.db.repositories.sessions import SessionRepository
-from app.engine.runtime import runtime
+from app.engine.runtime import SerializedDelivery, runtime
 from app.models.klsi.enums import SessionStatus
 from app.models.klsi.learning import LFIContextScore
 from app.models.klsi.items import UserResponse
-from app.schemas.session import SessionSubmissionPayload
+from app.schemas.session import CompactSessionSubmissionPayload, SessionSubmissionPayload
 from app.services.validation import validate_full_submission_payload
 from app.i18n.id_messages import SessionErrorMessages
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.models.klsi.assessment import AssessmentSession
-    from app.models.klsi.user import User
+    from app.services.principals import Principal
 
 
 class EngineSessionService:
@@ -34,7 +39,7 @@ class EngineSessionService:
 
     def start_session(
         self,
-        user: "User",
+        user: "Principal",
         *,
         instrument_code: str,
         instrument_version: Optional[str] = None,
@@ -46,14 +51,31 @@ class EngineSessionService:
             instrument_version=instrument_version,
         )
 
-    def delivery_package(self, session_id: int, user: "User", *, locale: str | None = None) -> Dict[str, Any]:
+    def delivery_package(self, session_id: int, user: "Principal", *, locale: str | None = None) -> Dict[str, Any]:
         self._load_authorized_session(session_id, user)
         return runtime.delivery_package(self.db, session_id, locale=locale)
 
+    def bootstrap_session(
+        self,
+        user: "Principal",
+        *,
+        instrument_code: str,
+        instrument_version: Optional[str] = None,
+        locale: str | None = None,
+    ) -> Tuple["AssessmentSession", SerializedDelivery]:
+        """Start a session and return it with its pre-serialized delivery payload."""
+
+        session = self.start_session(
+            user,
+            instrument_code=instrument_code,
+            instrument_version=instrument_version,
+        )
+        return session, runtime.serialized_delivery(self.db, session.id, locale=locale)
+
     def submit_full_batch(
         self,
         session_id: int,
-        user: "User",
+        user: "Principal",
         payload: SessionSubmissionPayload,
     ) -> Dict[str, Any]:
         session = self._load_authorized_session(session_id, user)
@@ -62,10 +84,31 @@ class EngineSessionService:
 
         # Fail fast before touching persistence
         validate_full_submission_payload(self.db, payload)
+        return self._persist_and_finalize(session_id, user, lambda: self._persist_batch_payload(session_id, payload))
+
+    def submit_compact_batch(
+        self,
+        session_id: int,
+        user: "Principal",
+        payload: CompactSessionSubmissionPayload,
+    ) -> Dict[str, Any]:
+        """Like ``submit_full_batch`` for permutation-coded payloads.
 
+        The schema already guarantees 12 item and 8 context permutations, so
+        no per-choice validation runs before persistence.
+        """
+
+        session = self._load_authorized_session(session_id, user)
+        if session.status == SessionStatus.completed:
+            raise SessionFinalizedError()
+        return self._persist_and_finalize(session_id, user, lambda: self._persist_compact_payload(session_id, payload))
+
+    def _persist_and_finalize(self, session_id: int, user: "Principal", persist: Callable[[], None]) -> Dict[str, Any]:
         try:
-            with self.db.begin():
-                self._persist_batch_payload(session_id, payload)
+            # The authorization lookup has already begun the request transaction;
+            # a SAVEPOINT keeps the batch atomic without a second BEGIN.
+            with self.db.begin_nested():
+                persist()
         except DomainError:
             raise
         except Exception as exc:  # pragma: no cover - defensive guard for DB errors
@@ -84,13 +127,13 @@ class EngineSessionService:
     def submit_interaction(
         self,
         session_id: int,
-        user: "User",
+        user: "Principal",
         payload: Dict[str, Any],
     ) -> None:
         self._load_authorized_session(session_id, user)
         runtime.submit_payload(self.db, session_id, payload)
 
-    def finalize_session(self, session_id: int, user: "User") -> Dict[str, Any]:
+    def finalize_session(self, session_id: int, user: "Principal") -> Dict[str, Any]:
         self._load_authorized_session(session_id, user)
         result = runtime.finalize_with_audit(
             self.db,
@@ -104,7 +147,7 @@ class EngineSessionService:
     def force_finalize(
         self,
         session_id: int,
-        mediator: "User",
+        mediator: "Principal",
         *,
         reason: Optional[str] = None,
     ) -> Dict[str, Any]:
@@ -126,12 +169,12 @@ class EngineSessionService:
         payload["override_reason"] = reason
         return payload
 
-    def build_report(self, session_id: int, viewer: "User") -> Dict[str, Any]:
+    def build_report(self, session_id: int, viewer: "Principal") -> Dict[str, Any]:
         self._load_authorized_session(session_id, viewer)
         viewer_role = "MEDIATOR" if viewer.role == "MEDIATOR" else None
         return runtime.build_report(self.db, session_id, viewer_role)
 
-    def ensure_access(self, session_id: int, user: "User") -> None:
+    def ensure_access(self, session_id: int, user: "Principal") -> None:
         """Expose access guard for routers needing pre-flight checks."""
 
         self._load_authorized_session(session_id, user)
@@ -139,7 +182,7 @@ class EngineSessionService:
     def _load_authorized_session(
         self,
         session_id: int,
-        user: "User",
+        user: "Principal",
     ) -> "AssessmentSession":
         session = self._sessions.get_with_instrument(session_id)
         if not session:
@@ -149,25 +192,56 @@ class EngineSessionService:
         return session
 
     def _persist_batch_payload(self, session_id: int, payload: SessionSubmissionPayload) -> None:
-        for item in payload.items:
-            for choice_id, rank_value in item.ranks.items():
+        items = [(item.item_id, item.ranks) for item in payload.items]
+        contexts = [
+            (ctx.context_name, {"CE": ctx.CE, "RO": ctx.RO, "AC": ctx.AC, "AE": ctx.AE})
+            for ctx in payload.contexts
+        ]
+        if settings.packed_responses_enabled:
+            ResponsePackRepository(self.db).save_submission(session_id, items=items, contexts=contexts)
+            if not settings.packed_responses_write_rows:
+                return
+        self._persist_response_rows(session_id, items, contexts)
+
+    def _persist_compact_payload(self, session_id: int, payload: CompactSessionSubmissionPayload) -> None:
+        packs = ResponsePackRepository(self.db)
+        if settings.packed_responses_enabled:
+            # Compact indices are the pack's slot encoding: store them as-is.
+            packs.save_packed(session_id, pack_slots(payload.items), pack_slots(payload.contexts))
+            if not settings.packed_responses_write_rows:
+                return
+        layout = packs.item_layout()
+        self._persist_response_rows(
+            session_id,
+            [layout.choice_ranks(slot, index) for slot, index in enumerate(payload.items)],
+            [(CONTEXT_ORDER[slot], decode_ranks(index)) for slot, index in enumerate(payload.contexts)],
+        )
+
+    def _persist_response_rows(
+        self,
+        session_id: int,
+        items: List[Tuple[int, Dict[int, int]]],
+        contexts: List[Tuple[str, Dict[str, int]]],
+    ) -> None:
+        for item_id, choice_ranks in items:
+            for choice_id, rank_value in choice_ranks.items():
                 self.db.add(
                     UserResponse(
                         session_id=session_id,
-                        item_id=item.item_id,
+                        item_id=item_id,
                         choice_id=int(choice_id),
                         rank_value=int(rank_value),
                     )
                 )
-        for ctx in payload.contexts:
+        for context_name, mode_ranks in contexts:
             self.db.add(
                 LFIContextScore(
                     session_id=session_id,
-                    context_name=ctx.context_name,
-                    CE_rank=ctx.CE,
-                    RO_rank=ctx.RO,
-                    AC_rank=ctx.AC,
-                    AE_rank=ctx.AE,
+                    context_name=context_name,
+                    CE_rank=mode_ranks["CE"],
+                    RO_rank=mode_ranks["RO"],
+                    AC_rank=mode_ranks["AC"],
+                    AE_rank=mode_ranks["AE"],
                 )
             )
 
@@ -233,4 +307,26 @@ class EngineSessionService:
         }
         if override_reason is not None:
             payload["override_reason"] = override_reason
-        return payload
\ No newline at end of file
+        return payload
+
+
+async def load_delivery_package(
+    db: AsyncSession,
+    session_id: int,
+    user: "Principal",
+    *,
+    locale: str | None = None,
+) -> SerializedDelivery:
+    """Async twin of ``EngineSessionService.delivery_package``, returning encoded bytes.
+
+    Authorization runs on native async queries; plugin item loading is sync
+    code, driven through ``run_sync`` on the same async connection, and only
+    runs when the cached payload is stale.
+    """
+
+    session = await AsyncSessionReadRepository(db).get_with_instrument(session_id)
+    if not session:
+        raise SessionNotFoundError()
+    if user.role != "MEDIATOR" and session.user_id != user.id:
+        raise PermissionDeniedError(SessionErrorMessages.ACCESS_DENIED)
+    return await db.run_sync(lambda sync_db: runtime.serialized_delivery(sync_db, session_id, locale=locale))
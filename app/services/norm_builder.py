@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.assessments.klsi_v4.logic import age_band_for
+from app.core.errors import ConflictError, ValidationError
+from app.core.metrics import metrics_registry, record_last_run
+from app.db.repositories import (
+    NormativeConversionRepository,
+    NormativeConversionRow,
+    NormativeSampleRepository,
+)
+from app.models.klsi.enums import AgeGroup
+from app.services.batch_scores import require_numpy
+
+# Raw score domains per scale; every raw value in range receives a row so the
+# table can be used without nearest-lower fallbacks. LFI raw scores are
+# ``round(LFI_score * 100)``, the key the scoring pipeline looks up.
+SCALE_RANGES: Dict[str, tuple[int, int]] = {
+    "CE": (12, 48),
+    "RO": (12, 48),
+    "AC": (12, 48),
+    "AE": (12, 48),
+    "ACCE": (-36, 36),
+    "AERO": (-36, 36),
+    "LFI": (0, 100),
+}
+DEFAULT_MIN_SAMPLE = 30
+
+
+@dataclass(frozen=True, slots=True)
+class NormSampleFilter:
+    """Cohort selection for an empirical norm build; ``None`` means unfiltered."""
+
+    kelas: Optional[str] = None
+    country: Optional[str] = None
+    age_band: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def __post_init__(self) -> None:
+        if self.age_band is not None and self.age_band not in {g.value for g in AgeGroup}:
+            raise ValidationError(detail={"age_band": self.age_band})
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValidationError(detail={"date_from": str(self.date_from), "date_to": str(self.date_to)})
+
+
+def cumulative_percentiles(values, raw_min: int, raw_max: int):
+    """Cumulative percent (share of the sample at or below each raw score).
+
+    Matches the Appendix 1 convention. ``np.searchsorted`` over the sorted
+    sample gives every raw score's rank in one vectorised call.
+    """
+
+    np_mod = require_numpy()
+    ordered = np_mod.sort(np_mod.asarray(values, dtype=np_mod.int64))
+    raws = np_mod.arange(raw_min, raw_max + 1, dtype=np_mod.int64)
+    at_or_below = np_mod.searchsorted(ordered, raws, side="right")
+    percentiles = np_mod.round(at_or_below * (100.0 / max(ordered.size, 1)), 1)
+    return raws, percentiles
+
+
+def _age_mask(dobs: List[Any], ended: List[Any], band: str):
+    np_mod = require_numpy()
+    return np_mod.fromiter(
+        (
+            dob is not None
+            and when is not None
+            and age_band_for(dob, when.date() if isinstance(when, datetime) else when) == band
+            for dob, when in zip(dobs, ended)
+        ),
+        dtype=bool,
+        count=len(dobs),
+    )
+
+
+def build_empirical_norms(
+    db: Session,
+    *,
+    norm_group: str,
+    norm_version: str,
+    sample_filter: NormSampleFilter,
+    min_sample: int = DEFAULT_MIN_SAMPLE,
+) -> Dict[str, Any]:
+    """Compute local percentile tables and store them under a new group/version.
+
+    Refuses to overwrite an existing ``(norm_group, norm_version)`` so a
+    published norm is never silently replaced; pick a new version instead.
+    LFI is built from the sessions that have a stored LFI. When there are
+    fewer than ``min_sample`` of them, no LFI rows are written and LFI
+    lookups fall through to the next provider.
+    The caller owns the transaction and cache invalidation.
+    """
+
+    np_mod = require_numpy()
+    started = perf_counter()
+    norm_repo = NormativeConversionRepository(db)
+    if norm_repo.version_exists(norm_group, norm_version):
+        raise ConflictError(detail={"norm_group": norm_group, "norm_version": norm_version})
+
+    rows = NormativeSampleRepository(db).fetch_scale_rows(
+        kelas=sample_filter.kelas,
+        country=sample_filter.country,
+        date_from=sample_filter.date_from,
+        date_to=sample_filter.date_to,
+    )
+    scales = [scale for scale in SCALE_RANGES if scale != "LFI"]
+    matrix = np_mod.asarray([row[: len(scales)] for row in rows], dtype=np_mod.int64).reshape(-1, len(scales))
+    lfi = np_mod.asarray([np_mod.nan if row[6] is None else row[6] for row in rows], dtype=np_mod.float64)
+    if sample_filter.age_band is not None and rows:
+        mask = _age_mask([row[7] for row in rows], [row[8] for row in rows], sample_filter.age_band)
+        matrix = matrix[mask]
+        lfi = lfi[mask]
+
+    sample_size = int(matrix.shape[0])
+    if sample_size < min_sample:
+        raise ValidationError(detail={"sample_size": sample_size, "min_sample": min_sample})
+
+    columns = {scale: matrix[:, idx] for idx, scale in enumerate(scales)}
+    lfi_raw = np_mod.rint(lfi[~np_mod.isnan(lfi)] * 100.0).astype(np_mod.int64)
+    if lfi_raw.size >= min_sample:
+        columns["LFI"] = lfi_raw
+
+    entries: List[NormativeConversionRow] = []
+    summary: Dict[str, Dict[str, float]] = {}
+    for scale, column in columns.items():
+        raws, percentiles = cumulative_percentiles(column, *SCALE_RANGES[scale])
+        entries.extend(
+            NormativeConversionRow(
+                norm_group=norm_group,
+                norm_version=norm_version,
+                scale_name=scale,
+                raw_score=int(raw),
+                percentile=float(pct),
+            )
+            for raw, pct in zip(raws.tolist(), percentiles.tolist())
+        )
+        summary[scale] = {
+            "mean": float(column.mean()),
+            "stdev": float(column.std(ddof=1)) if column.size > 1 else 0.0,
+        }
+    written = norm_repo.bulk_insert(entries)
+
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("norms.build", elapsed_ms)
+    record_last_run(
+        "norms.build",
+        elapsed_ms,
+        metadata={"norm_group": norm_group, "norm_version": norm_version, "sample_size": sample_size},
+    )
+    return {
+        "norm_group": norm_group,
+        "norm_version": norm_version,
+        "sample_size": sample_size,
+        "rows_written": written,
+        "lfi_sample_size": int(lfi_raw.size),
+        "scales": summary,
+    }
+
+
+__all__ = [
+    "SCALE_RANGES",
+    "NormSampleFilter",
+    "cumulative_percentiles",
+    "build_empirical_norms",
+]
@@ -0,0 +1,134 @@
+"""bcrypt hashing and verification on a dedicated, bounded process pool.
+
+A bcrypt call costs tens to hundreds of milliseconds of CPU. Running it on
+the request threadpool lets a burst of logins starve scoring requests, so
+calls go to a small ``ProcessPoolExecutor`` instead. At most ``workers +
+queue_size`` calls may be in flight; further calls are shed with
+``ServiceUnavailableError`` (503 + ``Retry-After``) rather than piling up
+on request threads.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.errors import ServiceUnavailableError
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter, metrics_registry, observe_histogram
+from app.i18n.id_messages import SecurityMessages
+
+logger = get_logger("kolb.services.password_hashing", component="services")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_QUEUE_DEPTH_BUCKETS = (0.0, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+_LATENCY_BUCKETS_MS = (25.0, 50.0, 100.0, 200.0, 400.0, 800.0, 1600.0)
+
+_T = TypeVar("_T")
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+class PasswordHasher:
+    """Runs bcrypt on ``workers`` processes (inline when ``workers`` is 0)."""
+
+    def __init__(self, workers: int, queue_size: int, retry_after_sec: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after_sec = retry_after_sec
+        self._slots = BoundedSemaphore(max(workers, 1) + queue_size)
+        self._lock = Lock()
+        self._in_flight = 0
+        self._executor: Optional[Executor] = None
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash, [(password,)])[0]
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run("verify", _verify, [(password, hashed)])[0]
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hash ``passwords`` across every worker; the batch takes one queue slot."""
+        if not passwords:
+            return []
+        return self._run("hash_many", _hash, [(password,) for password in passwords])
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forked children would inherit the parent's DB connections and threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _run(self, operation: str, func: Callable[..., _T], calls: Sequence[Tuple[Any, ...]]) -> List[_T]:
+        if not self._slots.acquire(blocking=False):
+            inc_counter("auth.password_hash.shed")
+            raise ServiceUnavailableError(
+                SecurityMessages.PASSWORD_HASHING_BUSY,
+                retry_after=self.retry_after_sec,
+            )
+        try:
+            with self._lock:
+                self._in_flight += 1
+                waiting = max(self._in_flight - max(self.workers, 1), 0)
+            observe_histogram("auth.password_hash.queue_depth", waiting, buckets=_QUEUE_DEPTH_BUCKETS)
+            started = perf_counter()
+            if self.workers <= 0:
+                results = [func(*args) for args in calls]
+            else:
+                try:
+                    pool = self._pool()
+                    futures = [pool.submit(func, *args) for args in calls]
+                    results = [future.result() for future in futures]
+                except BrokenProcessPool:
+                    logger.exception("password_hash_pool_broken", extra={"structured_data": {"operation": operation}})
+                    self.shutdown()
+                    raise ServiceUnavailableError(
+                        SecurityMessages.PASSWORD_HASHING_BUSY,
+                        retry_after=self.retry_after_sec,
+                    ) from None
+            elapsed_ms = (perf_counter() - started) * 1000.0
+            metrics_registry.record(f"auth.password_hash.{operation}", elapsed_ms)
+            observe_histogram(f"auth.password_hash.{operation}_ms", elapsed_ms, buckets=_LATENCY_BUCKETS_MS)
+            return results
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_workers,
+    settings.password_hash_queue_size,
+    settings.password_hash_retry_after_sec,
+)
+
+
+__all__ = ["PasswordHasher", "password_hasher", "pwd_context"]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hmac
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import inc_counter
+from app.models.klsi.user import User
+
+_DIRTY_KEY = "principal_user_ids"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated caller as seen by routers: just enough to authorize and audit."""
+
+    id: int
+    role: Optional[str]
+    email: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, role=user.role, email=user.email)
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    token: str
+    claims: Mapping[str, Any]
+    principal: Principal
+    expires_at: float
+
+
+class PrincipalCache:
+    """Bounded LRU of verified tokens, keyed by JWT signature.
+
+    An entry lives for ``ttl`` seconds or until the token's ``exp``,
+    whichever is sooner, and is dropped when its user's role or email
+    changes or the user is deleted. Other processes only see such changes
+    once their own entries expire.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _signature(token: str) -> str:
+        return token.rpartition(".")[2]
+
+    def get(self, token: str) -> Optional[Tuple[Mapping[str, Any], Principal]]:
+        key = self._signature(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            # The signature only vouches for the exact header and payload it was issued with.
+            if entry.expires_at <= time.monotonic() or not hmac.compare_digest(entry.token, token):
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.claims, entry.principal
+
+    def put(self, token: str, claims: Mapping[str, Any], principal: Principal) -> None:
+        if self.max_entries <= 0:
+            return
+        lifetime = self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            lifetime = min(lifetime, exp - time.time())
+        if lifetime <= 0:
+            return
+        key = self._signature(token)
+        entry = _Entry(token, MappingProxyType(dict(claims)), principal, time.monotonic() + lifetime)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> int:
+        with self._lock:
+            keys = self._by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.principal.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.principal.id]
+
+
+principal_cache = PrincipalCache(settings.auth_principal_cache_size, settings.auth_principal_cache_ttl_sec)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop cached principals of ``user_id``; call after bulk ``UPDATE``/``DELETE`` on users."""
+
+    if principal_cache.invalidate_user(user_id):
+        inc_counter("auth.principal_cache.invalidated")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session: Session, flush_context: Any) -> None:
+    changed = {
+        user.id
+        for user in session.dirty
+        if isinstance(user, User)
+        and (inspect(user).attrs.role.history.has_changes() or inspect(user).attrs.email.history.has_changes())
+    }
+    changed.update(user.id for user in session.deleted if isinstance(user, User))
+    if changed:
+        session.info.setdefault(_DIRTY_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_DIRTY_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_principals(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+__all__ = ["Principal", "PrincipalCache", "invalidate_principal", "principal_cache"]
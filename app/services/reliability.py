@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics_registry, record_last_run
+from app.db.repositories import ReliabilityRepository
+from app.models.klsi.research import ResearchStudy
+from app.services.batch_scores import require_numpy
+
+MODES: tuple[str, ...] = ("CE", "RO", "AC", "AE")
+RETEST_SCALES: tuple[str, ...] = ("CE", "RO", "AC", "AE", "ACCE", "AERO")
+# Below this many respondents/pairs the coefficients are too unstable to store.
+MIN_RESPONDENTS = 3
+
+
+def build_rank_tensor(triples: Sequence[Tuple[int, int, str, int]]):
+    """Scatter ``(session_id, item_number, mode, rank)`` rows into an array.
+
+    Returns an ``(n_sessions, n_items, 4)`` int array (mode order CE, RO, AC,
+    AE) containing only sessions that answered every style item; partially
+    answered sessions would bias item variances and are dropped.
+    """
+
+    np_mod = require_numpy()
+    if not triples:
+        return np_mod.zeros((0, 0, len(MODES)), dtype=np_mod.int64)
+    sessions, items, modes, ranks = zip(*triples)
+    session_ids, session_idx = np_mod.unique(np_mod.asarray(sessions), return_inverse=True)
+    item_numbers, item_idx = np_mod.unique(np_mod.asarray(items), return_inverse=True)
+    mode_lookup = {mode: idx for idx, mode in enumerate(MODES)}
+    mode_idx = np_mod.fromiter((mode_lookup[m] for m in modes), dtype=np_mod.int64, count=len(modes))
+
+    tensor = np_mod.zeros((session_ids.size, item_numbers.size, len(MODES)), dtype=np_mod.int64)
+    tensor[session_idx, item_idx, mode_idx] = np_mod.asarray(ranks, dtype=np_mod.int64)
+    complete = (tensor > 0).all(axis=(1, 2))
+    return tensor[complete]
+
+
+def cronbach_alpha(matrix) -> Optional[float]:
+    """Cronbach's alpha for an ``(n_respondents, k_items)`` score matrix."""
+
+    np_mod = require_numpy()
+    data = np_mod.asarray(matrix, dtype=np_mod.float64)
+    n, k = data.shape
+    if n < MIN_RESPONDENTS or k < 2:
+        return None
+    total_var = data.sum(axis=1).var(ddof=1)
+    if total_var == 0:
+        return None
+    item_var = data.var(axis=0, ddof=1).sum()
+    return float((k / (k - 1)) * (1.0 - item_var / total_var))
+
+
+def pearson(x, y) -> Optional[float]:
+    np_mod = require_numpy()
+    a = np_mod.asarray(x, dtype=np_mod.float64)
+    b = np_mod.asarray(y, dtype=np_mod.float64)
+    if a.size < MIN_RESPONDENTS:
+        return None
+    a = a - a.mean()
+    b = b - b.mean()
+    denom = np_mod.sqrt((a * a).sum() * (b * b).sum())
+    if denom == 0:
+        return None
+    return float((a * b).sum() / denom)
+
+
+def spearman_brown_split_half(matrix) -> Optional[float]:
+    """Odd/even split-half correlation stepped up with Spearman-Brown."""
+
+    np_mod = require_numpy()
+    data = np_mod.asarray(matrix, dtype=np_mod.float64)
+    if data.ndim != 2 or data.shape[1] < 2:
+        return None
+    r = pearson(data[:, 0::2].sum(axis=1), data[:, 1::2].sum(axis=1))
+    if r is None or r <= -1.0:
+        return None
+    return float(2.0 * r / (1.0 + r))
+
+
+def compute_study_reliability(
+    db: Session,
+    study: ResearchStudy,
+    *,
+    persist: bool = True,
+) -> Dict[str, Any]:
+    """Compute internal consistency and test-retest coefficients for a study.
+
+    Item ranks are read with one query and scattered into a rank tensor so
+    every coefficient is a handful of NumPy reductions. Coefficients that
+    cannot be estimated (too few respondents, zero variance) are reported as
+    ``None`` and not persisted.
+    """
+
+    np_mod = require_numpy()
+    started = perf_counter()
+    repo = ReliabilityRepository(db)
+
+    tensor = build_rank_tensor(repo.fetch_item_ranks(study))
+    metrics: Dict[str, Optional[float]] = {}
+    for idx, mode in enumerate(MODES):
+        mode_matrix = tensor[:, :, idx]
+        metrics[f"cronbach_alpha_{mode}"] = cronbach_alpha(mode_matrix)
+        metrics[f"split_half_sb_{mode}"] = spearman_brown_split_half(mode_matrix)
+
+    pairs = np_mod.asarray(repo.fetch_retest_pairs(study), dtype=np_mod.float64).reshape(
+        -1, 2 * len(RETEST_SCALES)
+    )
+    width = len(RETEST_SCALES)
+    for idx, scale in enumerate(RETEST_SCALES):
+        metrics[f"test_retest_{scale}"] = pearson(pairs[:, idx], pairs[:, width + idx])
+
+    respondents = int(tensor.shape[0])
+    retest_pairs = int(pairs.shape[0])
+    stored: List[Tuple[str, float, Optional[str]]] = []
+    for name, value in metrics.items():
+        if value is None:
+            continue
+        n = retest_pairs if name.startswith("test_retest_") else respondents
+        stored.append((name, value, f"computed; n={n}"))
+    if persist:
+        repo.replace_metrics(study.id, stored)
+
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("research.reliability.compute", elapsed_ms)
+    record_last_run(
+        "research.reliability.compute",
+        elapsed_ms,
+        metadata={"study_id": study.id, "respondents": respondents, "retest_pairs": retest_pairs},
+    )
+    return {
+        "study_id": study.id,
+        "respondents": respondents,
+        "retest_pairs": retest_pairs,
+        "metrics": metrics,
+        "persisted": len(stored) if persist else 0,
+    }
+
+
+__all__ = [
+    "build_rank_tensor",
+    "cronbach_alpha",
+    "spearman_brown_split_half",
+    "pearson",
+    "compute_study_reliability",
+]
@@ -31,6 +31,7 @@ from app.services.regression import (
 )
 from app.services.style_labels import get_style_label
 from app.db.repositories import SessionRepository
+from app.db.repositories.assessment import pack_context_scores
 from app.i18n.id_messages import (
     ReportAnalyticsMessages,
     ReportBandLabels,
@@ -310,8 +311,10 @@ def build_report(db: Session, session_id: int, viewer_role: Optional[str] = None
     enhanced_analytics = None
     if viewer_role == "MEDIATOR":
         # Retrieve LFI context scores (ordered by context_name to ensure consistency)
-        # Use eagerly loaded context scores (already limited to this session)
-        context_scores = sorted(s.lfi_context_scores, key=lambda c: c.context_name)
+        # Use eagerly loaded context scores (already limited to this session);
+        # packed sessions carry them in the eagerly loaded response pack.
+        loaded_contexts = pack_context_scores(s.response_pack) if s.response_pack else s.lfi_context_scores
+        context_scores = sorted(loaded_contexts, key=lambda c: c.context_name)
         
         # Validate exactly 8 LFI contexts before including enhanced analytics
         if len(context_scores) != 8:
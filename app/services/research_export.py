@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import inc_counter, metrics_registry, record_last_run
+from app.db.database import WORKLOAD_ANALYTICS, get_read_session
+from app.db.repositories import ResearchExportRepository, ResearchStudyRepository
+from app.models.klsi.research import ResearchStudy
+from app.services.batch_scores import require_numpy
+
+MODES: tuple[str, ...] = ("CE", "RO", "AC", "AE")
+SCORE_COLUMNS: tuple[str, ...] = ("CE", "RO", "AC", "AE", "ACCE", "AERO", "LFI", "style")
+EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "npz": "application/octet-stream",
+}
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def rank_columns(item_numbers: List[int]) -> List[str]:
+    return [f"item_{number:02d}_{mode}" for number in item_numbers for mode in MODES]
+
+
+def iter_export_records(
+    db: Session,
+    study: Optional[ResearchStudy],
+    item_numbers: List[int],
+) -> Iterator[Dict[str, Any]]:
+    """Merge the score and rank cursors into one record per session.
+
+    Both cursors are ordered by session id, so the merge is a single forward
+    pass holding at most one session's ranks in memory.
+    """
+
+    repo = ResearchExportRepository(db)
+    item_pos = {number: idx for idx, number in enumerate(item_numbers)}
+    mode_pos = {mode: idx for idx, mode in enumerate(MODES)}
+    width = len(item_numbers) * len(MODES)
+    ranks_iter = repo.iter_item_ranks(study)
+    pending = next(ranks_iter, None)
+    for score_row in repo.iter_session_scores(study):
+        session_id, end_time = score_row[0], score_row[1]
+        ranks: List[Optional[int]] = [None] * width
+        while pending is not None and pending[0] < session_id:
+            pending = next(ranks_iter, None)
+        while pending is not None and pending[0] == session_id:
+            _, item_number, mode, rank = pending
+            if item_number in item_pos:
+                ranks[item_pos[item_number] * len(MODES) + mode_pos[mode]] = rank
+            pending = next(ranks_iter, None)
+        yield {
+            "session_id": session_id,
+            "completed_at": end_time.isoformat() if end_time else None,
+            "ranks": ranks,
+            **dict(zip(SCORE_COLUMNS, score_row[2:])),
+        }
+
+
+def _csv_line(writer, buffer: io.StringIO, values: List[Any]) -> str:
+    writer.writerow(values)
+    line = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return line
+
+
+def iter_csv(records: Iterator[Dict[str, Any]], item_numbers: List[int]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    yield _csv_line(
+        writer,
+        buffer,
+        ["session_id", "completed_at", *rank_columns(item_numbers), *SCORE_COLUMNS],
+    )
+    for record in records:
+        yield _csv_line(
+            writer,
+            buffer,
+            [
+                record["session_id"],
+                record["completed_at"],
+                *record["ranks"],
+                *(record[column] for column in SCORE_COLUMNS),
+            ],
+        )
+
+
+def iter_ndjson(records: Iterator[Dict[str, Any]], item_numbers: List[int]) -> Iterator[str]:
+    columns = rank_columns(item_numbers)
+    for record in records:
+        ranks = record.pop("ranks")
+        record["ranks"] = dict(zip(columns, ranks))
+        yield json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _grown(np_mod: Any, array: Any, capacity: int, fill: Any) -> Any:
+    grown = np_mod.full((capacity, *array.shape[1:]), fill, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def iter_npz(
+    db: Session,
+    study: Optional[ResearchStudy],
+    item_numbers: List[int],
+) -> Iterator[bytes]:
+    """Yield a ``.npz`` archive holding a ``(n, items, 4)`` int8 rank tensor.
+
+    ``.npz`` members cannot be appended to, so the arrays are preallocated from
+    a count query (``int8`` ranks keep this to ~48 bytes per session) and the
+    archive is spooled to a temporary file before streaming it out in chunks.
+    Sessions completed between the count and the stream double the arrays
+    instead of being dropped.
+    """
+
+    np_mod = require_numpy()
+    repo = ResearchExportRepository(db)
+    capacity = max(repo.count_sessions(study), 1)
+    session_ids = np_mod.zeros(capacity, dtype=np_mod.int64)
+    ranks = np_mod.zeros((capacity, len(item_numbers), len(MODES)), dtype=np_mod.int8)
+    scores = np_mod.full((capacity, 7), np_mod.nan, dtype=np_mod.float64)
+    styles = np_mod.empty(capacity, dtype=object)
+    filled = 0
+    for idx, record in enumerate(iter_export_records(db, study, item_numbers)):
+        if idx == capacity:
+            capacity *= 2
+            session_ids = _grown(np_mod, session_ids, capacity, 0)
+            ranks = _grown(np_mod, ranks, capacity, 0)
+            scores = _grown(np_mod, scores, capacity, np_mod.nan)
+            styles = _grown(np_mod, styles, capacity, None)
+            inc_counter("research.export.npz_grown")
+        session_ids[idx] = record["session_id"]
+        ranks[idx] = np_mod.asarray(
+            [rank or 0 for rank in record["ranks"]], dtype=np_mod.int8
+        ).reshape(len(item_numbers), len(MODES))
+        scores[idx] = [
+            np_mod.nan if record[column] is None else record[column]
+            for column in SCORE_COLUMNS[:-1]
+        ]
+        styles[idx] = record["style"] or ""
+        filled = idx + 1
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as handle:
+        np_mod.savez_compressed(
+            handle,
+            session_id=session_ids[:filled],
+            ranks=ranks[:filled],
+            item_numbers=np_mod.asarray(item_numbers, dtype=np_mod.int16),
+            modes=np_mod.asarray(MODES),
+            scores=scores[:filled],
+            score_columns=np_mod.asarray(SCORE_COLUMNS[:-1]),
+            style=styles[:filled].astype(str),
+        )
+        handle.seek(0)
+        while True:
+            chunk = handle.read(_STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_research_export(fmt: str, *, study_id: Optional[int] = None) -> Iterator[Any]:
+    """Generator backing the export ``StreamingResponse``.
+
+    Opens its own (replica, when configured) session: the request-scoped one is
+    closed before the body is streamed.
+    """
+
+    started = perf_counter()
+    chunks = 0
+    with get_read_session(WORKLOAD_ANALYTICS) as db:
+        study = ResearchStudyRepository(db).get(study_id) if study_id is not None else None
+        item_numbers = ResearchExportRepository(db).style_item_numbers()
+        if fmt == "npz":
+            for blob in iter_npz(db, study, item_numbers):
+                chunks += 1
+                yield blob
+        else:
+            records = iter_export_records(db, study, item_numbers)
+            lines = iter_csv(records, item_numbers) if fmt == "csv" else iter_ndjson(records, item_numbers)
+            for line in lines:
+                chunks += 1
+                yield line
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    inc_counter(f"research.export.{fmt}")
+    metrics_registry.record("research.export", elapsed_ms)
+    record_last_run(
+        "research.export",
+        elapsed_ms,
+        metadata={"format": fmt, "study_id": study_id, "chunks": chunks},
+    )
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "iter_export_records",
+    "iter_csv",
+    "iter_ndjson",
+    "iter_npz",
+    "stream_research_export",
+]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter, metrics_registry, record_last_run
+from app.db.repositories import ResponsePackRepository
+
+logger = get_logger("kolb.services.response_archive", component="services")
+
+__all__ = ["archive_completed_responses"]
+
+
+def archive_completed_responses(
+    session_factory: sessionmaker[Session],
+    *,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Fold response rows of old completed sessions into packs, one transaction per batch.
+
+    Each batch of at most ``batch_size`` sessions is packed, its
+    ``user_responses`` / ``lfi_context_scores`` rows deleted and committed
+    before the next one starts, so locks and WAL growth stay bounded and an
+    interrupted run keeps the batches already done. Readers decode packs, so
+    archived sessions score, report and export as before.
+    """
+
+    days = settings.response_archive_after_days if older_than_days is None else older_than_days
+    limit = settings.response_archive_batch_size if batch_size is None else batch_size
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    totals: Dict[str, Any] = {"cutoff": cutoff, "batches": 0, "sessions": 0, "skipped": 0, "rows_deleted": 0}
+    after_id = 0
+    started = perf_counter()
+    while max_batches is None or totals["batches"] < max_batches:
+        with session_factory() as db:
+            packs = ResponsePackRepository(db)
+            session_ids = packs.archivable_session_ids(cutoff, after_id=after_id, limit=limit)
+            if not session_ids:
+                break
+            archived, skipped, deleted = packs.archive_rows(session_ids)
+            db.commit()
+        after_id = session_ids[-1]
+        totals["batches"] += 1
+        totals["sessions"] += len(archived)
+        totals["skipped"] += len(skipped)
+        totals["rows_deleted"] += deleted
+        inc_counter("responses.archive.sessions", len(archived))
+        inc_counter("responses.archive.rows_deleted", deleted)
+        if skipped:
+            inc_counter("responses.archive.skipped", len(skipped))
+            logger.warning(
+                "response_archive_skipped",
+                extra={"structured_data": {"session_ids": skipped, "reason": "invalid_rankings"}},
+            )
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("responses.archive", elapsed_ms)
+    record_last_run(
+        "responses.archive",
+        elapsed_ms,
+        metadata={key: value for key, value in totals.items() if key != "cutoff"},
+    )
+    logger.info("response_archive_complete", extra={"structured_data": {**totals, "cutoff": cutoff.isoformat()}})
+    return totals
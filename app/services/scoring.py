@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any, Dict
 
 from sqlalchemy.orm import Session
@@ -29,6 +30,7 @@ from app.models.klsi.assessment import AssessmentSession
 from app.models.klsi.enums import SessionStatus
 from app.models.klsi.learning import CombinationScore, ScaleScore, UserLearningStyle
 from app.i18n.id_messages import SessionErrorMessages
+from app.services.class_stats import record_completed_session
 
 
 logger = get_logger("kolb.services.scoring", component="services")
@@ -166,11 +168,21 @@ def finalize_session(db: Session, session_id: int, *, skip_checks: bool = False)
     # Persist longitudinal deltas if available
     combo_entity = ctx["combination"]["entity"]
     lfi_entity = ctx["lfi"]["entity"]
+    style_entity = ctx["style"]["entity"]
+    # Runtime stamps end_time right after this returns; use the same UTC day.
+    record_completed_session(
+        db,
+        user_id=session.user_id,
+        acce=combo_entity.ACCE_raw,
+        aero=combo_entity.AERO_raw,
+        style_type_id=style_entity.primary_style_type_id,
+        completed_on=datetime.now(timezone.utc).date(),
+    )
     return {
         "ok": True,
         "scale": ctx["raw_modes"]["entity"],
         "combination": combo_entity,
-        "style": ctx["style"]["entity"],
+        "style": style_entity,
         "lfi": lfi_entity,
         "percentiles": ctx["percentiles"]["entity"],
         "delta": ctx.get("delta"),
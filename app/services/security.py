@@ -3,22 +3,25 @@ from typing import Optional
 
 from fastapi import Header, HTTPException
 from jose import jwt, JWTError
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.repositories import UserRepository
+from app.core.metrics import inc_counter
+from app.db.repositories import AsyncUserReadRepository, UserRepository
 from app.i18n.id_messages import SecurityMessages
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.password_hashing import password_hasher
+from app.services.principals import Principal, principal_cache
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    """bcrypt-hash ``password`` on the password hashing pool (may raise 503)."""
+    return password_hasher.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    """Check ``password`` against a bcrypt hash on the password hashing pool (may raise 503)."""
+    return password_hasher.verify(password, hashed)
 
 
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
@@ -106,7 +109,39 @@ def decode_access_token(token: str) -> dict:
         raise ValueError(SecurityMessages.TOKEN_VALIDATION_FAILED.format(detail=str(e)))
 
 
-def get_current_user(authorization: str | None = Header(default=None), db: Session | None = None):
+def _bearer_token(authorization: str | None) -> str:
+    """Validate the Bearer header format and return the raw token."""
+    if not authorization:
+        raise HTTPException(status_code=401, detail=SecurityMessages.MISSING_AUTH_HEADER)
+    
+    parts = authorization.split(" ")
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        raise HTTPException(status_code=401, detail=SecurityMessages.INVALID_AUTH_HEADER)
+    
+    return parts[1]
+
+
+def _user_id_from_token(token: str) -> tuple[dict, int]:
+    """Verify ``token`` and return its claims with the subject as a user id."""
+    try:
+        payload = decode_access_token(token)
+        return payload, int(payload["sub"])
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except (KeyError, TypeError):
+        raise HTTPException(status_code=401, detail=SecurityMessages.INVALID_TOKEN_PAYLOAD)
+
+
+def _cached_principal(token: str) -> Principal | None:
+    cached = principal_cache.get(token)
+    if cached is None:
+        inc_counter("auth.principal_cache.miss")
+        return None
+    inc_counter("auth.principal_cache.hit")
+    return cached[1]
+
+
+def get_current_user(authorization: str | None = Header(default=None), db: Session | None = None) -> Principal:
     """FastAPI dependency for extracting and validating current user from JWT.
     
     Args:
@@ -114,38 +149,29 @@ def get_current_user(authorization: str | None = Header(default=None), db: Sessi
         db: Database session for user lookup
     
     Returns:
-        User object if authentication successful
+        ``Principal`` (id, role, email) of the authenticated user
     
     Raises:
         HTTPException 401: If token is missing, invalid, or user not found
     
     Usage:
         @router.get("/protected")
-        def protected_route(current_user: User = Depends(get_current_user)):
+        def protected_route(current_user: Principal = Depends(get_current_user)):
             return {"user_id": current_user.id}
     
     Security:
         - Validates Bearer token format
         - Verifies all JWT claims (exp, nbf, iss, aud)
         - Ensures user exists in database
+        - Tokens verified within ``auth_principal_cache_ttl_sec`` skip both
+          the signature check and the user lookup (see ``app.services.principals``)
     """
-    if not authorization:
-        raise HTTPException(status_code=401, detail=SecurityMessages.MISSING_AUTH_HEADER)
-    
-    parts = authorization.split(" ")
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(status_code=401, detail=SecurityMessages.INVALID_AUTH_HEADER)
-    
-    token = parts[1]
-    
-    try:
-        payload = decode_access_token(token)
-        user_id = int(payload["sub"])
-    except ValueError as e:
-        raise HTTPException(status_code=401, detail=str(e))
-    except (KeyError, TypeError):
-        raise HTTPException(status_code=401, detail=SecurityMessages.INVALID_TOKEN_PAYLOAD)
-    
+    token = _bearer_token(authorization)
+    principal = _cached_principal(token)
+    if principal is not None:
+        return principal
+
+    claims, user_id = _user_id_from_token(token)
     if not db:
         raise HTTPException(status_code=500, detail=SecurityMessages.DB_SESSION_REQUIRED)
 
@@ -154,4 +180,22 @@ def get_current_user(authorization: str | None = Header(default=None), db: Sessi
     if not user:
         raise HTTPException(status_code=401, detail=SecurityMessages.USER_NOT_FOUND)
     
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(token, claims, principal)
+    return principal
+
+
+async def get_current_user_async(authorization: str | None, db: AsyncSession) -> Principal:
+    """Async variant of ``get_current_user`` for routes on ``AsyncSession``."""
+    token = _bearer_token(authorization)
+    principal = _cached_principal(token)
+    if principal is not None:
+        return principal
+
+    claims, user_id = _user_id_from_token(token)
+    user = await AsyncUserReadRepository(db).get(user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail=SecurityMessages.USER_NOT_FOUND)
+    principal = Principal.from_user(user)
+    principal_cache.put(token, claims, principal)
+    return principal
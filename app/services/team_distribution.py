@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import date
+from time import perf_counter
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics_registry, observe_histogram
+from app.db.repositories import TeamAnalyticsRepository
+from app.services.batch_scores import require_numpy
+
+# Each mode sums 12 forced-choice ranks of 1..4, so raw totals span 12..48 and
+# the dialectics (AC-CE, AE-RO) span -36..36.
+MODE_RANGE: tuple[int, int] = (12, 48)
+DIALECTIC_RANGE: tuple[int, int] = (-36, 36)
+LFI_QUANTILES: tuple[float, ...] = (0.1, 0.25, 0.5, 0.75, 0.9)
+MODE_COLUMNS: tuple[str, ...] = ("CE", "RO", "AC", "AE")
+
+
+def _load_matrix(chunks):
+    np_mod = require_numpy()
+    arrays = [np_mod.asarray(chunk, dtype=np_mod.float64) for chunk in chunks if chunk]
+    if not arrays:
+        return np_mod.empty((0, 7), dtype=np_mod.float64)
+    return np_mod.concatenate(arrays, axis=0)
+
+
+def _edges(bounds: tuple[int, int], width: int):
+    np_mod = require_numpy()
+    low, high = bounds
+    # The last bin is closed in np.histogram, so the maximum score always lands
+    # inside the final bin regardless of width.
+    bins = (high - low) // width + 1
+    return low + width * np_mod.arange(bins + 1, dtype=np_mod.float64)
+
+
+def summarize_score_matrix(
+    matrix,
+    *,
+    mode_bin_width: int = 1,
+    grid_bin_width: int = 6,
+    quantiles: Sequence[float] = LFI_QUANTILES,
+) -> Dict[str, Any]:
+    """Vectorised distribution summary for an ``(n, 7)`` score matrix.
+
+    Columns are ordered ``CE, RO, AC, AE, ACCE, AERO, LFI``; missing LFI values
+    are ``NaN`` and excluded from the quantiles.
+    """
+
+    np_mod = require_numpy()
+    data = np_mod.asarray(matrix, dtype=np_mod.float64).reshape(-1, 7)
+    total = int(data.shape[0])
+
+    mode_edges = _edges(MODE_RANGE, mode_bin_width)
+    modes: Dict[str, Any] = {}
+    for idx, name in enumerate(MODE_COLUMNS):
+        column = data[:, idx]
+        counts, _ = np_mod.histogram(column, bins=mode_edges)
+        modes[name] = {
+            "edges": mode_edges.astype(int).tolist(),
+            "counts": counts.astype(int).tolist(),
+            "mean": float(column.mean()) if total else None,
+            "std": float(column.std()) if total else None,
+        }
+
+    lfi = data[:, 6]
+    lfi = lfi[~np_mod.isnan(lfi)]
+    lfi_quantiles: Dict[str, Optional[float]]
+    if lfi.size:
+        values = np_mod.quantile(lfi, np_mod.asarray(quantiles, dtype=np_mod.float64))
+        lfi_quantiles = {f"p{int(round(q * 100))}": float(v) for q, v in zip(quantiles, values)}
+    else:
+        lfi_quantiles = {f"p{int(round(q * 100))}": None for q in quantiles}
+
+    grid_edges = _edges(DIALECTIC_RANGE, grid_bin_width)
+    grid, _, _ = np_mod.histogram2d(data[:, 4], data[:, 5], bins=(grid_edges, grid_edges))
+    return {
+        "total_sessions": total,
+        "modes": modes,
+        "lfi": {
+            "count": int(lfi.size),
+            "mean": float(lfi.mean()) if lfi.size else None,
+            "quantiles": lfi_quantiles,
+        },
+        "acce_aero_grid": {
+            "acce_edges": grid_edges.astype(int).tolist(),
+            "aero_edges": grid_edges.astype(int).tolist(),
+            "counts": grid.astype(int).tolist(),
+        },
+    }
+
+
+def compute_team_distribution(
+    db: Session,
+    team_id: int,
+    *,
+    for_date: Optional[date] = None,
+    mode_bin_width: int = 1,
+    grid_bin_width: int = 6,
+) -> Dict[str, Any]:
+    """Histogram, LFI quantile and ACCE/AERO density view for a team.
+
+    Score columns for every completed member session are pulled with one Core
+    query and summarised in NumPy; no ORM entities are loaded.
+    """
+
+    started = perf_counter()
+    repo = TeamAnalyticsRepository(db)
+    matrix = _load_matrix(repo.iter_score_columns(team_id, for_date))
+    summary = summarize_score_matrix(
+        matrix,
+        mode_bin_width=mode_bin_width,
+        grid_bin_width=grid_bin_width,
+    )
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("teams.distribution", elapsed_ms)
+    observe_histogram("teams.distribution.sessions", float(summary["total_sessions"]))
+    return {"team_id": team_id, "for_date": for_date, **summary}
+
+
+__all__ = [
+    "MODE_RANGE",
+    "DIALECTIC_RANGE",
+    "LFI_QUANTILES",
+    "summarize_score_matrix",
+    "compute_team_distribution",
+]
@@ -0,0 +1,225 @@
+"""Bulk user provisioning from CSV or NDJSON uploads.
+
+Rows are handled in chunks: validated with the same rules as
+``/auth/register``, checked against existing emails and teams with one query
+each, passwords hashed in parallel on a process pool, and users plus
+``team_members`` written with multi-row inserts and one commit per chunk.
+Results are yielded per row as each chunk commits, so callers can stream them.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from dataclasses import asdict, dataclass
+from io import StringIO
+from itertools import islice
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import inc_counter, metrics_registry, record_last_run
+from app.db.repositories import TeamMemberRepository, TeamRepository, UserRepository
+from app.i18n.id_messages import AuthMessages, ProvisioningMessages
+from app.schemas.auth import Role, UserProvisionRow
+from app.services.password_hashing import PasswordHasher
+
+logger = get_logger("kolb.services.user_provisioning", component="services")
+
+PROVISION_FORMATS = ("csv", "ndjson")
+
+_KELAS_PATTERN = re.compile(r"IF-\d+")
+
+ParsedRow = Tuple[int, Union[UserProvisionRow, str]]
+
+
+@dataclass(slots=True)
+class ProvisionResult:
+    """Outcome of one input row: ``created``, ``exists``, ``invalid`` or ``conflict``."""
+
+    line: int
+    status: str
+    email: Optional[str] = None
+    user_id: Optional[int] = None
+    team_id: Optional[int] = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def registration_role(email: str, nim: str | None, kelas: str | None, tahun_masuk: int | None) -> Role:
+    """Role implied by ``email``'s domain, after the student field checks.
+
+    Raises:
+        ValueError: With the ``AuthMessages`` text of the first failed rule.
+    """
+
+    domain = email.split("@")[-1].lower()
+    if domain != settings.allowed_student_domain and nim:
+        # Jika mendaftar sebagai mahasiswa (mengisi NIM), wajib domain mahasiswa
+        raise ValueError(AuthMessages.INVALID_STUDENT_DOMAIN)
+    role = Role.MAHASISWA if domain == settings.allowed_student_domain else Role.MEDIATOR
+    if role == Role.MAHASISWA:
+        if not nim or len(nim) != 8 or not nim.isdigit():
+            raise ValueError(AuthMessages.INVALID_NIM)
+        if not kelas or not _KELAS_PATTERN.fullmatch(kelas):
+            raise ValueError(AuthMessages.INVALID_CLASS_FORMAT)
+        if not tahun_masuk or tahun_masuk < 1990 or tahun_masuk > 2100:
+            raise ValueError(AuthMessages.INVALID_ENROLLMENT_YEAR)
+    return role
+
+
+def _parse_row(raw: Dict[str, Any]) -> Union[UserProvisionRow, str]:
+    try:
+        return UserProvisionRow.model_validate({key: value for key, value in raw.items() if value not in ("", None)})
+    except PydanticValidationError as exc:
+        return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors())
+
+
+def parse_provision_rows(fmt: str, text: str) -> Iterator[ParsedRow]:
+    """Yield ``(line, row or error message)`` for each record in ``text``."""
+
+    if fmt == "csv":
+        reader = csv.DictReader(StringIO(text))
+        for raw in reader:
+            yield reader.line_num, _parse_row(raw)
+        return
+    for line, payload in enumerate(text.splitlines(), start=1):
+        if not payload.strip():
+            continue
+        try:
+            raw = json.loads(payload)
+        except json.JSONDecodeError as exc:
+            yield line, ProvisioningMessages.INVALID_JSON.format(detail=exc.msg)
+            continue
+        yield line, _parse_row(raw) if isinstance(raw, dict) else ProvisioningMessages.INVALID_JSON.format(detail="object expected")
+
+
+def _provision_chunk(
+    db: Session,
+    chunk: List[ParsedRow],
+    seen: set[str],
+    hasher: PasswordHasher,
+) -> List[ProvisionResult]:
+    results: Dict[int, ProvisionResult] = {}
+    pending: List[Tuple[int, UserProvisionRow, Role]] = []
+    for line, row in chunk:
+        if isinstance(row, str):
+            results[line] = ProvisionResult(line, "invalid", error=row)
+            continue
+        try:
+            role = registration_role(row.email, row.nim, row.kelas, row.tahun_masuk)
+        except ValueError as exc:
+            results[line] = ProvisionResult(line, "invalid", email=row.email, error=str(exc))
+            continue
+        if row.email in seen:
+            results[line] = ProvisionResult(line, "invalid", email=row.email, error=ProvisioningMessages.DUPLICATE_EMAIL)
+            continue
+        seen.add(row.email)
+        pending.append((line, row, role))
+
+    users = UserRepository(db)
+    existing = users.existing_emails([row.email for _, row, _ in pending])
+    team_ids = TeamRepository(db).ids_by_name(sorted({row.team for _, row, _ in pending if row.team}))
+    to_insert: List[Tuple[int, UserProvisionRow, Role]] = []
+    for line, row, role in pending:
+        if row.email in existing:
+            results[line] = ProvisionResult(line, "exists", email=row.email)
+        elif row.team and row.team not in team_ids:
+            results[line] = ProvisionResult(
+                line, "invalid", email=row.email, error=ProvisioningMessages.TEAM_NOT_FOUND.format(team=row.team)
+            )
+        else:
+            to_insert.append((line, row, role))
+
+    hashes = iter(hasher.hash_many([row.password for _, row, _ in to_insert if row.password]))
+    user_rows = [
+        {
+            "full_name": row.full_name,
+            "email": row.email,
+            "password_hash": next(hashes) if row.password else None,
+            "role": role.value,
+            "nim": row.nim if role == Role.MAHASISWA else None,
+            "kelas": row.kelas if role == Role.MAHASISWA else None,
+            "tahun_masuk": row.tahun_masuk if role == Role.MAHASISWA else None,
+        }
+        for _, row, role in to_insert
+    ]
+    try:
+        user_ids = users.insert_many(user_rows)
+        TeamMemberRepository(db).insert_many(
+            [
+                {"team_id": team_ids[row.team], "user_id": user_ids[row.email], "role_in_team": row.role_in_team}
+                for _, row, _ in to_insert
+                if row.team
+            ]
+        )
+        db.commit()
+    except IntegrityError as exc:
+        # A concurrent registration took one of the emails; nothing in this chunk was written.
+        db.rollback()
+        logger.warning(
+            "user_provision_chunk_conflict",
+            extra={"structured_data": {"rows": len(to_insert), "error": str(exc.orig)}},
+        )
+        for line, row, _ in to_insert:
+            results[line] = ProvisionResult(line, "conflict", email=row.email, error=ProvisioningMessages.CHUNK_CONFLICT)
+    else:
+        for line, row, _ in to_insert:
+            results[line] = ProvisionResult(
+                line,
+                "created",
+                email=row.email,
+                user_id=user_ids[row.email],
+                team_id=team_ids.get(row.team) if row.team else None,
+            )
+    return [results[line] for line, _ in chunk]
+
+
+def provision_users(
+    session_factory: sessionmaker[Session],
+    rows: Iterable[ParsedRow],
+    *,
+    hasher: PasswordHasher,
+    chunk_size: Optional[int] = None,
+) -> Iterator[ProvisionResult]:
+    """Create users (and team memberships) from parsed rows, one transaction per chunk.
+
+    Existing emails are reported as ``exists`` and left untouched, so an
+    interrupted upload can be re-run as is.
+    """
+
+    size = chunk_size or settings.user_provision_chunk_size
+    totals = {"created": 0, "exists": 0, "invalid": 0, "conflict": 0}
+    seen: set[str] = set()
+    started = perf_counter()
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        with session_factory() as db:
+            results = _provision_chunk(db, chunk, seen, hasher)
+        for result in results:
+            totals[result.status] += 1
+            yield result
+    for status, count in totals.items():
+        if count:
+            inc_counter(f"users.provision.{status}", count)
+    elapsed_ms = (perf_counter() - started) * 1000.0
+    metrics_registry.record("users.provision", elapsed_ms)
+    record_last_run("users.provision", elapsed_ms, metadata=totals)
+    logger.info("user_provision_complete", extra={"structured_data": {**totals, "duration_ms": elapsed_ms}})
+
+
+__all__ = [
+    "PROVISION_FORMATS",
+    "ProvisionResult",
+    "parse_provision_rows",
+    "provision_users",
+    "registration_role",
+]
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.assessments.klsi_v4.logic import CONTEXT_NAMES, validate_lfi_context_ranks
 from app.core.errors import InvalidAssessmentData
+from app.core.metrics import inc_counter
 from app.db.repositories import (
     AssessmentItemRepository,
     LFIContextRepository,
     SessionRepository,
     UserResponseRepository,
 )
+from app.engine.interfaces import AssessmentDefinition, ValidationIssue
+from app.models.klsi.items import SessionResponsePack, UserResponse
+from app.models.klsi.learning import LFIContextScore
 from app.schemas.session import SessionSubmissionPayload
 from app.i18n.id_messages import (
     SessionErrorMessages,
@@ -213,6 +223,126 @@ def run_session_validations(db: Session, session_id: int) -> Dict[str, Any]:
     }
 
 
+_RESPONSE_REVISIONS_KEY = "response_revisions"
+_RESPONSE_MODELS = (UserResponse, LFIContextScore, SessionResponsePack)
+
+
+def response_revision(db: Session, session_id: int) -> int:
+    """How many flushes of ``db`` have changed ``session_id``'s responses."""
+
+    return db.info.get(_RESPONSE_REVISIONS_KEY, {}).get(session_id, 0)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_response_revisions(session: Session, flush_context: Any) -> None:
+    changed = {
+        instance.session_id
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(instance, _RESPONSE_MODELS)
+    }
+    if changed:
+        revisions = session.info.setdefault(_RESPONSE_REVISIONS_KEY, {})
+        for session_id in changed:
+            revisions[session_id] = revisions.get(session_id, 0) + 1
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationSnapshot:
+    """Validation outcome of one session, taken once per finalize request.
+
+    ``revision`` is the session's ``response_revision`` when it was taken;
+    a later response write in the same database session makes it stale.
+    ``rule_issues`` holds the results of the rules of the definition named
+    by ``rules_of``; both are ``None`` when no definition was resolved.
+    """
+
+    session_id: int
+    revision: int
+    report: Mapping[str, Any]
+    rules_of: Optional[Tuple[str, str]] = None
+    rule_issues: Optional[Tuple[ValidationIssue, ...]] = None
+
+    def rule_issues_for(self, definition: AssessmentDefinition) -> Optional[List[ValidationIssue]]:
+        """``definition``'s rule results, or ``None`` if they were not evaluated here."""
+
+        if self.rule_issues is None or self.rules_of != (definition.id, definition.version):
+            return None
+        return list(self.rule_issues)
+
+    def is_current(self, db: Session) -> bool:
+        """Whether no response of the session was written through ``db`` since."""
+
+        return self.revision == response_revision(db, self.session_id)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.report.get("ready", False))
+
+    @property
+    def completeness(self) -> Dict[str, Any]:
+        """The ``check_session_complete`` result embedded in the report."""
+
+        diagnostics = self.report.get("diagnostics") or {}
+        return deepcopy(diagnostics.get("items", diagnostics))
+
+    def as_report(self) -> Dict[str, Any]:
+        """A mutable copy of the ``run_session_validations`` result."""
+
+        return deepcopy(dict(self.report))
+
+
+def take_validation_snapshot(
+    db: Session,
+    session_id: int,
+    *,
+    definition: Optional[AssessmentDefinition] = None,
+) -> ValidationSnapshot:
+    """Run the session validations (and ``definition``'s rules) once."""
+
+    revision = response_revision(db, session_id)
+    report = run_session_validations(db, session_id)
+    rules_of: Optional[Tuple[str, str]] = None
+    rule_issues: Optional[Tuple[ValidationIssue, ...]] = None
+    if definition is not None:
+        rules_of = (definition.id, definition.version)
+        rule_issues = tuple(issue for rule in definition.validation_rules() for issue in rule.validate(db, session_id))
+    inc_counter("validation.snapshot.taken")
+    return ValidationSnapshot(
+        session_id=session_id,
+        revision=revision,
+        report=MappingProxyType(report),
+        rules_of=rules_of,
+        rule_issues=rule_issues,
+    )
+
+
+_ACTIVE_SNAPSHOT: ContextVar[Optional[ValidationSnapshot]] = ContextVar("validation_snapshot", default=None)
+
+
+@contextmanager
+def validation_scope(snapshot: Optional[ValidationSnapshot]) -> Iterator[None]:
+    """Make ``snapshot`` available to ``reusable_validation`` for the enclosed finalize."""
+
+    token = _ACTIVE_SNAPSHOT.set(snapshot)
+    try:
+        yield
+    finally:
+        _ACTIVE_SNAPSHOT.reset(token)
+
+
+def reusable_validation(db: Session, session_id: int) -> Optional[ValidationSnapshot]:
+    """The snapshot taken earlier in this finalize for ``session_id``, if still current."""
+
+    snapshot = _ACTIVE_SNAPSHOT.get()
+    if snapshot is None or snapshot.session_id != session_id:
+        return None
+    if not snapshot.is_current(db):
+        inc_counter("validation.snapshot.stale")
+        return None
+    inc_counter("validation.snapshot.reused")
+    return snapshot
+
+
 def validate_full_submission_payload(db: Session, payload: SessionSubmissionPayload) -> None:
     """Fail-fast validation for batch submissions before persistence."""
 
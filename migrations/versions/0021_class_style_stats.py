@@ -0,0 +1,67 @@
+"""portable class style stats aggregate + concurrent MV refresh index
+
+Adds ``class_style_stats``, a dialect-neutral table with the same grain as the
+PostgreSQL-only ``mv_class_style_stats`` view (kelas, date, ACCE/AERO bands,
+primary style). It is maintained incrementally on finalize; populate existing
+data with ``POST /analytics/class-stats/rebuild`` after upgrading.
+
+On PostgreSQL a unique index is added to the materialized view so it can be
+refreshed with ``REFRESH MATERIALIZED VIEW CONCURRENTLY``.
+
+Revision ID: 0021_class_style_stats
+Revises: 15984cc3761d
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0021_class_style_stats"
+down_revision = "15984cc3761d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "class_style_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kelas", sa.String(length=20), nullable=True),
+        sa.Column("stat_date", sa.Date(), nullable=False),
+        sa.Column("acce_band", sa.String(length=4), nullable=False),
+        sa.Column("aero_band", sa.String(length=4), nullable=False),
+        sa.Column("style_name", sa.String(length=50), nullable=True),
+        sa.Column("session_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "kelas",
+            "stat_date",
+            "acce_band",
+            "aero_band",
+            "style_name",
+            name="uq_class_style_stats_grain",
+        ),
+    )
+    op.create_index(
+        "ix_class_style_stats_kelas_date",
+        "class_style_stats",
+        ["kelas", "stat_date"],
+        unique=False,
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            sa.text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_class_style_stats_grain "
+                "ON mv_class_style_stats (kelas, date, acce_raw, aero_raw, style_name)"
+            )
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(sa.text("DROP INDEX IF EXISTS ux_mv_class_style_stats_grain"))
+    op.drop_index("ix_class_style_stats_kelas_date", table_name="class_style_stats")
+    op.drop_table("class_style_stats")
@@ -0,0 +1,40 @@
+"""packed per-session response storage
+
+Adds ``session_response_packs``: one row per session holding the 12 item
+rankings and 8 LFI context rankings as permutation indices (12 + 8 bytes).
+Existing sessions keep their ``user_responses`` / ``lfi_context_scores`` rows
+and are read from them; new batch submissions write the pack.
+
+Revision ID: 0022_session_response_packs
+Revises: 0021_class_style_stats
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0022_session_response_packs"
+down_revision = "0021_class_style_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "session_response_packs",
+        sa.Column(
+            "session_id",
+            sa.Integer(),
+            sa.ForeignKey("assessment_sessions.id"),
+            primary_key=True,
+        ),
+        sa.Column("item_ranks", sa.LargeBinary(length=12), nullable=False),
+        sa.Column("context_ranks", sa.LargeBinary(length=8), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("session_response_packs")
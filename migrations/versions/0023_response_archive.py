@@ -0,0 +1,29 @@
+"""archival of completed sessions' response rows
+
+Adds ``session_response_packs.archived_at``, set by the archival job
+(``scripts/archive_responses.py``) when it folds a completed session's
+``user_responses`` / ``lfi_context_scores`` rows into its pack and deletes
+them.
+
+Revision ID: 0023_response_archive
+Revises: 0022_session_response_packs
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0023_response_archive"
+down_revision = "0022_session_response_packs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("session_response_packs", sa.Column("archived_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("session_response_packs", "archived_at")
@@ -0,0 +1,34 @@
+import argparse
+
+from app.db.database import WORKLOAD_ADMIN, get_workload_gateway
+from app.services.response_archive import archive_completed_responses
+
+"""
+CLI usage:
+python -m scripts.archive_responses [--older-than-days 90] [--batch-size 200] [--max-batches N]
+Folds user_responses / lfi_context_scores rows of completed sessions older than
+the cutoff into session_response_packs and deletes them, one transaction per batch.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scripts.archive_responses")
+    parser.add_argument("--older-than-days", type=int)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--max-batches", type=int)
+    args = parser.parse_args()
+
+    result = archive_completed_responses(
+        get_workload_gateway(WORKLOAD_ADMIN).session_factory,
+        older_than_days=args.older_than_days,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+    )
+    print(
+        f"Archived {result['sessions']} sessions ({result['rows_deleted']} rows deleted, "
+        f"{result['skipped']} skipped) in {result['batches']} batches; cutoff {result['cutoff'].isoformat()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
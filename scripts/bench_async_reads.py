@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+
+"""
+CLI usage:
+python -m scripts.bench_async_reads [--requests 2000] [--concurrency 200] [--threads 40] [--rollups 30]
+Compares latency of the async ``/teams/{id}/rollups`` route against a sync
+twin of the same query at high concurrency. The sync twin runs on the AnyIO
+threadpool (``--threads`` workers, AnyIO's default is 40); the async route
+does not use it. Uses a throwaway SQLite database unless DATABASE_URL is
+already set.
+"""
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _drive(client, path: str, total: int, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            started = perf_counter()
+            response = await client.get(path)
+            latencies.append((perf_counter() - started) * 1000.0)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def _run(args) -> None:
+    import anyio.to_thread
+    import httpx
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+
+    from app.db.database import Base, SessionLocal, engine, get_read_db
+    from app.db.repositories import TeamRollupRepository
+    from app.main import app
+    from app.models.klsi.team import Team, TeamAssessmentRollup
+    from app.schemas.team import TeamRollupOut
+
+    logging.disable(logging.INFO)  # per-request access/driver logs would dominate the timings
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        team = Team(name=f"bench-{os.getpid()}")
+        db.add(team)
+        db.flush()
+        db.add_all(
+            TeamAssessmentRollup(
+                team_id=team.id,
+                date=date(2030, 1, 1) + timedelta(days=offset),
+                total_sessions=offset,
+                avg_lfi=0.5,
+                style_counts={"Initiating": offset},
+            )
+            for offset in range(args.rollups)
+        )
+        db.commit()
+        team_id = team.id
+
+    # Serialised inside the endpoint: with ``response_model`` FastAPI validates
+    # sync responses on a second threadpool hop while the connection is still
+    # checked out, which deadlocks once in-flight requests exceed the pool.
+    @app.get("/_bench/teams/{team_id}/rollups-sync", include_in_schema=False)
+    def rollups_sync(team_id: int, db: Session = Depends(get_read_db)):
+        rows = TeamRollupRepository(db).list_by_team(team_id)
+        return [TeamRollupOut.model_validate(row).model_dump(mode="json") for row in rows]
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        paths = {
+            "sync (threadpool)": f"/_bench/teams/{team_id}/rollups-sync",
+            "async": f"/teams/{team_id}/rollups",
+        }
+        for path in paths.values():  # warm-up: engines, caches, first connections
+            await _drive(client, path, min(args.concurrency, 50), args.concurrency)
+        print(
+            f"requests={args.requests} concurrency={args.concurrency} threads={args.threads} rollups={args.rollups}"
+        )
+        print(f"{'variant':<20}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+        for label, path in paths.items():
+            started = perf_counter()
+            latencies = await _drive(client, path, args.requests, args.concurrency)
+            elapsed = perf_counter() - started
+            print(
+                f"{label:<20}{_percentile(latencies, 50):>10.2f}{_percentile(latencies, 90):>10.2f}"
+                f"{_percentile(latencies, 99):>10.2f}{args.requests / elapsed:>10.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench_async_reads")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="AnyIO threadpool size for sync routes")
+    parser.add_argument("--rollups", type=int, default=30, help="Rollup rows seeded for the benchmark team")
+    args = parser.parse_args()
+    if args.requests < 1 or args.concurrency < 1 or args.threads < 1:
+        parser.error("--requests, --concurrency and --threads must be positive")
+
+    workdir = None
+    if "DATABASE_URL" not in os.environ:
+        workdir = tempfile.TemporaryDirectory(prefix="klsi-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir.name) / 'bench.db'}"
+    try:
+        asyncio.run(_run(args))
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
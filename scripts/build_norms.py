@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+from datetime import date
+from hashlib import sha256
+
+from app.core.errors import DomainError
+from app.db.database import WORKLOAD_ADMIN, transactional_session
+from app.models.klsi.audit import AuditLog
+from app.services.norm_builder import DEFAULT_MIN_SAMPLE, NormSampleFilter, build_empirical_norms
+
+"""
+CLI usage:
+python -m scripts.build_norms <norm_group> <norm_version> [--kelas IF-1] [--country Indonesia]
+    [--age-band 19-24] [--date-from 2025-01-01] [--date-to 2025-12-31] [--min-sample 30]
+Builds empirical percentile tables from completed sessions and writes them to
+normative_conversion_table under a new (norm_group, norm_version).
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scripts.build_norms")
+    parser.add_argument("norm_group")
+    parser.add_argument("norm_version")
+    parser.add_argument("--kelas")
+    parser.add_argument("--country")
+    parser.add_argument("--age-band")
+    parser.add_argument("--date-from", type=date.fromisoformat)
+    parser.add_argument("--date-to", type=date.fromisoformat)
+    parser.add_argument("--min-sample", type=int, default=DEFAULT_MIN_SAMPLE)
+    args = parser.parse_args()
+
+    try:
+        sample_filter = NormSampleFilter(
+            kelas=args.kelas,
+            country=args.country,
+            age_band=args.age_band,
+            date_from=args.date_from,
+            date_to=args.date_to,
+        )
+        with transactional_session(WORKLOAD_ADMIN) as db:
+            result = build_empirical_norms(
+                db,
+                norm_group=args.norm_group,
+                norm_version=args.norm_version,
+                sample_filter=sample_filter,
+                min_sample=args.min_sample,
+            )
+            payload_hash = sha256(json.dumps(vars(args), default=str, sort_keys=True).encode("utf-8")).hexdigest()
+            db.add(
+                AuditLog(
+                    actor="system",
+                    action=f"norm_build:{args.norm_group}:{args.norm_version}",
+                    payload_hash=payload_hash,
+                )
+            )
+    except DomainError as exc:
+        print(f"{exc.message}: {exc.detail}")
+        sys.exit(2)
+    print(
+        f"Built {result['rows_written']} rows from {result['sample_size']} sessions "
+        f"for norm_group={args.norm_group} version={args.norm_version}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.database import WORKLOAD_ADMIN, get_workload_gateway
+from app.services.password_hashing import PasswordHasher
+from app.services.user_provisioning import PROVISION_FORMATS, parse_provision_rows, provision_users
+
+"""
+CLI usage:
+python -m scripts.provision_users users.csv [--format csv|ndjson] [--chunk-size 500] [--workers 4]
+Creates users and optional team memberships, printing one NDJSON result per input
+row to stdout and a status summary to stderr. Existing emails are reported as
+"exists", so a partial run can be repeated with the same file.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m scripts.provision_users")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=PROVISION_FORMATS)
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--workers", type=int, default=settings.user_provision_hash_workers)
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.suffix.lower() in {".ndjson", ".jsonl"} else "csv")
+    text = args.path.read_text(encoding="utf-8-sig")
+    hasher = PasswordHasher(args.workers, 0, settings.password_hash_retry_after_sec)
+    totals: dict[str, int] = {}
+    try:
+        for result in provision_users(
+            get_workload_gateway(WORKLOAD_ADMIN).session_factory,
+            parse_provision_rows(fmt, text),
+            hasher=hasher,
+            chunk_size=args.chunk_size,
+        ):
+            totals[result.status] = totals.get(result.status, 0) + 1
+            print(json.dumps(result.as_dict(), ensure_ascii=False))
+    finally:
+        hasher.shutdown()
+    print(", ".join(f"{status}: {count}" for status, count in sorted(totals.items())) or "no rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import os
 import pytest
 from fastapi.testclient import TestClient
 
-from app.db.database import Base, SessionLocal, engine
+from app.db.database import Base, SessionLocal, dispose_workload_pools, engine
 from app.main import app
 from app.models import klsi as _  # ensure legacy models load before schema sync
 from app.models import engine as _engine  # register new engine authoring models
@@ -18,6 +18,7 @@ def db_setup():
         path = db_url.split("///")[-1]
         if os.path.exists(path):
             engine.dispose()
+            dispose_workload_pools()
             os.remove(path)
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.db.async_database import async_database_url, get_async_gateway
+from app.db.pool_telemetry import get_pool_telemetry_snapshot
+from app.db.query_accounting import query_scope
+from app.db.database import SessionLocal
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.team import Team, TeamAssessmentRollup
+from app.models.klsi.user import User
+from app.services.security import create_access_token
+
+
+def test_async_database_url_swaps_driver():
+    assert async_database_url("sqlite:///./klsi.db").drivername == "sqlite+aiosqlite"
+    assert async_database_url("postgresql+psycopg2://u:p@db/klsi").drivername == "postgresql+asyncpg"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@db/klsi")
+
+
+def test_async_read_endpoints(client):
+    with SessionLocal() as db:
+        owner = User(full_name="Async Owner", email="async.owner@mahasiswa.unikom.ac.id")
+        other = User(full_name="Async Other", email="async.other@mahasiswa.unikom.ac.id")
+        team = Team(name="Async Rollup Team")
+        db.add_all([owner, other, team])
+        db.flush()
+        db.add_all(
+            [
+                TeamAssessmentRollup(team_id=team.id, date=date(2030, 1, day), total_sessions=day, avg_lfi=None)
+                for day in (1, 2)
+            ]
+        )
+        session = AssessmentSession(user_id=owner.id)
+        db.add(session)
+        db.commit()
+        team_id, session_id = team.id, session.id
+        other_token = create_access_token(subject=str(other.id))
+
+    r = client.get(f"/teams/{team_id}/rollups")
+    assert r.status_code == 200, r.text
+    assert [row["total_sessions"] for row in r.json()] == [2, 1]
+
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+    assert client.get(f"/engine/sessions/{session_id}/delivery", headers=other_headers).status_code == 403
+    assert client.get("/engine/sessions/999999/delivery", headers=other_headers).status_code == 404
+    assert client.get(f"/engine/sessions/{session_id}/delivery").status_code == 401
+    assert client.get(f"/reports/{session_id}", headers=other_headers).status_code == 403
+    assert client.get("/reports/999999").status_code == 404
+
+
+
+def test_async_engine_reports_pool_and_query_accounting():
+    async def _select_one() -> None:
+        async with get_async_gateway().session() as session:
+            await session.execute(text("SELECT 1"))
+
+    with query_scope("async-engine-test") as stats:
+        asyncio.run(_select_one())
+
+    assert stats.statements >= 1
+    assert get_pool_telemetry_snapshot()["oltp.async"]["counters"]["checkouts"] >= 1
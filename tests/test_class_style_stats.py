@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.repositories import ClassStyleStatsRepository
+from app.models.klsi.analytics import ClassStyleStat
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.learning import CombinationScore, LearningStyleType, UserLearningStyle
+from app.models.klsi.user import User
+from app.services.class_stats import (
+    ACCE_BAND_CUTS,
+    AERO_BAND_CUTS,
+    band_for,
+    rebuild_class_style_stats,
+    record_completed_session,
+    summarize_class_style_stats,
+)
+
+
+def _db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _completed_session(db, user: User, style: LearningStyleType, *, acce: int, aero: int, day: date):
+    session = AssessmentSession(
+        user_id=user.id,
+        status=SessionStatus.completed,
+        end_time=datetime(day.year, day.month, day.day, 9, 30, tzinfo=timezone.utc),
+    )
+    db.add(session)
+    db.flush()
+    db.add(
+        CombinationScore(
+            session_id=session.id,
+            ACCE_raw=acce,
+            AERO_raw=aero,
+            assimilation_accommodation=0,
+            converging_diverging=0,
+            balance_acce=0,
+            balance_aero=0,
+        )
+    )
+    db.add(
+        UserLearningStyle(
+            session_id=session.id,
+            primary_style_type_id=style.id,
+            ACCE_raw=acce,
+            AERO_raw=aero,
+        )
+    )
+    db.flush()
+    return session
+
+
+def _seed(db):
+    imagining = LearningStyleType(style_name="Imagining", style_code="IM")
+    analyzing = LearningStyleType(style_name="Analyzing", style_code="AN")
+    a = User(full_name="A", email="a@mahasiswa.unikom.ac.id", kelas="IF-1")
+    b = User(full_name="B", email="b@mahasiswa.unikom.ac.id", kelas="IF-1")
+    c = User(full_name="C", email="c@mahasiswa.unikom.ac.id", kelas="IF-2")
+    db.add_all([imagining, analyzing, a, b, c])
+    db.flush()
+    day = date(2026, 3, 2)
+    _completed_session(db, a, imagining, acce=-4, aero=-8, day=day)
+    _completed_session(db, b, imagining, acce=2, aero=-1, day=day)
+    _completed_session(db, b, analyzing, acce=20, aero=5, day=date(2026, 3, 3))
+    _completed_session(db, c, analyzing, acce=18, aero=4, day=day)
+    db.commit()
+    return imagining, analyzing, a
+
+
+def test_band_for_boundaries():
+    assert band_for(5, ACCE_BAND_CUTS) == "Low"
+    assert band_for(6, ACCE_BAND_CUTS) == "Mid"
+    assert band_for(14, ACCE_BAND_CUTS) == "Mid"
+    assert band_for(15, ACCE_BAND_CUTS) == "High"
+    assert band_for(0, AERO_BAND_CUTS) == "Low"
+    assert band_for(12, AERO_BAND_CUTS) == "High"
+
+
+def test_rebuild_groups_completed_sessions_by_grain():
+    db = _db()
+    _seed(db)
+
+    written = rebuild_class_style_stats(db)
+    db.commit()
+
+    assert written == 3
+    summary = summarize_class_style_stats(db, "IF-1")
+    assert summary["total_sessions"] == 3
+    assert summary["style_counts"] == {"Imagining": 2, "Analyzing": 1}
+    assert summary["band_grid"] == {"Low/Low": 2, "High/Mid": 1}
+
+    only_day = summarize_class_style_stats(db, "IF-1", date_from=date(2026, 3, 3))
+    assert only_day["total_sessions"] == 1
+
+
+def test_rebuild_single_class_leaves_other_classes_untouched():
+    db = _db()
+    _seed(db)
+    rebuild_class_style_stats(db)
+    db.query(ClassStyleStat).filter(ClassStyleStat.kelas == "IF-2").update({"session_count": 99})
+    db.commit()
+
+    rebuild_class_style_stats(db, kelas="IF-1")
+    db.commit()
+
+    assert summarize_class_style_stats(db, "IF-2")["total_sessions"] == 99
+    assert summarize_class_style_stats(db, "IF-1")["total_sessions"] == 3
+
+
+def test_incremental_updates_match_rebuild():
+    db = _db()
+    imagining, _, user = _seed(db)
+    rebuild_class_style_stats(db)
+    db.commit()
+
+    day = date(2026, 3, 2)
+    _completed_session(db, user, imagining, acce=-4, aero=-8, day=day)
+    assert record_completed_session(
+        db,
+        user_id=user.id,
+        acce=-4,
+        aero=-8,
+        style_type_id=imagining.id,
+        completed_on=day,
+    )
+    db.commit()
+    incremental = summarize_class_style_stats(db, "IF-1")
+
+    rebuild_class_style_stats(db)
+    db.commit()
+    rebuilt = summarize_class_style_stats(db, "IF-1")
+
+    assert incremental["total_sessions"] == rebuilt["total_sessions"] == 4
+    assert incremental["rows"] == rebuilt["rows"]
+
+
+def test_increment_creates_missing_cell_with_null_kelas():
+    db = _db()
+    repo = ClassStyleStatsRepository(db)
+    for _ in range(2):
+        repo.increment(
+            kelas=None,
+            stat_date=date(2026, 1, 1),
+            acce_band="Mid",
+            aero_band="Mid",
+            style_name=None,
+        )
+    db.commit()
+
+    rows = db.query(ClassStyleStat).all()
+    assert len(rows) == 1
+    assert rows[0].session_count == 2
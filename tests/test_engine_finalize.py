@@ -16,9 +16,11 @@ from app.models.klsi.learning import LFIContextScore, ScaleProvenance
 from app.models.klsi.user import User
 
 from app.engine.strategies.klsi4 import KLSI4Strategy
+from app.core.metrics import get_counters
 from app.engine.runtime import EngineRuntime
 from app.services.scoring import finalize_session
 from app.services.seeds import seed_assessment_items, seed_instruments, seed_learning_styles
+from app.services.validation import reusable_validation, take_validation_snapshot, validation_scope
 from app.db.repositories.pipeline import PipelineRepository
 from app.i18n.id_messages import EngineMessages
 
@@ -286,3 +288,38 @@ def test_runtime_start_session_sets_pipeline_version():
         assert session.pipeline_version == "KLSI4.0:v1"
     finally:
         db.close()
+
+
+def test_finalize_validates_session_once_and_reuses_snapshot():
+    db = _db_session()
+    try:
+        session = _seed_complete_session(db)
+        db.commit()
+        snapshot = take_validation_snapshot(db, session.id)
+        assert snapshot.ready and snapshot.revision == take_validation_snapshot(db, session.id).revision
+        before = get_counters()
+
+        result = EngineRuntime().finalize_with_audit(
+            db,
+            session.id,
+            actor_email="tester@example.com",
+            action="FINALIZE_SESSION_USER",
+            build_payload=lambda _: b"",
+            validation=snapshot,
+        )
+
+        assert result["ok"] is True
+        counters = get_counters()
+        assert counters.get("validation.snapshot.taken", 0) == before.get("validation.snapshot.taken", 0)
+        # Runtime validate phase and finalize_assessment both reuse the snapshot.
+        assert counters["validation.snapshot.reused"] - before.get("validation.snapshot.reused", 0) == 2
+
+        response = db.query(UserResponse).filter(UserResponse.session_id == session.id).first()
+        db.delete(response)
+        db.flush()
+        assert not snapshot.is_current(db)
+        assert take_validation_snapshot(db, session.id).revision != snapshot.revision
+        with validation_scope(snapshot):
+            assert reusable_validation(db, session.id) is None
+    finally:
+        db.close()
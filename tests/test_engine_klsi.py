@@ -271,3 +271,36 @@ def test_engine_finalize_requires_lfi_contexts(client):
     issue_codes = {issue["code"] for issue in payload["issues"]}
     assert "LFI_CONTEXT_COUNT" in issue_codes
     assert payload["diagnostics"]["items"]["ready_to_complete"] is True
+
+
+def test_bootstrap_returns_session_with_cached_delivery(client):
+    from app.core.metrics import get_counters
+
+    _, token = _create_user()
+    headers = {"Authorization": f"Bearer {token}"}
+    r_boot = client.post(
+        "/engine/sessions/bootstrap",
+        json={"instrument_code": "KLSI", "locale": "id"},
+        headers=headers,
+    )
+    assert r_boot.status_code == 200, r_boot.text
+    body = r_boot.json()
+    session_id = body["session_id"]
+    etag = r_boot.headers["X-Delivery-ETag"]
+
+    hits = get_counters().get("engine.delivery.payload_hit", 0)
+    r_delivery = client.get(f"/engine/sessions/{session_id}/delivery", params={"locale": "id"}, headers=headers)
+    assert r_delivery.status_code == 200
+    assert r_delivery.headers["ETag"] == etag
+    assert r_delivery.json() == body["delivery"]
+    assert body["delivery"]["i18n"]["locale"] == "id" and len(body["delivery"]["items"]) == 12
+    assert get_counters()["engine.delivery.payload_hit"] == hits + 1
+
+    r_cached = client.get(
+        f"/engine/sessions/{session_id}/delivery",
+        params={"locale": "id"},
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert r_cached.status_code == 304 and not r_cached.content
+    plain = client.get(f"/engine/sessions/{session_id}/delivery", headers={**headers, "If-None-Match": etag})
+    assert plain.status_code == 200 and plain.headers["ETag"] != etag
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import Base
+from app.db.item_catalog import get_item_catalog
+from app.db.repositories import AssessmentItemRepository
+from app.models.klsi.items import AssessmentItem
+from app.services.seeds import seed_assessment_items
+
+
+def test_catalog_is_built_once_and_rebuilt_after_item_bank_commit():
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        seed_assessment_items(db)
+        db.commit()
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: statements.append(stmt))
+    with factory() as db:
+        catalog = get_item_catalog(db)
+        built_with = len(statements)
+        assert len(catalog.items) == 12 and len(catalog.learning_item_ids) == 12
+        assert sorted(catalog.layout.item_id_by_slot) == list(range(12))
+        assert all(len(catalog.choice_ids_by_item[item.id]) == 4 for item in catalog.items)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            catalog.items[0].stem = "changed"  # type: ignore[misc]
+
+        assert get_item_catalog(db) is catalog
+        assert len(AssessmentItemRepository(db).get_learning_item_ids()) == 12
+        assert len(statements) == built_with
+
+        item = db.get(AssessmentItem, catalog.items[0].id)
+        item.item_stem = "Ketika saya belajar (revisi)"
+        db.commit()
+
+    with factory() as db:
+        rebuilt = get_item_catalog(db)
+    assert rebuilt.epoch > catalog.epoch
+    assert rebuilt.content_hash != catalog.content_hash
+    assert rebuilt.items[0].stem == "Ketika saya belajar (revisi)"
+    engine.dispose()
+
+
+def test_catalog_picks_up_item_bank_changes_from_other_processes(monkeypatch):
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        seed_assessment_items(db)
+        db.commit()
+        catalog = get_item_catalog(db)
+        # A Core UPDATE bypasses the ORM flush hook, like a commit made by
+        # another worker: the local epoch does not move.
+        first_item = AssessmentItem.id == catalog.items[0].id
+        db.execute(update(AssessmentItem).where(first_item).values(item_stem="Diubah di worker lain"))
+        db.commit()
+        assert get_item_catalog(db) is catalog
+
+        monkeypatch.setattr(settings, "item_catalog_recheck_sec", 1e-9)
+        rebuilt = get_item_catalog(db)
+        assert rebuilt.items[0].stem == "Diubah di worker lain"
+        assert rebuilt.content_hash != catalog.content_hash
+        assert get_item_catalog(db) is rebuilt
+    engine.dispose()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core import metrics_multiprocess
+from app.core.metrics import _MetricsRegistry
+from app.core.metrics_multiprocess import (
+    _HEADER,
+    FleetReader,
+    MetricsShardWriter,
+    ShardFile,
+    read_shard,
+    shard_path,
+    start_multiprocess_metrics,
+)
+
+_WORKER = """
+import sys
+from app.core.metrics import metrics_registry
+from app.core.metrics_multiprocess import MetricsShardWriter
+
+metrics_registry.inc("engine.sessions.started", 3)
+metrics_registry.record("engine.finalize", 400.0)
+writer = MetricsShardWriter(sys.argv[1], 60)
+writer.start()
+print("ready", flush=True)
+sys.stdin.readline()
+"""
+
+
+def test_shard_file_grows_and_reads_back_latest_write(tmp_path: Path):
+    shard = ShardFile(tmp_path / "metrics-1.shard")
+    assert read_shard(shard.path) is None
+    shard.write(b"{}")
+    big = b"x" * 200_000
+    shard.write(big)
+    sequence, payload = read_shard(shard.path)
+    assert sequence == 4 and payload == big
+    shard.close()
+    assert not shard.path.exists()
+
+
+def test_fleet_reader_merges_live_workers_and_retires_dead_ones(tmp_path: Path):
+    local = _MetricsRegistry()
+    local.inc("engine.sessions.started", 2)
+    local.record("engine.finalize", 10.0)
+    reader = FleetReader(tmp_path, local)
+
+    worker = subprocess.Popen(
+        [sys.executable, "-c", _WORKER, str(tmp_path)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert worker.stdout.readline().strip() == "ready"
+        fleet = reader()
+        assert fleet.counters_snapshot()["engine.sessions.started"] == 5
+        timing = fleet.snapshot()["engine.finalize"]
+        assert timing["count"] == 2 and timing["max_ms"] == 400.0
+        assert reader() is fleet
+    finally:
+        worker.kill()
+        worker.wait()
+
+    # The dead worker's last state moves to the retired aggregate, for this
+    # reader and for any other worker's.
+    assert shard_path(tmp_path, worker.pid).exists()
+    assert reader().counters_snapshot()["engine.sessions.started"] == 5
+    assert not shard_path(tmp_path, worker.pid).exists()
+    assert FleetReader(tmp_path, _MetricsRegistry())().counters_snapshot()["engine.sessions.started"] == 3
+
+
+def test_writer_retires_its_state_on_shutdown(tmp_path: Path):
+    worker_registry = _MetricsRegistry()
+    worker_registry.inc("engine.sessions.started", 4)
+    writer = MetricsShardWriter(tmp_path, 60, registry=worker_registry)
+    writer.start()
+    worker_registry.inc("engine.sessions.started")
+    writer.stop()
+
+    assert not shard_path(tmp_path, os.getpid()).exists()
+    assert FleetReader(tmp_path, _MetricsRegistry())().counters_snapshot()["engine.sessions.started"] == 5
+
+
+def test_torn_peer_read_reuses_last_good_payload(tmp_path: Path):
+    peer = _MetricsRegistry()
+    peer.inc("engine.sessions.started", 7)
+    # The parent process stands in for a live peer worker.
+    shard = ShardFile(shard_path(tmp_path, os.getppid()))
+    shard.write(json.dumps(peer.dump_state()).encode("utf-8"))
+    local = _MetricsRegistry()
+    reader = FleetReader(tmp_path, local)
+    fleet = reader()
+    assert fleet.counters_snapshot()["engine.sessions.started"] == 7
+
+    # Leave the shard mid-write: an odd sequence never settles.
+    _HEADER.pack_into(shard._map, 0, 3, 0)
+    assert reader() is fleet
+    local.inc("engine.sessions.started")
+    assert reader().counters_snapshot()["engine.sessions.started"] == 8
+    shard.close()
+
+
+def test_app_imports_without_fcntl_and_multiprocess_mode_refuses_it(tmp_path: Path, monkeypatch):
+    # Windows has no fcntl; the app must still import with multiprocess mode off.
+    probe = "import sys; sys.modules['fcntl'] = None; import app.main"
+    subprocess.run([sys.executable, "-c", probe], check=True, env={**os.environ, "METRICS_MULTIPROCESS_DIR": ""})
+
+    monkeypatch.setattr(metrics_multiprocess, "fcntl", None)
+    with pytest.raises(RuntimeError, match="POSIX"):
+        start_multiprocess_metrics(tmp_path, 60)
+    with pytest.raises(RuntimeError, match="POSIX"):
+        FleetReader(tmp_path, _MetricsRegistry())
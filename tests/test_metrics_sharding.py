@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+import pytest
+
+from app.core.metrics import HistogramBuckets, _MetricsRegistry
+
+
+def _run_threads(count: int, target) -> None:
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_shards_merge_exactly_and_survive_their_threads():
+    registry = _MetricsRegistry()
+
+    def work() -> None:
+        for n in range(1000):
+            registry.inc("jobs")
+            registry.record("jobs.run", float(n % 10))
+            registry.observe_histogram("jobs.size", float(n % 4), buckets=(1.0, 2.0))
+
+    _run_threads(8, work)
+    registry.inc("jobs")
+
+    assert registry.counters_snapshot()["jobs"] == 8001
+    timing = registry.snapshot()["jobs.run"]
+    assert timing["count"] == 8000 and timing["total_ms"] == 8 * 4500
+    assert abs(timing["avg_ms"] - 4.5) < 1e-9 and timing["max_ms"] == 9.0
+    assert registry.histograms_snapshot()["jobs.size"] == {"1.0": 4000, "2.0": 2000, "+Inf": 2000}
+    _, export = registry.export()
+    assert export.timings["jobs.run"] == (8000, 36000.0)
+
+
+def test_reset_drops_other_threads_shards_until_they_write_again():
+    registry = _MetricsRegistry()
+    release = threading.Event()
+    recorded = threading.Event()
+
+    def work() -> None:
+        registry.inc("calls")
+        recorded.set()
+        release.wait()
+        registry.inc("calls")
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    recorded.wait()
+    version = registry.version
+    assert registry.counters_snapshot(reset=True) == {"calls": 1}
+    assert registry.version != version
+    assert registry.counters_snapshot() == {}
+
+    release.set()
+    thread.join()
+    assert registry.counters_snapshot() == {"calls": 1}
+    registry.reset()
+    assert registry.counters_snapshot() == {} and registry.snapshot() == {}
+
+
+def test_histograms_with_different_boundaries_merge_only_when_nested(caplog):
+    fine = HistogramBuckets((1.0, 5.0, 10.0))
+    for value in (0.5, 3.0, 7.0, 20.0):
+        fine.observe(value)
+    coarse = HistogramBuckets((5.0,))
+    coarse.observe(2.0)
+
+    coarse.merge(fine)
+    assert coarse.boundaries == (5.0,)
+    assert coarse.snapshot() == {"5.0": 3.0, "+Inf": 2.0}
+    fine.merge(HistogramBuckets((5.0,)))
+    assert fine.snapshot() == {"5.0": 2.0, "+Inf": 2.0} and fine.observations == 4.0
+
+    with pytest.raises(ValueError):
+        HistogramBuckets((1.0, 5.0)).merge(HistogramBuckets((2.0,)))
+
+    registry = _MetricsRegistry()
+    registry.observe_histogram("mixed", 1.0, buckets=(1.0, 5.0))
+    worker = threading.Thread(target=registry.observe_histogram, args=("mixed", 1.0), kwargs={"buckets": (2.0,)})
+    worker.start()
+    worker.join()
+    with caplog.at_level(logging.WARNING, logger="kolb.core.metrics"):
+        assert sum(registry.histograms_snapshot()["mixed"].values()) == 1.0
+    assert [r for r in caplog.records if r.getMessage() == "metrics_histogram_boundaries_mismatch"]
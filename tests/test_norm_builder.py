@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.errors import ConflictError, ValidationError
+from app.db.database import Base
+from app.db.repositories import NormativeConversionRepository
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.learning import CombinationScore, LearningFlexibilityIndex, ScaleScore
+from app.models.klsi.norms import NormativeConversionTable
+from app.models.klsi.user import User
+from app.services.norm_builder import NormSampleFilter, build_empirical_norms, cumulative_percentiles
+
+
+def _db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _seed(db):
+    young = User(full_name="Y", email="y@mahasiswa.unikom.ac.id", kelas="IF-1", date_of_birth=date(2005, 1, 1))
+    older = User(full_name="O", email="o@mahasiswa.unikom.ac.id", kelas="IF-2", date_of_birth=date(1990, 1, 1))
+    db.add_all([young, older])
+    db.flush()
+    for user, offset in ((young, 0), (young, 4), (young, 8), (older, 2)):
+        session = AssessmentSession(user_id=user.id, status=SessionStatus.completed, end_time=datetime(2025, 6, 1))
+        db.add(session)
+        db.flush()
+        ce, ro, ac, ae = 20 + offset, 30, 30 + offset, 40
+        db.add(ScaleScore(session_id=session.id, CE_raw=ce, RO_raw=ro, AC_raw=ac, AE_raw=ae))
+        db.add(
+            CombinationScore(
+                session_id=session.id,
+                ACCE_raw=ac - ce,
+                AERO_raw=ae - ro,
+                assimilation_accommodation=0,
+                converging_diverging=0,
+                balance_acce=0,
+                balance_aero=0,
+            )
+        )
+        db.add(LearningFlexibilityIndex(session_id=session.id, W_coefficient=0.5, LFI_score=0.5 + offset / 100))
+    db.commit()
+
+
+def test_cumulative_percentiles_are_share_at_or_below():
+    raws, pct = cumulative_percentiles([14, 12, 12, 20], 12, 20)
+    assert raws[0] == 12 and pct[0] == 50.0
+    assert pct[raws.tolist().index(13)] == 50.0
+    assert pct[raws.tolist().index(14)] == 75.0
+    assert pct[-1] == 100.0
+    assert np.all(np.diff(pct) >= 0)
+
+
+def test_build_empirical_norms_writes_new_group_version():
+    db = _db()
+    _seed(db)
+
+    result = build_empirical_norms(
+        db,
+        norm_group="KELAS:IF-1",
+        norm_version="2025.1",
+        sample_filter=NormSampleFilter(kelas="IF-1", age_band="19-24"),
+        min_sample=3,
+    )
+    db.commit()
+
+    assert result["sample_size"] == 3
+    assert result["rows_written"] == 4 * 37 + 2 * 73 + 101
+    assert result["lfi_sample_size"] == 3
+    row = NormativeConversionRepository(db).fetch_one("KELAS:IF-1", "2025.1", "CE", 24)
+    assert row is not None and row.percentile == pytest.approx(66.7)
+    row = NormativeConversionRepository(db).fetch_one("KELAS:IF-1", "2025.1", "LFI", 54)
+    assert row is not None and row.percentile == pytest.approx(66.7)
+
+    with pytest.raises(ConflictError):
+        build_empirical_norms(
+            db,
+            norm_group="KELAS:IF-1",
+            norm_version="2025.1",
+            sample_filter=NormSampleFilter(kelas="IF-1"),
+            min_sample=1,
+        )
+
+
+def test_build_empirical_norms_rejects_small_or_invalid_samples():
+    db = _db()
+    _seed(db)
+    with pytest.raises(ValidationError):
+        build_empirical_norms(
+            db,
+            norm_group="AGE:35-44",
+            norm_version="local",
+            sample_filter=NormSampleFilter(age_band="35-44"),
+            min_sample=2,
+        )
+    with pytest.raises(ValidationError):
+        NormSampleFilter(age_band="20-30")
+    assert db.query(NormativeConversionTable).count() == 0
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.assessments.klsi_v4.packing import (
+    CONTEXT_ORDER,
+    RANK_PERMUTATIONS,
+    UNANSWERED,
+    decode_ranks,
+    encode_ranks,
+    pack_slots,
+    unpack_slots,
+)
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.repositories import (
+    LFIContextRepository,
+    ResponsePackRepository,
+    UserResponseRepository,
+)
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import AssessmentItem, SessionResponsePack, UserResponse
+from app.models.klsi.user import User
+from app.services.security import create_access_token
+
+
+def _learning_items(db):
+    items = db.scalars(
+        select(AssessmentItem)
+        .where(AssessmentItem.item_type == ItemType.learning_style)
+        .order_by(AssessmentItem.item_number)
+    ).all()
+    return [(item.id, {choice.id: rank for rank, choice in enumerate(item.choices, start=1)}) for item in items]
+
+
+def test_rank_codec_round_trips_every_permutation():
+    assert len(RANK_PERMUTATIONS) == 24
+    for index in range(24):
+        assert encode_ranks(decode_ranks(index)) == index
+    assert unpack_slots(pack_slots([3, None, 23])) == [3, None, 23]
+    assert pack_slots([None]) == bytes([UNANSWERED])
+    with pytest.raises(ValueError):
+        encode_ranks({"CE": 1, "RO": 1, "AC": 3, "AE": 4})
+    with pytest.raises(ValueError):
+        encode_ranks({"CE": 1, "RO": 2, "AC": 3})
+
+
+def test_packed_submission_is_read_back_by_every_reader(db_setup):
+    with SessionLocal() as db:
+        user = User(full_name="Packed Reader", email="packed.reader@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.flush()
+        session = AssessmentSession(user_id=user.id)
+        db.add(session)
+        db.flush()
+        items = _learning_items(db)
+        contexts = [(name, {"CE": 4, "RO": 3, "AC": 2, "AE": 1}) for name in CONTEXT_ORDER]
+        ResponsePackRepository(db).save_submission(session.id, items, contexts)
+        db.commit()
+
+        pack = db.get(SessionResponsePack, session.id)
+        assert len(pack.item_ranks) == 12 and len(pack.context_ranks) == 8
+        assert db.scalar(select(func.count()).where(UserResponse.session_id == session.id)) == 0
+
+        responses = UserResponseRepository(db)
+        mode_ranks = responses.mode_ranks(session.id)
+        assert len(mode_ranks) == 48
+        assert sum(rank for _, rank in mode_ranks) == 12 * 10
+        aggregates = responses.aggregate_ranks_by_item(session.id)
+        assert len(aggregates) == 48 and all(row.count == 1 for row in aggregates)
+        assert responses.find_duplicate_choices(session.id) == []
+
+        scores = LFIContextRepository(db).list_for_session(session.id)
+        assert [score.context_name for score in scores] == list(CONTEXT_ORDER)
+        assert all(score.CE_rank == 4 and score.AE_rank == 1 for score in scores)
+
+        with pytest.raises(ValueError):
+            ResponsePackRepository(db).save_submission(session.id, [], [("Nowhere", contexts[0][1])])
+
+
+
+def test_pack_misses_are_cached_until_the_transaction_ends(db_setup):
+    with SessionLocal() as db:
+        user = User(full_name="Packless Reader", email="packless.reader@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.flush()
+        session = AssessmentSession(user_id=user.id)
+        db.add(session)
+        db.flush()
+        packs = ResponsePackRepository(db)
+
+        statements = []
+        listen = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.bind, "before_cursor_execute", listen)
+        try:
+            assert packs.get(session.id) is None
+            assert packs.get(session.id) is None
+            assert LFIContextRepository(db).list_for_session(session.id) == []
+        finally:
+            event.remove(db.bind, "before_cursor_execute", listen)
+        assert sum("session_response_packs" in statement for statement in statements) == 1
+
+        packs.save_submission(session.id, [], [(CONTEXT_ORDER[0], {"CE": 4, "RO": 3, "AC": 2, "AE": 1})])
+        db.flush()
+        assert packs.get(session.id) is not None
+        db.commit()
+        assert "response_packs_missing" not in db.info
+
+def test_submit_all_stores_one_pack_row_and_finalizes(client):
+    with SessionLocal() as db:
+        user = User(full_name="Packed Submitter", email="packed.submitter@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.commit()
+        items = _learning_items(db)
+        token = create_access_token(subject=str(user.id))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = client.post("/engine/sessions/start", json={"instrument_code": "KLSI", "instrument_version": "4.0"}, headers=headers)
+    assert r.status_code == 200, r.text
+    session_id = r.json()["session_id"]
+    payload = {
+        "items": [{"item_id": item_id, "ranks": ranks} for item_id, ranks in items],
+        "contexts": [
+            {"context_name": name, "CE": 1, "RO": 2, "AC": 3, "AE": 4} for name in CONTEXT_ORDER
+        ],
+    }
+    r = client.post(f"/engine/sessions/{session_id}/submit_all", json=payload, headers=headers)
+    assert r.status_code == 200, r.text
+
+    with SessionLocal() as db:
+        assert db.get(AssessmentSession, session_id).status == SessionStatus.completed
+        assert db.get(SessionResponsePack, session_id) is not None
+        assert db.scalar(select(func.count()).where(UserResponse.session_id == session_id)) == 0
+
+
+def test_compact_submit_all_decodes_permutation_indices(client, monkeypatch):
+    monkeypatch.setattr(settings, "packed_responses_write_rows", True)
+    with SessionLocal() as db:
+        user = User(full_name="Compact Submitter", email="compact.submitter@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.commit()
+        token = create_access_token(subject=str(user.id))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    codec = client.get("/engine/submission-codec").json()
+    assert codec["modes"] == ["CE", "RO", "AC", "AE"] and len(codec["permutations"]) == 24
+    session_id = client.post(
+        "/engine/sessions/start", json={"instrument_code": "KLSI", "instrument_version": "4.0"}, headers=headers
+    ).json()["session_id"]
+    url = f"/engine/sessions/{session_id}/submit_all/compact"
+    assert client.post(url, json={"items": [24] * 12, "contexts": [0] * 8}, headers=headers).status_code == 422
+    assert client.post(url, json={"items": [0] * 11, "contexts": [0] * 8}, headers=headers).status_code == 422
+
+    r = client.post(url, json={"items": list(range(12)), "contexts": [23] * 8}, headers=headers)
+    assert r.status_code == 200, r.text
+    with SessionLocal() as db:
+        assert db.get(AssessmentSession, session_id).status == SessionStatus.completed
+        pack = db.get(SessionResponsePack, session_id)
+        assert unpack_slots(pack.item_ranks) == list(range(12))
+        scores = LFIContextRepository(db).list_for_session(session_id)
+        assert [score.context_name for score in scores] == codec["contexts"]
+        assert all([score.CE_rank, score.RO_rank, score.AC_rank, score.AE_rank] == [4, 3, 2, 1] for score in scores)
+        item_ids = dict(db.execute(select(AssessmentItem.item_number, AssessmentItem.id)).all())
+        first_item = db.scalars(
+            select(UserResponse).where(UserResponse.session_id == session_id, UserResponse.item_id == item_ids[1])
+        ).all()
+        assert sorted(row.rank_value for row in first_item) == [1, 2, 3, 4]
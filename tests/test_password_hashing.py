@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import threading
+from uuid import uuid4
+
+import pytest
+
+from app.core.errors import ServiceUnavailableError
+from app.core.metrics import get_metrics
+from app.db.database import SessionLocal
+from app.models.klsi.user import User
+from app.services import security
+from app.services.password_hashing import PasswordHasher
+
+
+def test_calls_run_in_a_separate_process():
+    hasher = PasswordHasher(workers=1, queue_size=0, retry_after_sec=1)
+    try:
+        assert hasher._run("hash", os.getpid, [()])[0] != os.getpid()
+        assert hasher._run("verify", pow, [(2, 10), (3, 2)]) == [1024, 9]
+    finally:
+        hasher.shutdown()
+    assert hasher.in_flight == 0
+    assert get_metrics()["auth.password_hash.verify"]["count"] >= 1
+
+
+def _saturate(hasher: PasswordHasher) -> tuple[threading.Event, threading.Thread]:
+    release, entered = threading.Event(), threading.Event()
+
+    def _block() -> None:
+        entered.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=hasher._run, args=("hash", _block, [()]))
+    worker.start()
+    assert entered.wait(5)
+    return release, worker
+
+
+def test_saturated_queue_sheds_with_retry_after(client, monkeypatch):
+    hasher = PasswordHasher(workers=0, queue_size=0, retry_after_sec=7)
+    release, worker = _saturate(hasher)
+    try:
+        with pytest.raises(ServiceUnavailableError) as exc:
+            hasher.verify("a", "b")
+        assert exc.value.retry_after == 7
+
+        with SessionLocal() as db:
+            email = f"storm_{uuid4().hex}@mahasiswa.unikom.ac.id"
+            db.add(User(full_name="Login Storm", email=email, password_hash="$2b$12$placeholder"))
+            db.commit()
+        monkeypatch.setattr(security, "password_hasher", hasher)
+        r = client.post("/auth/login", params={"email": email, "password": "x"})
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "7"
+        assert r.json()["error"] == "service_unavailable"
+    finally:
+        release.set()
+        worker.join()
+    assert hasher.in_flight == 0
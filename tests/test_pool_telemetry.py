@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.metrics import get_counters, get_histograms
+from app.db import pool_telemetry
+from app.db.database import _build_engine
+from app.db.pool_telemetry import (
+    BACKGROUND_ROUTE,
+    TimedQueuePool,
+    get_pool_telemetry_snapshot,
+    install_pool_telemetry,
+)
+
+
+def test_pool_events_feed_histograms_counters_and_saturation(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(pool_telemetry, "_pools", {})
+    monkeypatch.setattr(settings, "db_pool_timeout", 1)
+    monkeypatch.setattr(settings, "db_pool_saturation_ratio", 1.0)
+    engine = _build_engine(f"sqlite:///{tmp_path / 'pool.db'}", snapshot=False, pool_size=1, max_overflow=0)
+    assert isinstance(engine.pool, TimedQueuePool)
+    install_pool_telemetry(engine, "probe")
+
+    with caplog.at_level(logging.WARNING, logger="kolb.db.pool_telemetry"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            state = get_pool_telemetry_snapshot()["probe"]
+            assert state["checked_out"] == 1 and state["capacity"] == 1 and state["utilization"] == 1.0
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+    histograms = get_histograms()
+    assert sum(histograms["db.pool.probe.checkout_wait_ms"].values()) >= 2
+    assert sum(histograms[f"db.pool.probe.hold_ms.{BACKGROUND_ROUTE}"].values()) >= 1
+    counters = get_pool_telemetry_snapshot()["probe"]["counters"]
+    assert counters["connects"] >= 1 and counters["timeouts"] >= 1 and counters["saturated"] >= 1
+    messages = {record.getMessage() for record in caplog.records}
+    assert {"db_pool_saturated", "db_pool_timeout"} <= messages
+
+    with engine.connect() as conn:
+        conn.invalidate()
+    assert get_counters()["db.pool.probe.invalidations"] >= 1
+    assert get_pool_telemetry_snapshot()["probe"]["peak_checked_out"] == 1
+    engine.dispose()
+
+
+def test_pool_state_endpoint_requires_mediator(client):
+    assert client.get("/admin/db/pools").status_code == 401
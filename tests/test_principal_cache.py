@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.metrics import get_counters
+from app.db.database import SessionLocal
+from app.models.klsi.user import User
+from app.services.principals import Principal, PrincipalCache
+from app.services.security import create_access_token, get_current_user
+
+
+def test_cached_principal_skips_lookup_until_user_changes(db_setup):
+    with SessionLocal() as db:
+        user = User(full_name="Cached Principal", email=f"principal_{uuid4().hex}@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    authorization = f"Bearer {create_access_token(subject=str(user_id))}"
+
+    with SessionLocal() as db:
+        first = get_current_user(authorization, db)
+    assert first == Principal(id=user_id, role="MAHASISWA", email=first.email)
+    hits = get_counters().get("auth.principal_cache.hit", 0)
+    # No session: the cached principal is served without verification or lookup.
+    assert get_current_user(authorization, None) == first
+    assert get_counters()["auth.principal_cache.hit"] == hits + 1
+
+    header, payload, signature = authorization.removeprefix("Bearer ").split(".")
+    forged = create_access_token(subject=str(user_id + 1)).split(".")[1]
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(f"Bearer {header}.{forged}.{signature}", None)
+    assert exc.value.status_code == 401
+
+    with SessionLocal() as db:
+        db.get(User, user_id).role = "MEDIATOR"
+        db.commit()
+        assert get_current_user(authorization, db).role == "MEDIATOR"
+        db.delete(db.get(User, user_id))
+        db.commit()
+        with pytest.raises(HTTPException) as exc:
+            get_current_user(authorization, db)
+    assert exc.value.status_code == 401
+
+
+def test_principal_cache_is_bounded_and_honours_token_expiry():
+    cache = PrincipalCache(max_entries=2, ttl=60)
+    for n in range(3):
+        cache.put(f"h.p.sig{n}", {"sub": str(n)}, Principal(id=n, role="MAHASISWA", email=f"{n}@x"))
+    assert len(cache) == 2 and cache.get("h.p.sig0") is None
+    assert cache.get("h.p.sig2")[1].id == 2
+
+    cache.put("h.p.expired", {"sub": "9", "exp": 0}, Principal(id=9, role=None, email="9@x"))
+    assert cache.get("h.p.expired") is None
+    assert cache.invalidate_user(2) == 1 and cache.get("h.p.sig2") is None
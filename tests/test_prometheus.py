@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from app.core.metrics import _MetricsRegistry
+from app.core.prometheus import PrometheusRenderer, render_export
+
+
+def test_render_lifts_labels_and_emits_cumulative_histograms():
+    registry = _MetricsRegistry()
+    registry.record("engine.finalize", 12.5)
+    registry.record("engine.finalize", 7.5)
+    registry.record("db.queries.request.GET /engine/sessions/{session_id}/delivery.db_ms", 3.0)
+    registry.inc("pipeline.klsi4.finalize.calls", 2)
+    registry.inc('guides.open.guide.say "hi"')
+    registry.observe_histogram("db.queries.stage.strategy_finalize.KLSI4.statements", 3.0, buckets=(1.0, 5.0))
+    registry.observe_histogram("db.queries.stage.strategy_finalize.KLSI4.statements", 9.0, buckets=(1.0, 5.0))
+    registry.set_last_run("responses.archive", 41.0)
+
+    text = render_export(registry.export()[1])
+    lines = text.splitlines()
+    assert "# TYPE kolb_engine_finalize_duration_ms summary" in lines
+    assert "kolb_engine_finalize_duration_ms_sum 20" in lines
+    assert "kolb_engine_finalize_duration_ms_count 2" in lines
+    assert 'kolb_db_queries_db_ms_duration_ms_sum{route="GET /engine/sessions/{session_id}/delivery"} 3' in lines
+    assert 'kolb_pipeline_finalize_calls_total{instrument="klsi4"} 2' in lines
+    assert "kolb_guides_open_guide_say__hi_total 1" in lines
+    assert "# TYPE kolb_db_queries_statements histogram" in lines
+    stage = 'stage="strategy_finalize.KLSI4"'
+    assert f'kolb_db_queries_statements_bucket{{{stage},le="1"}} 0' in lines
+    assert f'kolb_db_queries_statements_bucket{{{stage},le="5"}} 1' in lines
+    assert f'kolb_db_queries_statements_bucket{{{stage},le="+Inf"}} 2' in lines
+    assert f"kolb_db_queries_statements_sum{{{stage}}} 12" in lines
+    assert f"kolb_db_queries_statements_count{{{stage}}} 2" in lines
+    assert "kolb_responses_archive_last_run_ms 41" in lines
+
+
+def test_render_is_cached_until_the_registry_changes():
+    registry = _MetricsRegistry()
+    renderer = PrometheusRenderer(registry)
+    registry.inc("item_catalog.hit")
+    first = renderer.render()
+    assert renderer.render() is first
+    registry.inc("item_catalog.hit")
+    assert "kolb_item_catalog_hit_total 2" in renderer.render()
+
+
+def test_metrics_endpoint_serves_text_exposition(client, monkeypatch):
+    from app.core.config import settings
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    monkeypatch.setattr(settings, "metrics_scrape_token", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.core import quantiles
+from app.core.metrics import _MetricsRegistry
+from app.core.prometheus import render_export
+from app.core.quantiles import MAX_BINS, RELATIVE_ACCURACY, QuantileSketch, WindowedSketch
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy_and_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3.0, 1.5) for _ in range(20000)]
+    left, right = QuantileSketch(), QuantileSketch()
+    for n, value in enumerate(values):
+        (left if n % 2 else right).add(value)
+    left.merge(right)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert left.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY * 1.01)
+    assert left.count == 20000
+    assert left.quantile(1.0) == pytest.approx(max(values), rel=RELATIVE_ACCURACY)
+
+
+def test_sketch_memory_is_bounded():
+    sketch = QuantileSketch()
+    for exponent in range(2000):
+        sketch.add(1.03**exponent * 1e-2)
+    assert len(sketch.bins) == MAX_BINS
+    # Only the lowest bins are collapsed; the tail keeps its accuracy.
+    assert sketch.quantile(1.0) == pytest.approx(1.03**1999 * 1e-2, rel=RELATIVE_ACCURACY)
+    assert sketch.quantile(0.99) == pytest.approx(1.03**1979 * 1e-2, rel=RELATIVE_ACCURACY * 2)
+
+
+def test_windowed_views_drop_old_minutes(monkeypatch):
+    now = [600.0]
+    monkeypatch.setattr(quantiles, "time", lambda: now[0])
+    sketch = WindowedSketch(3)
+    sketch.add(1000.0)
+    now[0] += 120
+    sketch.add(10.0)
+    assert sketch.window().quantile(1.0) == pytest.approx(1000.0, rel=RELATIVE_ACCURACY)
+    assert sketch.window(1).quantile(1.0) == pytest.approx(10.0, rel=RELATIVE_ACCURACY)
+    now[0] += 60
+    assert sketch.window().count == 1 and sketch.lifetime.count == 2
+
+
+def test_registry_reports_tail_quantiles():
+    registry = _MetricsRegistry()
+    for n in range(1, 1001):
+        registry.record("engine.finalize", float(n))
+
+    entry = registry.quantiles_snapshot()["engine.finalize"]
+    assert entry["count"] == 1000
+    assert entry["p50_ms"] == pytest.approx(500, rel=0.02)
+    assert entry["p999_ms"] == pytest.approx(999, rel=0.02)
+    assert registry.snapshot()["engine.finalize"]["p99_ms"] == pytest.approx(990, rel=0.02)
+
+    lines = render_export(registry.export()[1]).splitlines()
+    p99 = next(line for line in lines if line.startswith('kolb_engine_finalize_duration_ms{quantile="0.99"}'))
+    assert float(p99.split()[-1]) == pytest.approx(990, rel=0.02)
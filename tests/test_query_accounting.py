@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.metrics import get_counters
+from app.db.query_accounting import current_query_stats, fingerprint, query_scope
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    assert fingerprint("SELECT *\n  FROM t WHERE id IN (?, ?, ?) LIMIT 1") == "SELECT * FROM t WHERE id IN (?) LIMIT ?"
+    assert fingerprint("SELECT a FROM t WHERE id = %s") == fingerprint("SELECT  a FROM t WHERE id = %s")
+
+
+def test_nested_scopes_count_statements_and_flag_repeats(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_n_plus_one_threshold", 3)
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+    with caplog.at_level(logging.WARNING, logger="kolb.db.query_accounting"):
+        with query_scope("outer", kind="request") as outer:
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO t VALUES (1), (2)"))
+                with query_scope("lookup") as inner:
+                    assert current_query_stats() is inner
+                    for ident in (1, 2, 3):
+                        conn.execute(text("SELECT id FROM t WHERE id = :id"), {"id": ident})
+
+    assert inner.statements == 3 and len(inner.fingerprints) == 1
+    assert outer.statements == 4 and outer.rows == 2
+    assert outer.db_ms >= inner.db_ms > 0
+    assert current_query_stats() is None
+    flagged = [r for r in caplog.records if r.getMessage() == "query_n_plus_one_suspected"]
+    assert len(flagged) == 2
+
+
+
+def test_failed_statements_do_not_leak_timers():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.connect() as conn, query_scope("failing"):
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info.get("query_accounting_started") == []
+
+def test_requests_are_accounted_by_route_template(client):
+    label = "db.queries.request.GET /teams/{team_id}/members.statements"
+    before = get_counters().get(label, 0)
+    assert client.get("/teams/999999/members").status_code in (200, 404)
+    assert get_counters()[label] > before
+
+
+def test_metrics_and_health_are_not_accounted(client):
+    assert client.get("/health").status_code == 200
+    assert client.get("/metrics").status_code == 200
+    unaccounted = ("db.queries.request.GET /metrics", "db.queries.request.GET /health")
+    assert not [label for label in get_counters() if label.startswith(unaccounted)]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import database as database_module
+from app.db.database import DatabaseGateway, ReadYourWritesTracker, read_your_writes
+
+
+def _gateway(tmp_path) -> DatabaseGateway:
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for eng, label in ((primary, "primary"), (replica, "replica")):
+        with eng.begin() as conn:
+            conn.execute(text("CREATE TABLE origin (label TEXT)"))
+            conn.execute(text("INSERT INTO origin VALUES (:label)"), {"label": label})
+    return DatabaseGateway(
+        engine=primary,
+        session_factory=sessionmaker(bind=primary),
+        replica_engine=replica,
+        replica_session_factory=sessionmaker(bind=replica),
+    )
+
+
+def _origin(session) -> str:
+    return session.execute(text("SELECT label FROM origin")).scalar_one()
+
+
+def test_read_only_sessions_route_to_replica_except_after_writes(tmp_path):
+    gateway = _gateway(tmp_path)
+    read_your_writes.clear()
+    try:
+        with gateway.session() as db:
+            assert _origin(db) == "primary"
+        with gateway.session(read_only=True, principal=7) as db:
+            assert _origin(db) == "replica"
+
+        read_your_writes.mark(7)
+        with gateway.session(read_only=True, principal=7) as db:
+            assert _origin(db) == "primary"
+        with gateway.session(read_only=True, principal=8) as db:
+            assert _origin(db) == "replica"
+    finally:
+        read_your_writes.clear()
+
+
+def test_gateway_without_replica_always_uses_primary(tmp_path):
+    gateway = _gateway(tmp_path)
+    plain = DatabaseGateway(engine=gateway.engine, session_factory=gateway.session_factory)
+    assert plain.has_replica is False
+    with plain.session(read_only=True) as db:
+        assert _origin(db) == "primary"
+
+
+def test_read_your_writes_window_expires(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(database_module, "monotonic", lambda: clock[0])
+    tracker = ReadYourWritesTracker(window_sec=5.0)
+    tracker.mark("42")
+    assert tracker.is_recent(42)
+    clock[0] += 5.1
+    assert not tracker.is_recent(42)
+    assert not ReadYourWritesTracker(window_sec=0).is_recent(None)
+
+
+def test_signed_marker_carries_read_your_writes_across_workers(tmp_path):
+    gateway = _gateway(tmp_path)
+    read_your_writes.clear()
+    with database_module.write_marker_scope(None) as issued:
+        read_your_writes.mark(7)
+    # Another worker: empty in-process map, marker arrives with the client.
+    read_your_writes.clear()
+    marker = issued[0]
+    with database_module.write_marker_scope(marker):
+        with gateway.session(read_only=True, principal=7) as db:
+            assert _origin(db) == "primary"
+        with gateway.session(read_only=True, principal=8) as db:
+            assert _origin(db) == "replica"
+    forged = marker.replace("7.", "8.", 1)
+    with database_module.write_marker_scope(forged):
+        assert not read_your_writes.is_recent(8)
+    assert not read_your_writes.is_recent(7)
+
+
+def test_middleware_returns_issued_marker_and_reads_it_back():
+    import asyncio
+
+    from app.db.read_your_writes import ReadYourWritesMiddleware
+
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(read_your_writes.is_recent(5))
+        read_your_writes.mark(5)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def call(headers):
+        await ReadYourWritesMiddleware(app)({"type": "http", "headers": headers}, None, send)
+
+    read_your_writes.clear()
+    asyncio.run(call([]))
+    headers = dict(sent[0]["headers"])
+    marker = headers[b"x-read-your-writes"].decode()
+    assert headers[b"set-cookie"].decode().startswith(f"kolb_ryw={marker};")
+
+    read_your_writes.clear()
+    asyncio.run(call([(b"cookie", f"kolb_ryw={marker}".encode())]))
+    assert seen == [False, True]
+    read_your_writes.clear()
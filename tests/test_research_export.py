@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import numpy as np
+
+from app.db.database import SessionLocal
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import AssessmentItem, UserResponse
+from app.models.klsi.learning import CombinationScore, ScaleScore
+from app.models.klsi.research import ResearchStudy
+from app.models.klsi.user import User
+from app.services.security import create_access_token
+
+MODE_RANKS = {"CE": 4, "RO": 3, "AC": 2, "AE": 1}
+
+
+def _seed_export_fixture(year: int = 2031):
+    suffix = uuid4().hex[:8]
+    with SessionLocal() as db:
+        mediator = User(full_name="Export Mediator", email=f"export.mediator.{suffix}@mahasiswa.unikom.ac.id", role="MEDIATOR")
+        student = User(full_name="Export Student", email=f"export.student.{suffix}@mahasiswa.unikom.ac.id")
+        db.add_all([mediator, student])
+        db.flush()
+        study = ResearchStudy(
+            title="Export window",
+            started_at=datetime(year, 3, 1),
+            completed_at=datetime(year, 3, 31),
+        )
+        db.add(study)
+        items = (
+            db.query(AssessmentItem)
+            .filter(AssessmentItem.item_type == ItemType.learning_style)
+            .order_by(AssessmentItem.item_number)
+            .all()
+        )
+        session_ids = []
+        for ended in (datetime(year, 3, 5), datetime(year, 3, 6), datetime(year, 5, 1)):
+            session = AssessmentSession(user_id=student.id, status=SessionStatus.completed, end_time=ended)
+            db.add(session)
+            db.flush()
+            for item in items:
+                for choice in item.choices:
+                    db.add(
+                        UserResponse(
+                            session_id=session.id,
+                            item_id=item.id,
+                            choice_id=choice.id,
+                            rank_value=MODE_RANKS[choice.learning_mode.value],
+                        )
+                    )
+            db.add(ScaleScore(session_id=session.id, CE_raw=48, RO_raw=36, AC_raw=24, AE_raw=12))
+            db.add(
+                CombinationScore(
+                    session_id=session.id,
+                    ACCE_raw=-24,
+                    AERO_raw=-24,
+                    assimilation_accommodation=0,
+                    converging_diverging=0,
+                    balance_acce=0,
+                    balance_aero=0,
+                )
+            )
+            session_ids.append(session.id)
+        db.commit()
+        return create_access_token(subject=str(mediator.id)), study.id, session_ids, len(items)
+
+
+def test_research_export_streams_all_formats(client):
+    token, study_id, session_ids, item_count = _seed_export_fixture()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = client.get(f"/research/export?format=csv&study_id={study_id}", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [int(row["session_id"]) for row in rows] == session_ids[:2]
+    assert rows[0]["item_01_CE"] == "4" and rows[0]["item_01_AE"] == "1"
+    assert rows[0]["ACCE"] == "-24"
+
+    r = client.get(f"/research/export?format=ndjson&study_id={study_id}", headers=headers)
+    assert r.status_code == 200
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 2
+    assert len(records[0]["ranks"]) == item_count * 4
+
+    r = client.get(f"/research/export?format=npz&study_id={study_id}", headers=headers)
+    assert r.status_code == 200
+    archive = np.load(io.BytesIO(r.content))
+    assert archive["ranks"].shape == (2, item_count, 4)
+    assert archive["ranks"][:, :, 0].min() == 4
+    assert archive["session_id"].tolist() == session_ids[:2]
+
+    assert client.get("/research/export?format=xlsx", headers=headers).status_code == 422
+    assert client.get("/research/export").status_code == 401
+
+
+def test_npz_export_keeps_sessions_completed_after_the_count(monkeypatch):
+    from app.db.repositories import ResearchExportRepository
+    from app.services.research_export import iter_npz
+
+    _, study_id, session_ids, item_count = _seed_export_fixture(year=2032)
+    # Simulate sessions finishing between the count query and the stream.
+    monkeypatch.setattr(ResearchExportRepository, "count_sessions", lambda self, study: 1)
+    with SessionLocal() as db:
+        study = db.get(ResearchStudy, study_id)
+        item_numbers = ResearchExportRepository(db).style_item_numbers()
+        archive = np.load(io.BytesIO(b"".join(iter_npz(db, study, item_numbers))))
+    assert archive["session_id"].tolist() == session_ids[:2]
+    assert archive["ranks"].shape == (2, item_count, 4)
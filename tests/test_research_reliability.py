@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import permutations
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.klsi.assessment import AssessmentSession, AssessmentSessionDelta
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import AssessmentItem, UserResponse
+from app.models.klsi.learning import CombinationScore, ScaleScore
+from app.models.klsi.research import ReliabilityResult, ResearchStudy
+from app.models.klsi.user import User
+from app.services.reliability import (
+    build_rank_tensor,
+    compute_study_reliability,
+    cronbach_alpha,
+    spearman_brown_split_half,
+)
+from app.services.seeds import seed_assessment_items
+
+PERMS = list(permutations((1, 2, 3, 4)))
+
+
+def _db():
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed_assessment_items(db)
+    return db
+
+
+def _completed_session(db, user, items, perm_offsets, *, ended):
+    session = AssessmentSession(user_id=user.id, status=SessionStatus.completed, end_time=ended)
+    db.add(session)
+    db.flush()
+    totals = {"CE": 0, "RO": 0, "AC": 0, "AE": 0}
+    for item, offset in zip(items, perm_offsets):
+        ranks = PERMS[offset % len(PERMS)]
+        for choice, rank in zip(sorted(item.choices, key=lambda c: c.learning_mode.value), ranks):
+            db.add(UserResponse(session_id=session.id, item_id=item.id, choice_id=choice.id, rank_value=rank))
+            totals[choice.learning_mode.value] += rank
+    db.add(ScaleScore(session_id=session.id, CE_raw=totals["CE"], RO_raw=totals["RO"], AC_raw=totals["AC"], AE_raw=totals["AE"]))
+    db.add(
+        CombinationScore(
+            session_id=session.id,
+            ACCE_raw=totals["AC"] - totals["CE"],
+            AERO_raw=totals["AE"] - totals["RO"],
+            assimilation_accommodation=0,
+            converging_diverging=0,
+            balance_acce=0,
+            balance_aero=0,
+        )
+    )
+    db.flush()
+    return session
+
+
+def test_alpha_and_split_half_on_known_matrix():
+    matrix = np.array([[1, 2, 1, 2], [2, 3, 2, 3], [3, 4, 3, 4], [4, 4, 4, 4]])
+    k = matrix.shape[1]
+    expected = (k / (k - 1)) * (1 - matrix.var(axis=0, ddof=1).sum() / matrix.sum(axis=1).var(ddof=1))
+    assert abs(cronbach_alpha(matrix) - expected) < 1e-12
+    assert spearman_brown_split_half(matrix) > 0.9
+    assert cronbach_alpha(matrix[:2]) is None
+
+
+def test_rank_tensor_drops_incomplete_sessions():
+    triples = [(10, 1, "CE", 1), (10, 1, "RO", 2), (10, 1, "AC", 3), (10, 1, "AE", 4)]
+    triples += [(11, 1, "CE", 4), (11, 1, "RO", 3)]
+    tensor = build_rank_tensor(triples)
+    assert tensor.shape == (1, 1, 4)
+    assert tensor[0, 0].tolist() == [1, 2, 3, 4]
+
+
+def test_compute_study_reliability_persists_metrics():
+    db = _db()
+    items = (
+        db.query(AssessmentItem)
+        .filter(AssessmentItem.item_type == ItemType.learning_style)
+        .order_by(AssessmentItem.item_number)
+        .all()
+    )
+    study = ResearchStudy(title="Pilot", started_at=datetime(2025, 1, 1), completed_at=datetime(2025, 12, 31))
+    db.add(study)
+    db.add(ReliabilityResult(study_id=1, metric_name="manual_note", value=0.5))
+    inside = datetime(2025, 6, 1)
+    for idx in range(8):
+        user = User(full_name=f"U{idx}", email=f"u{idx}@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.flush()
+        first = _completed_session(db, user, items, [idx * 3 + j for j in range(len(items))], ended=datetime(2024, 6, 1))
+        second = _completed_session(db, user, items, [idx * 3 + j + (j % 2) for j in range(len(items))], ended=inside)
+        db.add(AssessmentSessionDelta(session_id=second.id, previous_session_id=first.id))
+    db.commit()
+
+    result = compute_study_reliability(db, study)
+    db.commit()
+
+    assert result["respondents"] == 8
+    assert result["retest_pairs"] == 8
+    assert set(result["metrics"]) >= {"cronbach_alpha_CE", "split_half_sb_AE", "test_retest_ACCE"}
+
+    again = compute_study_reliability(db, study)
+    db.commit()
+    names = [row.metric_name for row in db.query(ReliabilityResult).filter_by(study_id=study.id)]
+    assert "manual_note" in names
+    assert len(names) == len(set(names)) == again["persisted"] + 1
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.assessments.klsi_v4.packing import CONTEXT_ORDER
+from app.db.database import SessionLocal
+from app.db.repositories import LFIContextRepository, UserResponseRepository
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import ItemType, SessionStatus
+from app.models.klsi.items import AssessmentItem, SessionResponsePack, UserResponse
+from app.models.klsi.learning import LFIContextScore
+from app.models.klsi.user import User
+from app.services.response_archive import archive_completed_responses
+
+
+def _completed_session_with_rows(db, user_id: int, ended: datetime, *, valid: bool = True) -> int:
+    session = AssessmentSession(user_id=user_id, status=SessionStatus.completed, end_time=ended)
+    db.add(session)
+    db.flush()
+    items = db.scalars(select(AssessmentItem).where(AssessmentItem.item_type == ItemType.learning_style)).all()
+    for item in items:
+        for rank, choice in enumerate(item.choices, start=1):
+            db.add(UserResponse(session_id=session.id, item_id=item.id, choice_id=choice.id, rank_value=rank))
+    for name in CONTEXT_ORDER:
+        # An invalid ranking (all 1s) cannot be packed and must be left in place.
+        ce, ro, ac, ae = (4, 1, 3, 2) if valid else (1, 1, 1, 1)
+        db.add(LFIContextScore(session_id=session.id, context_name=name, CE_rank=ce, RO_rank=ro, AC_rank=ac, AE_rank=ae))
+    return session.id
+
+
+def _row_count(db, session_id: int) -> int:
+    return db.scalar(select(func.count()).where(UserResponse.session_id == session_id)) + db.scalar(
+        select(func.count()).where(LFIContextScore.session_id == session_id)
+    )
+
+
+def test_archival_packs_old_completed_sessions_in_batches(db_setup):
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        user = User(full_name="Archive Subject", email="archive.subject@mahasiswa.unikom.ac.id")
+        db.add(user)
+        db.flush()
+        old = [_completed_session_with_rows(db, user.id, now - timedelta(days=200)) for _ in range(3)]
+        broken = _completed_session_with_rows(db, user.id, now - timedelta(days=200), valid=False)
+        recent = _completed_session_with_rows(db, user.id, now - timedelta(days=1))
+        db.commit()
+        before = {sid: sorted(UserResponseRepository(db).mode_ranks(sid)) for sid in old}
+
+    result = archive_completed_responses(SessionLocal, older_than_days=90, batch_size=2, now=now)
+    assert result["sessions"] >= 3 and result["skipped"] >= 1
+    assert result["batches"] >= 2
+
+    with SessionLocal() as db:
+        for sid in old:
+            assert _row_count(db, sid) == 0
+            assert db.get(SessionResponsePack, sid).archived_at is not None
+            assert sorted(UserResponseRepository(db).mode_ranks(sid)) == before[sid]
+            scores = LFIContextRepository(db).list_for_session(sid)
+            assert len(scores) == 8 and all(score.CE_rank == 4 and score.RO_rank == 1 for score in scores)
+        assert _row_count(db, broken) == 56 and db.get(SessionResponsePack, broken) is None
+        assert _row_count(db, recent) == 56 and db.get(SessionResponsePack, recent) is None
+
+    again = archive_completed_responses(SessionLocal, older_than_days=90, batch_size=2, now=now)
+    assert again["sessions"] == 0 and again["rows_deleted"] == 0
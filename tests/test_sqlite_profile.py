@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import get_counters
+from app.db.database import _build_engine
+from app.db.sqlite_profile import SQLiteWriteQueue, install_write_serialization
+
+metadata = MetaData()
+entries = Table("entries", metadata, Column("id", Integer, primary_key=True), Column("worker", String))
+
+
+def _production_engine(monkeypatch, path):
+    monkeypatch.setattr(settings, "sqlite_production_mode", True)
+    monkeypatch.setattr(settings, "sqlite_busy_timeout_ms", 10)
+    monkeypatch.setattr(settings, "sqlite_write_retry_base_ms", 20)
+    engine = _build_engine(f"sqlite:///{path}", snapshot=False, pool_size=4, max_overflow=4)
+    metadata.create_all(engine)
+    return engine
+
+
+def test_production_pragmas_are_applied_on_connect(monkeypatch, tmp_path):
+    engine = _production_engine(monkeypatch, tmp_path / "pragmas.db")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar_one() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar_one() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar_one() == 10
+        assert conn.execute(text("PRAGMA cache_size")).scalar_one() == -settings.sqlite_cache_size_kib
+    engine.dispose()
+
+
+def test_concurrent_writers_are_serialized_through_the_queue(monkeypatch, tmp_path):
+    engine = _production_engine(monkeypatch, tmp_path / "queue.db")
+    factory = sessionmaker(bind=engine, autoflush=False)
+    queue = SQLiteWriteQueue(timeout_sec=10)
+    install_write_serialization(factory, queue)
+    errors: list[BaseException] = []
+
+    def _writer(worker: int) -> None:
+        try:
+            with factory() as session:
+                for _ in range(5):
+                    session.execute(insert(entries).values(worker=str(worker)))
+                    time.sleep(0.002)
+                session.commit()
+        except BaseException as exc:  # pragma: no cover - surfaced by the assert below
+            errors.append(exc)
+
+    before = get_counters().get("db.sqlite.write_queue.acquired", 0)
+    threads = [threading.Thread(target=_writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with factory() as session:
+        assert len(session.execute(select(entries.c.id)).all()) == 40
+    assert get_counters()["db.sqlite.write_queue.acquired"] == before + 8
+    assert queue.snapshot() == {"busy": False, "waiting": 0, "timeout_sec": 10.0}
+    engine.dispose()
+
+
+def test_write_lock_is_retried_with_backoff_while_another_process_writes(monkeypatch, tmp_path):
+    path = tmp_path / "busy.db"
+    engine = _production_engine(monkeypatch, path)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    install_write_serialization(factory, SQLiteWriteQueue(timeout_sec=10))
+
+    outside = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    outside.execute("BEGIN IMMEDIATE")
+    releaser = threading.Timer(0.05, outside.execute, args=("COMMIT",))
+    releaser.start()
+    before = get_counters().get("db.sqlite.write.retries", 0)
+    with factory() as session:
+        session.execute(insert(entries).values(worker="late"))
+        session.commit()
+    releaser.join()
+    outside.close()
+    assert get_counters()["db.sqlite.write.retries"] > before
+    engine.dispose()
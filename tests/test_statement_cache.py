@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.repositories import NormativeConversionRepository, SessionRepository, get_statement_cache_stats
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.norms import NormativeConversionTable
+from app.models.klsi.user import User
+
+
+def _db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_fetch_batch_matches_scale_raw_pairs_with_one_cached_statement():
+    db = _db()
+    db.add_all(
+        NormativeConversionTable(
+            norm_group="Total", norm_version=version, scale_name=scale, raw_score=raw, percentile=float(raw)
+        )
+        for version in ("v1", "v2")
+        for scale in ("CE", "RO")
+        for raw in (20, 21, 22)
+    )
+    db.commit()
+    repo = NormativeConversionRepository(db)
+    before = get_statement_cache_stats().get("norms.fetch_batch", {"compiled": 0, "cache_hit": 0})
+
+    rows = repo.fetch_batch("Total", ["v2", "missing"], {"CE": [20, 22, 20], "RO": [21]})
+    assert sorted((r.norm_version, r.scale_name, r.raw_score) for r in rows) == [
+        ("v2", "CE", 20),
+        ("v2", "CE", 22),
+        ("v2", "RO", 21),
+    ]
+    # Different list lengths reuse the same compiled statement.
+    assert len(repo.fetch_batch("Total", ["v1"], {"RO": [20, 21, 22], "CE": [21]})) == 4
+    assert repo.fetch_batch("Total", ["v1"], {"CE": []}) == []
+    assert repo.fetch_one("Total", "v1", "RO", 22).percentile == 22.0
+    assert repo.fetch_one("Total", "v1", "RO", 40) is None
+
+    after = get_statement_cache_stats()["norms.fetch_batch"]
+    assert after["compiled"] - before["compiled"] <= 1
+    assert after["cache_hit"] - before["cache_hit"] >= 1
+
+
+def test_session_repository_prepared_lookups():
+    db = _db()
+    user = User(full_name="Cache", email="cache@mahasiswa.unikom.ac.id")
+    db.add(user)
+    db.flush()
+    done = AssessmentSession(user_id=user.id, status=SessionStatus.completed)
+    db.add(done)
+    db.commit()
+    repo = SessionRepository(db)
+
+    assert repo.get_by_id(done.id) is done
+    assert repo.get_for_user(done.id, user.id + 1) is None
+    assert repo.is_completed(done.id) and not repo.is_completed(done.id + 1)
+    assert repo.get_with_details(done.id).user is user
+    assert repo.list_lfi_context_scores(done.id) == []
+    assert get_statement_cache_stats()["sessions.get_by_id"]["compiled"] >= 1
@@ -0,0 +1,91 @@
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.klsi.assessment import AssessmentSession
+from app.models.klsi.enums import SessionStatus
+from app.models.klsi.learning import CombinationScore, LearningFlexibilityIndex, ScaleScore
+from app.models.klsi.team import Team, TeamMember
+from app.models.klsi.user import User
+from app.services.team_distribution import compute_team_distribution, summarize_score_matrix
+
+
+def _make_db():
+    engine = create_engine("sqlite:///:memory:")
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+    return SessionLocal()
+
+
+def _add_session(db, user_id, modes, *, lfi=None, status=SessionStatus.completed, when=None):
+    ce, ro, ac, ae = modes
+    when = when or datetime(2025, 1, 2)
+    s = AssessmentSession(user_id=user_id, status=status, start_time=when, end_time=when)
+    db.add(s)
+    db.flush()
+    db.add(ScaleScore(session_id=s.id, CE_raw=ce, RO_raw=ro, AC_raw=ac, AE_raw=ae))
+    db.add(
+        CombinationScore(
+            session_id=s.id,
+            ACCE_raw=ac - ce,
+            AERO_raw=ae - ro,
+            assimilation_accommodation=0,
+            converging_diverging=0,
+            balance_acce=0,
+            balance_aero=0,
+        )
+    )
+    if lfi is not None:
+        db.add(LearningFlexibilityIndex(session_id=s.id, W_coefficient=1 - lfi, LFI_score=lfi))
+    db.flush()
+
+
+def test_team_distribution_counts_completed_member_sessions():
+    db = _make_db()
+    member = User(full_name="M", email="m@mahasiswa.unikom.ac.id")
+    outsider = User(full_name="O", email="o@mahasiswa.unikom.ac.id")
+    team = Team(name="Team D")
+    db.add_all([member, outsider, team])
+    db.flush()
+    db.add(TeamMember(team_id=team.id, user_id=member.id))
+
+    _add_session(db, member.id, (20, 30, 40, 30), lfi=0.6)
+    _add_session(db, member.id, (48, 12, 12, 48), lfi=0.8)
+    _add_session(db, member.id, (30, 30, 30, 30))
+    _add_session(db, member.id, (30, 30, 30, 30), status=SessionStatus.started)
+    _add_session(db, outsider.id, (30, 30, 30, 30), lfi=0.1)
+    db.commit()
+
+    result = compute_team_distribution(db, team.id)
+
+    assert result["total_sessions"] == 3
+    ce = result["modes"]["CE"]
+    assert sum(ce["counts"]) == 3
+    assert ce["edges"][0] == 12 and ce["edges"][-1] == 49
+    assert ce["counts"][ce["edges"].index(48)] == 1
+    assert result["lfi"]["count"] == 2
+    assert result["lfi"]["quantiles"]["p50"] == 0.7
+    assert sum(map(sum, result["acce_aero_grid"]["counts"])) == 3
+
+    empty = compute_team_distribution(db, team.id, for_date=date(2024, 1, 1))
+    assert empty["total_sessions"] == 0
+    assert empty["lfi"]["quantiles"]["p50"] is None
+    assert empty["modes"]["AE"]["mean"] is None
+
+
+def test_summarize_score_matrix_grid_places_extremes():
+    matrix = np.array(
+        [
+            [48, 48, 12, 12, -36, -36, np.nan],
+            [12, 12, 48, 48, 36, 36, 0.5],
+        ]
+    )
+    summary = summarize_score_matrix(matrix, grid_bin_width=12)
+    grid = np.array(summary["acce_aero_grid"]["counts"])
+    assert grid.shape == (7, 7)
+    assert grid[0, 0] == 1
+    assert grid[-1, -1] == 1
+    assert summary["lfi"]["quantiles"]["p10"] == 0.5
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.models.klsi.team import Team, TeamMember
+from app.models.klsi.user import User
+from app.services.security import create_access_token
+from app.services.user_provisioning import parse_provision_rows, provision_users
+
+
+class _StubHasher:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def hash_many(self, passwords):
+        self.batches.append(list(passwords))
+        return [f"hashed:{password}" for password in passwords]
+
+
+def test_provisioning_reports_each_row_and_batches_chunks(db_setup):
+    tag = uuid4().hex[:8]
+    with SessionLocal() as db:
+        team = Team(name=f"Cohort {tag}")
+        db.add(team)
+        db.add(User(full_name="Already Here", email=f"exists.{tag}@mahasiswa.unikom.ac.id"))
+        db.commit()
+        team_id = team.id
+
+    csv_text = "\n".join(
+        [
+            "full_name,email,password,nim,kelas,tahun_masuk,team,role_in_team",
+            f"Siti,siti.{tag}@mahasiswa.unikom.ac.id,pw-1,10122001,IF-1,2022,Cohort {tag},ketua",
+            f"Dosen,dosen.{tag}@unikom.ac.id,pw-2,,,,,",
+            f"Bad Nim,bad.{tag}@mahasiswa.unikom.ac.id,,123,IF-1,2022,,",
+            f"Siti Again,siti.{tag}@mahasiswa.unikom.ac.id,,10122002,IF-1,2022,,",
+            f"Existing,exists.{tag}@mahasiswa.unikom.ac.id,,10122003,IF-1,2022,,",
+            f"Lost,lost.{tag}@mahasiswa.unikom.ac.id,,10122004,IF-1,2022,No Such Team,",
+            "No Email,,,,,,,",
+        ]
+    )
+    hasher = _StubHasher()
+    results = list(provision_users(SessionLocal, parse_provision_rows("csv", csv_text), hasher=hasher, chunk_size=2))
+
+    assert [(r.line, r.status) for r in results] == [
+        (2, "created"),
+        (3, "created"),
+        (4, "invalid"),
+        (5, "invalid"),
+        (6, "exists"),
+        (7, "invalid"),
+        (8, "invalid"),
+    ]
+    assert results[0].team_id == team_id and [batch for batch in hasher.batches if batch] == [["pw-1", "pw-2"]]
+    with SessionLocal() as db:
+        siti = db.get(User, results[0].user_id)
+        assert siti.password_hash == "hashed:pw-1" and siti.kelas == "IF-1" and siti.role == "MAHASISWA"
+        assert db.get(User, results[1].user_id).role == "MEDIATOR"
+        member = db.scalars(select(TeamMember).where(TeamMember.user_id == siti.id)).one()
+        assert member.team_id == team_id and member.role_in_team == "ketua"
+
+
+def test_provision_endpoint_streams_ndjson_results(client):
+    tag = uuid4().hex[:8]
+    with SessionLocal() as db:
+        mediator = User(full_name="Provisioner", email=f"prov.{tag}@unikom.ac.id", role="MEDIATOR")
+        db.add(mediator)
+        db.commit()
+        token = create_access_token(subject=str(mediator.id))
+    body = "\n".join(
+        [
+            json.dumps({"full_name": "A", "email": f"a.{tag}@mahasiswa.unikom.ac.id", "nim": "10122010", "kelas": "IF-2", "tahun_masuk": 2023}),
+            "{not json",
+        ]
+    )
+    r = client.post(
+        "/admin/users/provision",
+        params={"format": "ndjson"},
+        files={"file": ("users.ndjson", body.encode("utf-8"), "application/x-ndjson")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 200, r.text
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines[0]["status"] == "created" and lines[0]["user_id"]
+    assert lines[1]["status"] == "invalid" and lines[1]["line"] == 2
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import get_counters
+from app.db import database as database_module
+from app.db.database import (
+    WORKLOAD_POOL_CONFIGS,
+    WorkloadPoolConfig,
+    _build_engine,
+    get_workload_gateway,
+    get_workload_pool_snapshot,
+    repository_scope,
+    workload_db,
+)
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 50000000) SELECT count(*) FROM n"
+)
+
+
+def test_sqlite_statement_timeout_interrupts_long_statements(tmp_path):
+    engine = _build_engine(
+        f"sqlite:///{tmp_path / 'timeout.db'}",
+        snapshot=False,
+        pool_size=1,
+        max_overflow=0,
+        statement_timeout_ms=50,
+        workload="analytics",
+    )
+    before = get_counters().get("db.statement_timeout.analytics", 0)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(SLOW_QUERY).scalar_one()
+        # The deadline is per statement: the same connection keeps working.
+        assert conn.execute(text("SELECT 1")).scalar_one() == 1
+    assert get_counters()["db.statement_timeout.analytics"] == before + 1
+    assert engine.pool.size() == 1
+    engine.dispose()
+
+
+def test_workload_gateways_get_isolated_pools(monkeypatch, tmp_path):
+    primary = _build_engine(f"sqlite:///{tmp_path / 'primary.db'}", snapshot=False)
+    monkeypatch.setattr(database_module, "engine", primary)
+    monkeypatch.setattr(database_module, "_workload_gateways", {})
+    monkeypatch.setattr(
+        database_module,
+        "WORKLOAD_POOL_CONFIGS",
+        {**WORKLOAD_POOL_CONFIGS, "analytics": WorkloadPoolConfig("analytics", 2, 0, 1000)},
+    )
+
+    assert get_workload_gateway("oltp") is database_module.database_gateway
+    analytics = get_workload_gateway("analytics")
+    assert analytics is get_workload_gateway("analytics")
+    assert analytics.engine is not primary and analytics.engine.url == primary.url
+    assert analytics.engine.pool.size() == 2
+    assert get_workload_gateway("admin").engine is not analytics.engine
+
+    with repository_scope("analytics") as provider:
+        assert provider.workload == "analytics"
+        assert provider.db.get_bind() is analytics.engine
+
+    snapshot = get_workload_pool_snapshot()
+    assert snapshot["analytics"]["statement_timeout_ms"] == 1000
+    assert snapshot["analytics"]["shared_with_oltp"] is False
+
+    with pytest.raises(ValueError):
+        get_workload_gateway("reporting")
+    with pytest.raises(ValueError):
+        workload_db("reporting")
+    for name in ("analytics", "admin"):
+        get_workload_gateway(name).engine.dispose()
+    primary.dispose()
+
+
+def test_in_memory_database_shares_the_oltp_gateway(monkeypatch):
+    memory = _build_engine("sqlite:///:memory:", snapshot=False)
+    monkeypatch.setattr(database_module, "engine", memory)
+    monkeypatch.setattr(database_module, "_workload_gateways", {})
+    assert get_workload_gateway("analytics") is database_module.database_gateway
+    assert get_workload_pool_snapshot()["analytics"]["shared_with_oltp"] is True